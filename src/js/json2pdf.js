@@ -1,5 +1,7 @@
 const fs = require("fs");
-const PdfPrinter = require("pdfmake");
+const os = require("os");
+const path = require("path");
+const { Worker, isMainThread, parentPort, workerData } = require("worker_threads");
 
 // Use built-in fonts
 const fonts = {
@@ -10,65 +12,102 @@ const fonts = {
     bolditalics: "Helvetica-BoldOblique",
   },
 };
-const printer = new PdfPrinter(fonts);
+let printer = null;
 
-const timetable = JSON.parse(fs.readFileSync("src/output/timetable_resolved.json", "utf8"));
-const timeSlots = ["9-10", "10-11", "11-12", "12-1", "2-3", "3-4", "4-5"];
+const TIMETABLE_PATH = "src/output/timetable_resolved.json";
+const PDF_PATH = "src/output/Timetable.pdf";
+const BATCH_DIR = "src/output/pdf";
 
 /**
- * A helper function to check if two class entries are identical.
- * This is used to identify 2-hour labs.
- * @param {Array} entries1 - The class entries from the first time slot.
- * @param {Array} entries2 - The class entries from the second time slot.
- * @returns {boolean} - True if the entries are identical.
+ * The time slots of a timetable, in order, taken from the data itself so any slot grid renders.
+ * @param {object} timetable - The parsed timetable JSON ({ day: [section rows] }).
+ * @returns {Array} - Every slot key of the section rows, in order of first appearance.
  */
-function areEntriesEqual(entries1, entries2) {
-    if (!entries1 || !entries2 || entries1.length !== entries2.length) {
-        return false;
+function slotsOf(timetable) {
+  const slots = [];
+  const seen = new Set(["section"]);
+  for (const sections of Object.values(timetable)) {
+    for (const section of sections) {
+      for (const key of Object.keys(section)) {
+        if (!seen.has(key)) {
+          seen.add(key);
+          slots.push(key);
+        }
+      }
+    }
+  }
+  return slots;
+}
+
+// pdfmake is only loaded by the thread that renders
+function getPrinter() {
+  if (!printer) {
+    const PdfPrinter = require("pdfmake");
+    printer = new PdfPrinter(fonts);
+  }
+  return printer;
+}
+
+/**
+ * A key that identifies the contents of a cell, computed once per cell.
+ * Two slots hold the same lab block exactly when their keys are equal.
+ * @param {Array} entries - The class entries of one time slot.
+ * @returns {string} - The cell key ("" for an empty cell).
+ */
+function cellKey(entries) {
+  return (entries || [])
+    .map(e => [e.subject, e.teacher, e.room, e.isLab ? 1 : 0, e.group || "", e.section || ""].join("\u0001"))
+    .join("\u0002");
+}
+
+/**
+ * Builds the cells of one timetable row, merging 2-hour labs into one cell.
+ * @param {Array} cells - The entries of each time slot, in slot order.
+ * @param {object} options - Passed on to createCellContent.
+ * @returns {Array} - The pdfmake cells, one per time slot.
+ */
+function buildRowCells(cells, options) {
+  const keys = cells.map(cellKey);
+  const row = [];
+  // Use a 'for' loop to allow skipping the next slot when a lab is merged
+  for (let i = 0; i < cells.length; i++) {
+    const entries = cells[i];
+    // --- LOGIC FOR MERGING 2-HOUR LABS ---
+    // A lab that continues into the next slot has the same key there
+    if (entries.length > 0 && entries[0].isLab && i + 1 < cells.length && keys[i] === keys[i + 1]) {
+      const cellContent = createCellContent(entries, options);
+      cellContent.colSpan = 2; // Merge this cell with the next one
+      row.push(cellContent);
+      row.push({}); // Add an empty placeholder for the spanned cell
+      i++; // IMPORTANT: Skip the next time slot since it's now part of the merged cell
+      continue;
     }
-    // A simple and reliable way to compare the objects
-    return JSON.stringify(entries1) === JSON.stringify(entries2);
+    // If it's not a merged lab, process the cell normally
+    row.push(createCellContent(entries, options));
+  }
+  return row;
 }
 
 
 // Build table for one day
-function buildDayTable(day, data) {
-  const headerRow = [{ text: "Section", style: "tableHeader" }, ...timeSlots.map(s => ({ text: s, style: "tableHeader" }))];
+function buildDayTable(day, data, slots) {
+  const headerRow = [{ text: "Section", style: "tableHeader" }, ...slots.map(s => ({ text: s, style: "tableHeader" }))];
   const body = [headerRow];
 
   data.forEach((section) => {
-    const row = [{ text: section.section, style: "sectionCell" }];
-    
-    // Use a 'for' loop to allow skipping the next slot when a lab is merged
-    for (let i = 0; i < timeSlots.length; i++) {
-      const slot = timeSlots[i];
-      const nextSlot = timeSlots[i + 1];
-      
-      const entries = section[slot] || [];
-      const nextEntries = section[nextSlot] || [];
-
-      // --- LOGIC FOR MERGING 2-HOUR LABS ---
-      // Check if it's a lab that continues into the next slot
-      if (entries.length > 0 && entries[0].isLab && areEntriesEqual(entries, nextEntries)) {
-        // This is a 2-hour lab, so we create a merged cell
-        const cellContent = createCellContent(entries);
-        cellContent.colSpan = 2; // Merge this cell with the next one
-        row.push(cellContent);
-        row.push({}); // Add an empty placeholder for the spanned cell
-        i++; // IMPORTANT: Skip the next time slot since it's now part of the merged cell
-        continue; // Move to the next iteration
-      }
-
-      // If it's not a merged lab, process the cell normally
-      row.push(createCellContent(entries));
-    }
-    body.push(row);
+    const cells = slots.map(slot => section[slot] || []);
+    body.push([{ text: section.section, style: "sectionCell" }, ...buildRowCells(cells, {})]);
   });
 
+  return gridTable(body, slots);
+}
+
+// The bordered table used by every page: a label column, then one column per time slot
+function gridTable(body, slots) {
   return {
     table: {
       headerRows: 1,
-      widths: [70, ...timeSlots.map(() => "*")],
+      widths: [70, ...slots.map(() => "*")],
       body,
     },
     layout: {
@@ -82,12 +121,22 @@ function buildDayTable(day, data) {
   };
 }
 
+function entryLines(e, options) {
+  return [
+    options.showSection ? { text: e.section, bold: true } : {},
+    { text: `${e.subject} (${e.teacher})`, bold: !options.showSection },
+    { text: `Room: ${e.room}` },
+    e.isLab ? { text: `Group: ${e.group}`, italics: true } : {}
+  ];
+}
+
 /**
  * Creates the content for a single cell in the timetable.
  * @param {Array} entries - The array of classes/labs in a time slot.
+ * @param {object} options - showSection adds the section to each entry (teacher/room views).
  * @returns {object|string} - The pdfmake cell object or an empty string.
  */
-function createCellContent(entries) {
+function createCellContent(entries, options = {}) {
   if (entries.length === 0) {
     return ""; // Empty cell
   } 
@@ -96,11 +145,7 @@ function createCellContent(entries) {
     // Cell with a single class or lab
     const e = entries[0];
     return {
-      stack: [
-        { text: `${e.subject} (${e.teacher})`, bold: true },
-        { text: `Room: ${e.room}` },
-        e.isLab ? { text: `Group: ${e.group}`, italics: true } : {}
-      ],
+      stack: entryLines(e, options),
       fillColor: e.isLab ? "#fff176" : null, // yellow for labs
       alignment: "center",
       margin: [2, 4, 2, 4],
@@ -114,11 +159,7 @@ function createCellContent(entries) {
       widths: ["*"],
       body: entries.map((e) => [
         {
-          stack: [
-            { text: `${e.subject} (${e.teacher})`, bold: true },
-            { text: `Room: ${e.room}` },
-            e.isLab ? { text: `Group: ${e.group}`, italics: true } : {}
-          ],
+          stack: entryLines(e, options),
           fillColor: e.isLab ? "#fff176" : null,
           alignment: "center",
           margin: [2, 4, 2, 4],
@@ -138,22 +179,25 @@ function createCellContent(entries) {
 }
 
 
-function makeDocument() {
+const docStyles = {
+  dayHeader: { fontSize: 18, bold: true, alignment: "center", margin: [0, 0, 0, 12] },
+  tableHeader: { bold: true, fillColor: "#e0e0e0", alignment: "center" },
+  sectionCell: { bold: true, alignment: "center" },
+};
+
+function makeDocument(timetable) {
+  const slots = slotsOf(timetable);
   const content = [];
   Object.keys(timetable).forEach((day, idx) => {
     if (idx > 0) content.push({ text: "", pageBreak: "before" });
 
     content.push({ text: day, style: "dayHeader", margin: [0, 0, 0, 10] });
-    content.push(buildDayTable(day, timetable[day]));
+    content.push(buildDayTable(day, timetable[day], slots));
   });
 
   return {
     content,
-    styles: {
-      dayHeader: { fontSize: 18, bold: true, alignment: "center", margin: [0, 0, 0, 12] },
-      tableHeader: { bold: true, fillColor: "#e0e0e0", alignment: "center" },
-      sectionCell: { bold: true, alignment: "center" },
-    },
+    styles: docStyles,
     defaultStyle: {
       font: "Helvetica",
       fontSize: 9,
@@ -162,8 +206,189 @@ function makeDocument() {
   };
 }
 
-const pdfDoc = printer.createPdfKitDocument(makeDocument());
-pdfDoc.pipe(fs.createWriteStream("src/output/Timetable.pdf"));
-pdfDoc.end();
+// ---------------- Batch mode: one PDF per section, teacher and room ---------------- //
+
+const VIEW_DIRS = { section: "sections", teacher: "teachers", room: "rooms" };
+
+/**
+ * Files every session of the timetable under its section, teacher and room in one pass.
+ * @param {object} timetable - The parsed timetable JSON.
+ * @param {Array} slots - The time slots to read (default: slotsOf(timetable)).
+ * @returns {object} - { section|teacher|room: Map(name -> { day: { slot: [entries] } }) }
+ */
+function buildViews(timetable, slots = slotsOf(timetable)) {
+  const views = { section: new Map(), teacher: new Map(), room: new Map() };
+  const cellsOf = (kind, name) => {
+    if (!views[kind].has(name)) views[kind].set(name, {});
+    return views[kind].get(name);
+  };
+  for (const [day, sections] of Object.entries(timetable)) {
+    for (const section of sections) {
+      const sectionDays = cellsOf("section", section.section);
+      sectionDays[day] = {};
+      for (const slot of slots) {
+        for (const entry of section[slot] || []) {
+          const e = { ...entry, section: section.section };
+          for (const [kind, name] of [["section", section.section], ["teacher", e.teacher], ["room", e.room]]) {
+            const days = cellsOf(kind, name);
+            days[day] = days[day] || {};
+            (days[day][slot] = days[day][slot] || []).push(e);
+          }
+        }
+      }
+    }
+  }
+  return views;
+}
+
+/**
+ * A one-page document with days as rows and time slots as columns.
+ */
+function makeViewDocument(kind, name, cellsByDay, days, slots) {
+  const headerRow = [{ text: "Day", style: "tableHeader" }, ...slots.map(s => ({ text: s, style: "tableHeader" }))];
+  const body = [headerRow];
+  const options = { showSection: kind !== "section" };
+  for (const day of days) {
+    const daySlots = cellsByDay[day] || {};
+    const cells = slots.map(slot => daySlots[slot] || []);
+    body.push([{ text: day, style: "sectionCell" }, ...buildRowCells(cells, options)]);
+  }
+  const title = { section: "Section", teacher: "Teacher", room: "Room" }[kind];
+  return {
+    content: [
+      { text: `${title}: ${name}`, style: "dayHeader", margin: [0, 0, 0, 10] },
+      gridTable(body, slots),
+    ],
+    styles: docStyles,
+    defaultStyle: { font: "Helvetica", fontSize: 9 },
+    pageOrientation: "landscape",
+  };
+}
+
+function renderToFile(docDefinition, file) {
+  return new Promise((resolve, reject) => {
+    const pdfDoc = getPrinter().createPdfKitDocument(docDefinition);
+    const stream = fs.createWriteStream(file);
+    stream.on("finish", resolve);
+    stream.on("error", reject);
+    pdfDoc.on("error", reject);
+    pdfDoc.pipe(stream);
+    pdfDoc.end();
+  });
+}
+
+function safeFileName(name) {
+  return name.replace(/[^A-Za-z0-9._-]+/g, "_");
+}
+
+/**
+ * Lists the documents of the batch, giving names that collide once sanitised distinct files.
+ */
+function planJobs(views, outDir) {
+  const jobs = [];
+  for (const [kind, dir] of Object.entries(VIEW_DIRS)) {
+    const used = new Set();
+    for (const [name, cellsByDay] of views[kind]) {
+      let base = safeFileName(name);
+      for (let n = 2; used.has(base.toLowerCase()); n++) base = `${safeFileName(name)}_${n}`;
+      used.add(base.toLowerCase());
+      const entries = Object.values(cellsByDay).reduce(
+        (count, slots) => count + Object.values(slots).reduce((c, entries) => c + entries.length, 0), 0);
+      jobs.push({ kind, name, file: path.join(outDir, dir, `${base}.pdf`), entries, cellsByDay });
+    }
+  }
+  return jobs;
+}
+
+// Runs in each worker thread: renders its share of the documents one after another
+async function renderJobs({ jobs, days, slots }) {
+  for (const job of jobs) {
+    try {
+      await renderToFile(makeViewDocument(job.kind, job.name, job.cellsByDay, days, slots), job.file);
+      parentPort.postMessage({ file: job.file, bytes: fs.statSync(job.file).size });
+    } catch (err) {
+      parentPort.postMessage({ file: job.file, error: String(err) });
+    }
+  }
+}
+
+async function renderBatch(timetable, source, outDir, workerCount) {
+  const started = Date.now();
+  const days = Object.keys(timetable);
+  const slots = slotsOf(timetable);
+  const jobs = planJobs(buildViews(timetable, slots), outDir);
+  for (const dir of Object.values(VIEW_DIRS)) fs.mkdirSync(path.join(outDir, dir), { recursive: true });
+
+  // Round-robin so each worker gets a mix of large and small documents
+  const threads = Math.max(1, Math.min(workerCount, jobs.length));
+  const shares = Array.from({ length: threads }, () => []);
+  jobs.forEach((job, i) => shares[i % threads].push(job));
+
+  const results = new Map();
+  await Promise.all(shares.map(share => new Promise((resolve, reject) => {
+    const worker = new Worker(__filename, { workerData: { jobs: share, days, slots } });
+    worker.on("message", msg => results.set(msg.file, msg));
+    worker.on("error", reject);
+    worker.on("exit", code => (code === 0 ? resolve() : reject(new Error(`PDF worker exited with code ${code}`))));
+  })));
+
+  const documents = jobs.map(({ kind, name, file, entries }) => {
+    const result = results.get(file) || { error: "not rendered" };
+    return { kind, name, file: path.relative(outDir, file), entries, ...(result.error ? { error: result.error } : { bytes: result.bytes }) };
+  });
+  const failed = documents.filter(d => d.error);
+  const manifest = {
+    source,
+    generatedAt: new Date().toISOString(),
+    workers: threads,
+    seconds: (Date.now() - started) / 1000,
+    counts: Object.fromEntries(Object.keys(VIEW_DIRS).map(kind => [kind, documents.filter(d => d.kind === kind).length])),
+    documents,
+  };
+  fs.writeFileSync(path.join(outDir, "manifest.json"), JSON.stringify(manifest, null, 2));
+
+  console.log(`✅ ${documents.length - failed.length} PDFs written to ${outDir} with ${threads} worker(s) in ${manifest.seconds.toFixed(1)}s (manifest.json)`);
+  failed.forEach(d => console.log(`❌ ${d.file}: ${d.error}`));
+  if (failed.length) process.exitCode = 1;
+}
+
+function parseArgs(argv) {
+  const args = { batch: false, outDir: BATCH_DIR, workers: os.cpus().length, input: TIMETABLE_PATH };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === "--batch") {
+      args.batch = true;
+      if (argv[i + 1] && !argv[i + 1].startsWith("--")) args.outDir = argv[++i];
+    } else if (argv[i] === "--workers") {
+      args.workers = Math.max(1, parseInt(argv[++i], 10) || 1);
+    } else if (argv[i] === "--input") {
+      args.input = argv[++i];
+    }
+  }
+  return args;
+}
+
+function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const timetable = JSON.parse(fs.readFileSync(args.input, "utf8"));
+  if (args.batch) {
+    renderBatch(timetable, args.input, args.outDir, args.workers).catch(err => {
+      console.error(`❌ Batch rendering failed: ${err.message}`);
+      process.exitCode = 1;
+    });
+    return;
+  }
+
+  const pdfDoc = getPrinter().createPdfKitDocument(makeDocument(timetable));
+  pdfDoc.pipe(fs.createWriteStream(PDF_PATH));
+  pdfDoc.end();
+
+  console.log("✅ Timetable PDF generated with merged labs and parallel dividers!");
+}
+
+if (!isMainThread) {
+  renderJobs(workerData);
+} else if (require.main === module) {
+  main();
+}
 
-console.log("✅ Timetable PDF generated with merged labs and parallel dividers!");
+module.exports = { slotsOf, cellKey, buildRowCells, buildViews, makeViewDocument, planJobs };
@@ -0,0 +1,65 @@
+# anytime.py
+"""Two-phase anytime solve.
+
+Phase 1 solves a copy of the model without its objective, i.e. only the hard
+constraints, under a short budget (settings.anytime.feasibility_seconds). CP-SAT
+stops at the first timetable that satisfies them, and that timetable is written
+out straight away. Phase 2 re-solves the full model with the weighted objective
+for the rest of solver_timeout_seconds, hinted with the phase-1 solution, so it
+starts from a valid timetable and only improves on it. Hints already on the
+model (e.g. from warm_start) are kept; the phase-1 values only fill the rest.
+"""
+from ortools.sat.python import cp_model
+
+import solution_handler
+import solver_setup
+from metrics import timed
+
+DEFAULT_FEASIBILITY_SECONDS = 5.0
+SOLVED = (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+def hint_from_response(model, response):
+    """Hints every variable of `model` that has no hint yet with its value in a response of the same model."""
+    hinted = set(model.Proto().solution_hint.vars)
+    for index, value in enumerate(response.solution):
+        if index not in hinted:
+            model.AddHint(model.GetIntVarFromProtoIndex(index), value)
+
+
+def solve_anytime(model, class_vars, config, solve, max_time_in_seconds=None, metrics=None):
+    """Runs the two phases on `model` and returns (status, solver) of the result to export.
+
+    `solve(model, solver)` runs one CP-SAT search (e.g. with solution streaming).
+    If the optimisation phase finds nothing better, the feasibility result is returned.
+    """
+    settings = config.data['settings']
+    total = float(max_time_in_seconds if max_time_in_seconds is not None else settings['solver_timeout_seconds'])
+    budget = min(float(settings.get('anytime', {}).get('feasibility_seconds', DEFAULT_FEASIBILITY_SECONDS)), total)
+
+    feasibility_model = model.Clone()
+    feasibility_model.ClearObjective()
+    first_solver = solver_setup.create_solver(config, max_time_in_seconds=budget)
+    print(f"   - Phase 1: looking for any valid timetable (max {budget:.0f} seconds)...")
+    with timed(metrics, "solve.feasibility"):
+        first_status = solve(feasibility_model, first_solver)
+    if metrics is not None:
+        metrics.info["first_solution_seconds"] = first_solver.WallTime()
+
+    if first_status in SOLVED:
+        print(f"   - Valid timetable found in {first_solver.WallTime():.1f}s; writing it out before optimising.")
+        solution_handler.export_solution(first_status, first_solver, class_vars, config)
+        hint_from_response(model, first_solver.ResponseProto())
+    else:
+        print(f"   - No valid timetable within {budget:.0f}s ({first_solver.StatusName(first_status)}); "
+              f"optimising from scratch.")
+
+    remaining = max(total - first_solver.WallTime(), 1.0)
+    solver = solver_setup.create_solver(config, max_time_in_seconds=remaining)
+    print(f"   - Phase 2: optimising the objective (max {remaining:.0f} seconds)...")
+    with timed(metrics, "solve.optimize"):
+        status = solve(model, solver)
+    if status not in SOLVED and first_status in SOLVED:
+        print("   - Optimisation found no solution in time; keeping the phase 1 timetable.")
+        return first_status, first_solver
+    return status, solver
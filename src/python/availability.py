@@ -0,0 +1,230 @@
+# availability.py
+"""Bitset availability index over a generated timetable.
+
+Every teacher, room, section and (section, group) gets one integer whose bit
+d * len(slots) + s is set when it is busy in slot s of day d. The masks are
+built once, from the JSON timetable or a CompactTimetable; after that free/busy
+checks and "when are all of these free" intersections are a handful of bitwise
+operations. Only the CompactTimetable path needs NumPy, so queries over a JSON
+file start without importing it.
+
+A group is busy whenever its whole section is (theory) and during its own labs.
+
+Usage:
+  python src/python/availability.py [-t timetable.json] [-c config.json] free teacher KN
+  python src/python/availability.py free-rooms Tuesday 3-4 4-5 [--labs]
+  python src/python/availability.py common section CSE-5 IT-5
+"""
+import argparse
+import json
+from collections import defaultdict
+
+import config_loader
+
+KINDS = ("teacher", "room", "section", "group")
+
+
+class AvailabilityIndex:
+    """Busy bitmasks per teacher, room, section and (section, group) over the days x slots grid."""
+
+    def __init__(self, days, slots):
+        self.days = list(days)
+        self.slots = list(slots)
+        self.full = (1 << (len(self.days) * len(self.slots))) - 1
+        self.masks = {kind: defaultdict(int) for kind in KINDS}
+        self._section_wide = defaultdict(int)  # sessions without a group, i.e. for the whole section
+        self.group_names = set()
+
+    @classmethod
+    def from_compact(cls, compact, rooms=(), teachers=()):
+        """Builds the masks in one pass over the occupied cells of a CompactTimetable.
+
+        `rooms`/`teachers` register resources that have no session at all (e.g. unused lab rooms).
+        """
+        import numpy as np
+        from compact import EMPTY, TEACHER, ROOM, GROUP
+
+        index = cls(compact.days, compact.slots)
+        width = len(compact.slots)
+        days, sections, slots, ks = np.nonzero(compact.grid != EMPTY)
+        entry_ids = compact.entries[compact.grid[days, sections, slots, ks]]
+        bits = (days * width + slots).tolist()
+        for bit, sec, teacher, room, group in zip(bits, sections.tolist(), entry_ids[:, TEACHER].tolist(),
+                                                  entry_ids[:, ROOM].tolist(), entry_ids[:, GROUP].tolist()):
+            flag = 1 << bit
+            section = compact.sections.names[sec]
+            index.masks["teacher"][compact.teachers.names[teacher]] |= flag
+            index.masks["room"][compact.rooms.names[room]] |= flag
+            index.masks["section"][section] |= flag
+            if group == EMPTY:
+                index._section_wide[section] |= flag
+            else:
+                index.masks["group"][(section, compact.groups.names[group])] |= flag
+        index._finish(compact.sections.names, rooms, teachers, compact.groups.names)
+        return index
+
+    @classmethod
+    def from_timetable(cls, timetable, config=None):
+        """Builds the index in one pass over the JSON timetable; a config adds its rooms and teachers."""
+        days = list(timetable)
+        if not days:
+            raise ValueError("Timetable has no days")
+        first_day = timetable[days[0]]
+        slots = [key for key in first_day[0] if key != "section"] if first_day else []
+        index = cls(days, slots)
+        width = len(slots)
+        for d, day in enumerate(days):
+            for section_obj in timetable[day]:
+                section = section_obj["section"]
+                for s, slot in enumerate(slots):
+                    for entry in section_obj.get(slot, ()):
+                        flag = 1 << (d * width + s)
+                        index.masks["teacher"][entry["teacher"]] |= flag
+                        index.masks["room"][entry["room"]] |= flag
+                        index.masks["section"][section] |= flag
+                        if "group" in entry:
+                            index.masks["group"][(section, entry["group"])] |= flag
+                        else:
+                            index._section_wide[section] |= flag
+        index._finish([section_obj["section"] for section_obj in first_day],
+                      config.ALL_ROOMS if config else (), config.ALL_TEACHERS if config else (),
+                      config.GROUPS if config else ())
+        return index
+
+    def _finish(self, sections, rooms, teachers, groups=()):
+        for group_key in list(self.masks["group"]):
+            self.masks["group"][group_key] |= self._section_wide[group_key[0]]
+        self.group_names.update(groups)
+        self.group_names.update(group for _, group in self.masks["group"])
+        for kind, names in (("section", sections), ("room", rooms), ("teacher", teachers)):
+            for name in names:
+                self.masks[kind].setdefault(name, 0)
+
+    # ---------------- Masks ---------------- #
+
+    def bit(self, day, slot):
+        return 1 << (self.days.index(day) * len(self.slots) + self.slots.index(slot))
+
+    def window(self, day, slots=None):
+        """Mask of the given slots of one day (the whole day if slots is None)."""
+        mask = 0
+        for slot in self.slots if slots is None else slots:
+            mask |= self.bit(day, slot)
+        return mask
+
+    def busy(self, kind, name):
+        """Busy mask of a teacher, room, section or group; groups are named (section, group).
+
+        Raises KeyError for names the index does not know, so a typo is not reported
+        as free all week; known names without sessions have mask 0.
+        """
+        if kind == "group":
+            if name in self.masks["group"]:
+                return self.masks["group"][name]
+            if len(name) == 2 and name[0] in self.masks["section"] and name[1] in self.group_names:
+                return self._section_wide.get(name[0], 0)
+        elif name in self.masks[kind]:
+            return self.masks[kind][name]
+        raise KeyError(f"unknown {kind} {':'.join(name) if kind == 'group' else name}")
+
+    def free(self, kind, name):
+        return self.full & ~self.busy(kind, name)
+
+    def common_free(self, resources):
+        """Mask of the slots in which every (kind, name) resource is free."""
+        mask = self.full
+        for kind, name in resources:
+            mask &= ~self.busy(kind, name)
+        return mask
+
+    def slots_of(self, mask):
+        """Decodes a mask into [(day, slot), ...] in timetable order."""
+        width = len(self.slots)
+        result = []
+        while mask:
+            low = mask & -mask
+            bit = low.bit_length() - 1
+            result.append((self.days[bit // width], self.slots[bit % width]))
+            mask ^= low
+        return result
+
+    # ---------------- Queries ---------------- #
+
+    def is_free(self, kind, name, day, slots):
+        """Whether the resource is free in all of the given slots of `day`."""
+        return not self.busy(kind, name) & self.window(day, slots)
+
+    def free_slots(self, kind, name):
+        return self.slots_of(self.free(kind, name))
+
+    def common_free_slots(self, resources):
+        return self.slots_of(self.common_free(resources))
+
+    def free_resources(self, kind, day, slots, names=None):
+        """Names of the resources of one kind that are free in all of the given slots of `day`."""
+        window = self.window(day, slots)
+        names = self.masks[kind] if names is None else names
+        return [name for name in names if not self.busy(kind, name) & window]
+
+
+def _format_slots(pairs):
+    by_day = defaultdict(list)
+    for day, slot in pairs:
+        by_day[day].append(slot)
+    return "\n".join(f"   {day}: {', '.join(slots)}" for day, slots in by_day.items()) or "   (none)"
+
+
+def _resource(kind, name):
+    if kind == "group":
+        section, _, group = name.rpartition(":")
+        if not section:
+            raise SystemExit("Groups are written SECTION:GROUP, e.g. CSE-5:A")
+        return kind, (section, group)
+    return kind, name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Free/busy queries over a generated timetable")
+    parser.add_argument("-t", "--timetable", default="src/output/timetable_resolved.json")
+    parser.add_argument("-c", "--config", default="src/python/config.json",
+                        help="adds rooms and teachers that have no sessions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    free = commands.add_parser("free", help="when a teacher, room, section or group (SECTION:GROUP) is free")
+    free.add_argument("kind", choices=KINDS)
+    free.add_argument("name")
+    rooms = commands.add_parser("free-rooms", help="rooms free in all the given slots of a day")
+    rooms.add_argument("day")
+    rooms.add_argument("slots", nargs="+")
+    rooms.add_argument("--labs", action="store_true", help="only lab rooms")
+    common = commands.add_parser("common", help="slots in which all the given resources are free")
+    common.add_argument("kind", choices=KINDS)
+    common.add_argument("names", nargs="+")
+    args = parser.parse_args(argv)
+
+    config = config_loader.load_config(args.config) if args.config else None
+    with open(args.timetable, 'r', encoding="utf-8") as f:
+        index = AvailabilityIndex.from_timetable(json.load(f), config)
+    if args.command == "free-rooms" and (args.day not in index.days or
+                                         any(slot not in index.slots for slot in args.slots)):
+        raise SystemExit(f"Unknown day or slot; days are {index.days}, slots are {index.slots}")
+
+    try:
+        _answer(args, index, config)
+    except KeyError as e:
+        raise SystemExit(f"❌ {e.args[0]}")
+
+
+def _answer(args, index, config):
+    if args.command == "free":
+        print(f"🟢 {args.name} is free:\n{_format_slots(index.free_slots(*_resource(args.kind, args.name)))}")
+    elif args.command == "free-rooms":
+        names = config.LAB_ROOMS if args.labs and config else None
+        free_rooms = index.free_resources("room", args.day, args.slots, names)
+        print(f"🟢 Free on {args.day} {', '.join(args.slots)}: {', '.join(sorted(free_rooms)) or '(none)'}")
+    else:
+        resources = [_resource(args.kind, name) for name in args.names]
+        print(f"🟢 {', '.join(args.names)} are all free:\n{_format_slots(index.common_free_slots(resources))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# bench_model_build.py
+"""Times model construction on scaled copies of config.json.
+
+Each scale factor k clones every section (with its own teachers and theory room)
+k times, so the number of variables grows linearly with k. If model building is
+linear, the "us/var" column stays roughly flat as k grows.
+
+Usage: python src/python/bench_model_build.py [config.json] [max_scale]
+"""
+import copy
+import sys
+import time
+
+from ortools.sat.python import cp_model
+import config_loader
+import model_builder
+import constraints
+
+
+def scale_config_data(data, factor):
+    """Returns a copy of the raw config data with every section cloned `factor` times."""
+    scaled = copy.deepcopy(data)
+    if factor == 1:
+        return scaled
+    scaled['sections'] = []
+    scaled['section_theory_rooms'] = {}
+    scaled['subjects'] = {}
+    scaled['labs'] = {}
+    for k in range(factor):
+        suffix = f"#{k}"
+        for section in data['sections']:
+            name = section + suffix
+            scaled['sections'].append(name)
+            scaled['section_theory_rooms'][name] = data['section_theory_rooms'][section] + suffix
+            scaled['subjects'][name] = [[subj, teacher + suffix] for subj, teacher in data['subjects'].get(section, [])]
+            scaled['labs'][name] = list(data['labs'].get(section, []))
+    return scaled
+
+
+def time_build(config):
+    """Builds variables and hard constraints, returning (num_vars, seconds)."""
+    model = cp_model.CpModel()
+    start = time.perf_counter()
+    class_vars = model_builder.create_class_variables(model, config)
+    model_builder.create_and_link_lab_room_choices(model, class_vars, config)
+    constraints.add_hard_constraints(model, class_vars, config)
+    return len(class_vars), time.perf_counter() - start
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    config_path = argv[0] if len(argv) > 0 else "src/python/config.json"
+    max_scale = int(argv[1]) if len(argv) > 1 else 8
+    base = config_loader.load_config(config_path)
+
+    print(f"{'scale':>5} {'sections':>8} {'vars':>8} {'build (s)':>10} {'us/var':>8}")
+    for factor in [1, 2, 4, 8, 16, 32]:
+        if factor > max_scale:
+            break
+        config = config_loader.Config(scale_config_data(base.data, factor))
+        num_vars, seconds = time_build(config)
+        print(f"{factor:>5} {len(config.SECTIONS):>8} {num_vars:>8} {seconds:>10.3f} {1e6 * seconds / num_vars:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# bench_objective.py
+"""Compares the "reified" and "linear" objective formulations on generated instances.
+
+For every instance and formulation the full model is built and solved with the
+same time limit, recording the model size, the time to the first solution and
+the final objective. Because the two objectives differ in their teacher term,
+each final timetable is also scored with objective.evaluate(), which computes
+every penalty term from the solution itself, so the rows can be compared.
+
+Usage:
+    python src/python/bench_objective.py --scales 1 2 4 --timeout 30 [-o results.json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import instance_generator
+
+
+def run_formulation(config_path, formulation, timeout):
+    """Builds and solves one instance with one formulation; returns its measurements."""
+    from ortools.sat.python import cp_model
+    import config_loader
+    import model_builder
+    import constraints
+    import objective
+    import solution_handler
+    import solver_setup
+
+    class FirstSolution(cp_model.CpSolverSolutionCallback):
+        def __init__(self):
+            super().__init__()
+            self.first = None
+            self.solutions = 0
+
+        def on_solution_callback(self):
+            self.solutions += 1
+            if self.first is None:
+                self.first = {"seconds": self.WallTime(), "objective": self.ObjectiveValue()}
+
+    config = config_loader.load_config(config_path)
+    start = time.perf_counter()
+    model = cp_model.CpModel()
+    class_vars = model_builder.create_class_variables(model, config)
+    model_builder.create_and_link_lab_room_choices(model, class_vars, config)
+    constraints.add_hard_constraints(model, class_vars, config)
+    hard_size = len(model.Proto().variables), len(model.Proto().constraints)
+    objective.set_objective(model, class_vars, config, formulation=formulation)
+    build_seconds = time.perf_counter() - start
+    proto = model.Proto()
+
+    solver = solver_setup.create_solver(config, max_time_in_seconds=timeout)
+    callback = FirstSolution()
+    status = solver.Solve(model, callback)
+    result = {
+        "formulation": formulation,
+        "sections": len(config.SECTIONS),
+        "objective_variables": len(proto.variables) - hard_size[0],
+        "objective_constraints": len(proto.constraints) - hard_size[1],
+        "build_seconds": round(build_seconds, 3),
+        "status": solver.StatusName(status),
+        "first_solution": callback.first,
+        "solutions": callback.solutions,
+        "wall_time": solver.WallTime(),
+    }
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        result["objective"] = solver.ObjectiveValue()
+        result["best_bound"] = solver.BestObjectiveBound()
+        result["score"] = objective.evaluate(solution_handler.scheduled_keys(class_vars, solver.ResponseProto()),
+                                             config)
+    return result
+
+
+def _run_in_child(args):
+    return run_formulation(*args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the reified and linear objective formulations")
+    parser.add_argument("--config", nargs="*", default=[], help="existing config.json files to include")
+    parser.add_argument("--scales", nargs="*", type=int, default=[1, 2],
+                        help="generate instances with 7 x SCALE sections")
+    parser.add_argument("--timeout", type=float, default=30.0, help="solver time limit per run in seconds")
+    parser.add_argument("-o", "--output", default=None, help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        config_paths = list(args.config)
+        for scale in args.scales:
+            path = os.path.join(tmp, f"generated_x{scale}.json")
+            instance_generator.write_config(path, sections=7 * scale, teachers=28 * scale, lab_rooms=8 * scale)
+            config_paths.append(path)
+
+        print(f"{'instance':<20} {'formulation':<8} {'obj vars':>8} {'obj cts':>8} {'first (s)':>9} "
+              f"{'status':<8} {'objective':>9} {'penalty':>8} {'spread':>6}")
+        for path in config_paths:
+            for formulation in ("reified", "linear"):
+                # A fresh process per run so neither formulation inherits warm caches from the other
+                with ctx.Pool(1) as pool:
+                    result = pool.apply(_run_in_child, ((path, formulation, args.timeout),))
+                result["config"] = os.path.basename(path)
+                results.append(result)
+                first = result["first_solution"]
+                first_text = f"{first['seconds']:.1f}" if first else "-"
+                score = result.get("score", {})
+                print(f"{result['config']:<20} {formulation:<8} {result['objective_variables']:>8} "
+                      f"{result['objective_constraints']:>8} {first_text:>9} "
+                      f"{result['status']:<8} {result.get('objective', '-'):>9} "
+                      f"{score.get('penalty', '-'):>8} {score.get('teacher_load_spread', '-'):>6}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# benchmark.py
+"""Times every stage of the timetable pipeline on one or more configs.
+
+Stages mirror main.py: load_config, create_class_variables, add_hard_constraints,
+set_objective, Solve and export_solution. For each stage the runner records the
+wall time and the model's variable/constraint counts, and for each instance the
+peak memory. Each instance runs in its own process so peak RSS is per instance.
+
+Usage:
+    python src/python/benchmark.py --config src/python/config.json
+    python src/python/benchmark.py --scales 1 2 4 8 --timeout 30 -o bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import instance_generator
+
+
+def run_instance(config_path, timeout, trace_memory=False):
+    """Runs the pipeline once on `config_path` and returns its measurements."""
+    from ortools.sat.python import cp_model
+    import config_loader
+    import model_builder
+    import constraints
+    import metrics
+    import objective
+    import solution_handler
+    import solver_setup
+
+    if trace_memory:
+        tracemalloc.start()
+    stages = {}
+
+    def record(name, start, model=None):
+        stage = {"seconds": round(time.perf_counter() - start, 6)}
+        if model is not None:
+            stage["variables"], stage["constraints"] = metrics.model_size(model)
+        stages[name] = stage
+
+    start = time.perf_counter()
+    config = config_loader.load_config(config_path)
+    record("load_config", start)
+
+    model = cp_model.CpModel()
+    start = time.perf_counter()
+    class_vars = model_builder.create_class_variables(model, config)
+    model_builder.create_and_link_lab_room_choices(model, class_vars, config)
+    record("create_class_variables", start, model)
+
+    start = time.perf_counter()
+    constraints.add_hard_constraints(model, class_vars, config)
+    record("add_hard_constraints", start, model)
+
+    start = time.perf_counter()
+    objective.set_objective(model, class_vars, config)
+    record("set_objective", start, model)
+
+    solver = solver_setup.create_solver(config, max_time_in_seconds=timeout)
+    start = time.perf_counter()
+    status = solver.Solve(model)
+    record("Solve", start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        solution_handler.export_solution(status, solver, class_vars, config,
+                                         json_path=os.path.join(tmp, "timetable.json"))
+        record("export_solution", start)
+
+    result = {
+        "config": config_path,
+        "sections": len(config.SECTIONS),
+        "teachers": len(config.ALL_TEACHERS),
+        "class_vars": len(class_vars),
+        "stages": stages,
+        "total_seconds": round(sum(stage["seconds"] for stage in stages.values()), 6),
+        "status": solver.StatusName(status),
+        "objective": solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None,
+        "best_bound": solver.BestObjectiveBound(),
+        # ru_maxrss is reported in KiB on Linux and bytes on macOS
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                             / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+    }
+    if trace_memory:
+        result["peak_python_heap_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+    return result
+
+
+def _run_in_child(args):
+    config_path, timeout, trace_memory = args
+    return run_instance(config_path, timeout, trace_memory)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the timetable pipeline stage by stage")
+    parser.add_argument("--config", nargs="*", default=[], help="existing config.json files to benchmark")
+    parser.add_argument("--scales", nargs="*", type=int, default=[],
+                        help="generate instances with 7 x SCALE sections (teachers, rooms and labs scale too)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="solver time limit in seconds (default: the config's solver_timeout_seconds)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also record peak Python heap with tracemalloc (slows model building)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="results file (default: src/output/benchmarks/benchmark_<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    config_paths = list(args.config)
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            path = os.path.join(tmp, f"generated_x{scale}.json")
+            instance_generator.write_config(path, sections=7 * scale, teachers=28 * scale,
+                                            lab_rooms=8 * scale)
+            config_paths.append(path)
+        if not config_paths:
+            config_paths.append("src/python/config.json")
+
+        results = []
+        # A fresh process per instance keeps peak RSS and import state independent.
+        ctx = multiprocessing.get_context("spawn")
+        for path in config_paths:
+            print(f"⏱️  Benchmarking {os.path.basename(path)}...")
+            with ctx.Pool(1) as pool:
+                result = pool.apply(_run_in_child, ((path, args.timeout, args.trace_memory),))
+            results.append(result)
+            stage_times = ", ".join(f"{name} {stage['seconds']:.2f}s" for name, stage in result["stages"].items())
+            print(f"   - {result['class_vars']} vars, {result['status']}: {stage_times}")
+
+    output_path = args.output or os.path.join(
+        "src/output/benchmarks", f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Benchmark results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
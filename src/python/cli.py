@@ -0,0 +1,135 @@
+# cli.py
+"""Single command-line entry point for the timetable tools.
+
+  validate     check config files (schema + capacity) without OR-Tools
+  solve        build and solve the model, then post-process (main.py)
+  postprocess  merge labs / resolve clashes in an existing master timetable
+  export       write the Excel workbook for a timetable JSON
+  query        free/busy questions over a timetable (availability.py)
+  bench        run a benchmark: pipeline, objective or model-build
+
+Every module is imported inside the subcommand that needs it, so `validate` and
+`query` start without loading OR-Tools, pandas or the exporters.
+
+Usage:
+  python src/python/cli.py validate [config.json ...]
+  python src/python/cli.py solve [-c config.json] [--timeout 60]
+  python src/python/cli.py postprocess [master.json] [-c config.json] [--resolved out.json]
+  python src/python/cli.py export [timetable.json] [-o Timetable.xlsx]
+  python src/python/cli.py query [-t timetable.json] free teacher KN
+  python src/python/cli.py bench objective --scales 1 2 --timeout 30
+"""
+import argparse
+import importlib
+import json
+import sys
+
+DEFAULT_CONFIG = "src/python/config.json"
+DEFAULT_TIMETABLE = "src/output/timetable_resolved.json"
+BENCHMARKS = {"pipeline": "benchmark", "objective": "bench_objective", "model-build": "bench_model_build"}
+
+
+def validate(args):
+    import config_loader
+    import feasibility
+
+    ok = True
+    for path in args.configs:
+        print(f"🔎 {path}")
+        try:
+            config = config_loader.load_config(path)
+        except (OSError, json.JSONDecodeError, config_loader.ConfigError) as e:
+            print(f"   ❌ {e}")
+            ok = False
+            continue
+        ok = feasibility.print_report(feasibility.analyze(config)) and ok
+    return 0 if ok else 1
+
+
+def solve(args):
+    import main as pipeline
+
+    pipeline.main(args.config, args.timeout)
+    return 0
+
+
+def postprocess(args):
+    import config_loader
+    import postprocess as stages
+    import solution_handler
+
+    config = config_loader.load_config(args.config)
+    with open(args.timetable or solution_handler.MASTER_TIMETABLE_PATH, 'r', encoding="utf-8") as f:
+        timetable = json.load(f)
+    stages.run(timetable, config, args.merged or stages.MERGED_TIMETABLE_PATH,
+               args.resolved or stages.RESOLVED_TIMETABLE_PATH, args.excel)
+    return 0
+
+
+def export(args):
+    import excel_export
+
+    with open(args.timetable, 'r', encoding="utf-8") as f:
+        excel_export.export_timetable(json.load(f), args.output or excel_export.EXCEL_PATH)
+    return 0
+
+
+def query(argv):
+    import availability
+
+    availability.main(argv)
+    return 0
+
+
+def bench(argv):
+    if not argv or argv[0] not in BENCHMARKS:
+        raise SystemExit(f"usage: cli.py bench {{{','.join(BENCHMARKS)}}} [options]")
+    importlib.import_module(BENCHMARKS[argv[0]]).main(argv[1:])
+    return 0
+
+
+# Subcommands whose options belong to the module they run
+FORWARDED = {"query": query, "bench": bench}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Timetable generator tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("validate", help="check config files without solving")
+    p.add_argument("configs", nargs="*", default=[DEFAULT_CONFIG])
+    p.set_defaults(handler=validate)
+
+    p = commands.add_parser("solve", help="generate the timetable")
+    p.add_argument("-c", "--config", default=DEFAULT_CONFIG)
+    p.add_argument("--timeout", type=float, default=None, help="overrides settings.solver_timeout_seconds")
+    p.set_defaults(handler=solve)
+
+    p = commands.add_parser("postprocess", help="merge labs and resolve clashes in a master timetable")
+    p.add_argument("timetable", nargs="?", default=None, help="default: src/output/University_Master_Timetable.json")
+    p.add_argument("-c", "--config", default=DEFAULT_CONFIG)
+    p.add_argument("--merged", default=None, help="default: src/output/timetable.json")
+    p.add_argument("--resolved", default=None, help="default: src/output/timetable_resolved.json")
+    p.add_argument("--excel", default=None, help="workbook path when settings.postprocess.export_excel is set")
+    p.set_defaults(handler=postprocess)
+
+    p = commands.add_parser("export", help="write the Excel workbook for a timetable")
+    p.add_argument("timetable", nargs="?", default=DEFAULT_TIMETABLE)
+    p.add_argument("-o", "--output", default=None, help="default: src/output/Timetable.xlsx")
+    p.set_defaults(handler=export)
+
+    commands.add_parser("query", add_help=False, help="free/busy queries (see: cli.py query --help)")
+    commands.add_parser("bench", add_help=False, help=f"benchmarks: {', '.join(BENCHMARKS)}")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in FORWARDED:
+        return FORWARDED[argv[0]](argv[1:])
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+# compact.py
+"""Array-backed timetable with interned ids.
+
+The JSON timetable repeats a {"teacher","subject","room","isLab","group"} dict in
+every slot (twice for labs). CompactTimetable interns teachers, subjects, rooms,
+groups and sections to small integers, keeps each distinct session once in an
+`entries` table, and stores the week as one NumPy array
+
+    grid[day, section, slot, k] -> entry id (or -1)
+
+where k indexes the parallel sessions of a slot. Conversion to and from the
+JSON structure is lossless, and per-slot questions (who is busy, which rooms
+clash) become vectorised array operations.
+"""
+import numpy as np
+
+EMPTY = -1
+# Columns of the entries table
+TEACHER, SUBJECT, ROOM, IS_LAB, GROUP = range(5)
+ENTRY_KEYS = ("teacher", "subject", "room", "isLab", "group")
+
+
+class Interner:
+    """Bidirectional str <-> int mapping that assigns ids in first-seen order."""
+
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name):
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+        return self.ids[name]
+
+    def __getitem__(self, name):
+        return self.ids[name]
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __len__(self):
+        return len(self.names)
+
+
+class CompactTimetable:
+    """A whole week's timetable as an entry table plus a days x sections x slots x k id grid."""
+
+    def __init__(self, days, slots, sections, teachers, subjects, rooms, groups, entries, grid):
+        self.days = list(days)
+        self.slots = list(slots)
+        self.sections = sections
+        self.teachers = teachers
+        self.subjects = subjects
+        self.rooms = rooms
+        self.groups = groups
+        self.entries = entries  # int32 array, one row per distinct session, columns TEACHER..GROUP
+        self.grid = grid        # int32 array [day, section, slot, k] -> row of `entries` or EMPTY
+
+    # ---------------- Conversion ---------------- #
+
+    @classmethod
+    def from_json(cls, timetable):
+        """Builds the compact form from the {day: [section schedules]} structure."""
+        days = list(timetable)
+        if not days:
+            raise ValueError("Timetable has no days")
+        first_day = timetable[days[0]]
+        section_names = [s["section"] for s in first_day]
+        slots = [key for key in first_day[0] if key != "section"] if first_day else []
+        for day in days:
+            if [s["section"] for s in timetable[day]] != section_names:
+                raise ValueError(f"{day} lists different sections than {days[0]}")
+
+        sections = Interner(section_names)
+        teachers, subjects, rooms, groups = Interner(), Interner(), Interner(), Interner()
+        entry_ids = {}
+        rows = []
+        depth = max([len(section_obj.get(slot, [])) for day in days
+                     for section_obj in timetable[day] for slot in slots] or [0])
+        grid = np.full((len(days), len(sections), len(slots), max(depth, 1)), EMPTY, dtype=np.int32)
+
+        for d, day in enumerate(days):
+            for sec_idx, section_obj in enumerate(timetable[day]):
+                if list(section_obj) != ["section"] + slots:
+                    raise ValueError(f"{day}/{section_obj['section']} does not have the slots {slots}")
+                for slot_idx, slot in enumerate(slots):
+                    for k, entry in enumerate(section_obj[slot]):
+                        if list(entry) not in (list(ENTRY_KEYS), list(ENTRY_KEYS[:4])):
+                            raise ValueError(f"Unsupported entry layout {list(entry)} on {day}/{slot}")
+                        row = (teachers.intern(entry["teacher"]), subjects.intern(entry["subject"]),
+                               rooms.intern(entry["room"]), int(bool(entry["isLab"])),
+                               groups.intern(entry["group"]) if "group" in entry else EMPTY)
+                        if row not in entry_ids:
+                            entry_ids[row] = len(rows)
+                            rows.append(row)
+                        grid[d, sec_idx, slot_idx, k] = entry_ids[row]
+
+        entries = np.array(rows, dtype=np.int32).reshape(len(rows), len(ENTRY_KEYS))
+        return cls(days, slots, sections, teachers, subjects, rooms, groups, entries, grid)
+
+    def entry_dict(self, entry_id):
+        """The JSON dict of one entry."""
+        teacher, subject, room, is_lab, group = (int(v) for v in self.entries[entry_id])
+        entry = {"teacher": self.teachers.names[teacher], "subject": self.subjects.names[subject],
+                 "room": self.rooms.names[room], "isLab": bool(is_lab)}
+        if group != EMPTY:
+            entry["group"] = self.groups.names[group]
+        return entry
+
+    def to_json(self):
+        """Rebuilds the {day: [section schedules]} structure."""
+        output = {}
+        for d, day in enumerate(self.days):
+            day_list = []
+            for sec_idx, section in enumerate(self.sections.names):
+                section_obj = {"section": section}
+                for slot_idx, slot in enumerate(self.slots):
+                    ids = self.grid[d, sec_idx, slot_idx]
+                    section_obj[slot] = [self.entry_dict(int(i)) for i in ids[ids != EMPTY]]
+                day_list.append(section_obj)
+            output[day] = day_list
+        return output
+
+    # ---------------- Vectorised queries ---------------- #
+
+    def _column(self, column):
+        """Array shaped like grid with the given entry column (EMPTY where the grid is empty)."""
+        values = np.full(self.grid.shape, EMPTY, dtype=np.int32)
+        filled = self.grid != EMPTY
+        values[filled] = self.entries[self.grid[filled], column]
+        return values
+
+    def usage(self, column, size):
+        """counts[day, slot, id]: how many sessions use each teacher/room/... in each slot."""
+        values = self._column(column)
+        counts = np.zeros((len(self.days), len(self.slots), size), dtype=np.int32)
+        d, _, s, _ = np.nonzero(values != EMPTY)
+        np.add.at(counts, (d, s, values[values != EMPTY]), 1)
+        return counts
+
+    def room_usage(self):
+        return self.usage(ROOM, len(self.rooms))
+
+    def teacher_usage(self):
+        return self.usage(TEACHER, len(self.teachers))
+
+    def section_busy(self):
+        """busy[day, section, slot]: whether the section has any session in the slot."""
+        return (self.grid != EMPTY).any(axis=3)
+
+    def clashes(self, column=ROOM):
+        """(day, slot, name) triples where a room (or teacher, with column=TEACHER) is double-booked.
+
+        A lab shown for a section in several parallel cells counts once per cell,
+        so distinct sessions sharing a resource at the same time are what is reported.
+        """
+        interner = self.rooms if column == ROOM else self.teachers
+        counts = self.usage(column, len(interner))
+        return [(self.days[d], self.slots[s], interner.names[i]) for d, s, i in zip(*np.nonzero(counts > 1))]
+
+    def nbytes(self):
+        return self.entries.nbytes + self.grid.nbytes
@@ -1,41 +1,175 @@
 # config_loader.py
+"""Loads, validates and indexes config.json.
+
+The schema is checked once when a Config is built; the lookup maps derived from
+it (lab -> teacher, slot -> index, teacher/room -> sections, ...) are frozen so
+that the model code can share them freely.
+"""
 import json
+from types import MappingProxyType
+
+
+class ConfigError(ValueError):
+    """The config does not match the expected schema."""
+
+
+def _is_str_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def validate(data):
+    """Raises ConfigError listing every schema problem found in the raw config."""
+    problems = []
+    if not isinstance(data, dict):
+        raise ConfigError("The config must be a JSON object")
+    for key, kind in (('settings', dict), ('sections', list), ('lab_rooms', list), ('subjects', dict),
+                      ('labs', dict), ('section_theory_rooms', dict), ('objective_weights', dict)):
+        if not isinstance(data.get(key), kind):
+            problems.append(f"'{key}' must be a {'object' if kind is dict else 'list'}")
+    if problems:
+        raise ConfigError("; ".join(problems))
+
+    settings = data['settings']
+    for key in ('days', 'all_slots', 'lab_slot_starts', 'groups'):
+        value = settings.get(key)
+        if not _is_str_list(value):
+            problems.append(f"settings.{key} must be a list of strings")
+        elif len(set(value)) != len(value):
+            problems.append(f"settings.{key} has duplicates")
+    if not problems:
+        for slot in settings['lab_slot_starts']:
+            if slot not in settings['all_slots']:
+                problems.append(f"settings.lab_slot_starts: '{slot}' is not one of all_slots")
+
+    sections = data['sections']
+    if not _is_str_list(sections) or len(set(sections)) != len(sections):
+        problems.append("'sections' must be a list of distinct strings")
+        sections = []
+    if not _is_str_list(data['lab_rooms']):
+        problems.append("'lab_rooms' must be a list of strings")
+    known = set(sections)
+
+    for section, pairs in data['subjects'].items():
+        if not (isinstance(pairs, list) and all(isinstance(p, list) and len(p) == 2 and _is_str_list(p)
+                                                for p in pairs)):
+            problems.append(f"subjects.{section} must be a list of [subject, teacher] pairs")
+    for key, check, expected in (
+            ('subjects', None, None),
+            ('labs', _is_str_list, "a list of lab names"),
+            ('section_theory_rooms', lambda v: isinstance(v, str), "a room name"),
+            ('section_lab_rooms', _is_str_list, "a list of lab rooms")):
+        for section, value in data.get(key, {}).items():
+            if section not in known:
+                problems.append(f"{key}: '{section}' is not one of the sections")
+            elif check and not check(value):
+                problems.append(f"{key}.{section} must be {expected}")
+
+    lab_subjects = data.get('lab_subjects', {})
+    if not (isinstance(lab_subjects, dict) and all(isinstance(v, str) for v in lab_subjects.values())):
+        problems.append("'lab_subjects' must map lab names to subject names")
+    for name, weight in data['objective_weights'].items():
+        if not isinstance(weight, (int, float)) or isinstance(weight, bool):
+            problems.append(f"objective_weights.{name} must be a number")
+    if problems:
+        raise ConfigError("; ".join(problems))
+
+
+def derive(data):
+    """Computes the lookup maps of a validated config as plain (picklable) dicts and sets."""
+    subjects = data['subjects']
+    lab_rooms = data['lab_rooms']
+    section_lab_rooms = data.get('section_lab_rooms', {})
+    lab_subjects = data.get('lab_subjects', {})
+
+    lab_teacher = {}
+    for section, labs in data['labs'].items():
+        teacher_of = {}
+        for subject, teacher in subjects.get(section, []):
+            teacher_of.setdefault(subject, teacher)
+        for lab_name in labs:
+            teacher = teacher_of.get(lab_subjects.get(lab_name, lab_name.replace(' Lab', '')))
+            if teacher:
+                lab_teacher[(section, lab_name)] = teacher
+
+    teacher_sections = {}
+    for section in data['sections']:
+        for _, teacher in subjects.get(section, []):
+            if section not in teacher_sections.setdefault(teacher, []):
+                teacher_sections[teacher].append(section)
+    room_sections = {}
+    for section in data['sections']:
+        rooms = []
+        if section in data['section_theory_rooms']:
+            rooms.append(data['section_theory_rooms'][section])
+        if data['labs'].get(section):
+            rooms += section_lab_rooms.get(section, lab_rooms)
+        for room in rooms:
+            if section not in room_sections.setdefault(room, []):
+                room_sections[room].append(section)
+
+    all_slots = data['settings']['all_slots']
+    return {
+        'ALL_TEACHERS': sorted({teacher for pairs in subjects.values() for _, teacher in pairs}),
+        'ALL_ROOMS': sorted(set(data['section_theory_rooms'].values()) | set(lab_rooms)),
+        'LAB_NAMES': sorted({lab for labs in data['labs'].values() for lab in labs}),
+        'LAB_TEACHER': lab_teacher,
+        'SLOT_INDEX': {slot: i for i, slot in enumerate(all_slots)},
+        'LAB_START_INDICES': {all_slots.index(slot) for slot in data['settings']['lab_slot_starts']},
+        'TEACHER_SECTIONS': teacher_sections,
+        'ROOM_SECTIONS': room_sections,
+    }
+
 
 class Config:
+    """The raw config plus validated, frozen lookup maps."""
+
+    __slots__ = ('data', 'DAYS', 'ALL_SLOTS', 'LAB_SLOT_STARTS', 'GROUPS', 'SECTIONS', 'LAB_ROOMS',
+                 'SUBJECTS', 'LABS', 'SECTION_THEORY_ROOM', 'WEIGHTS', 'SECTION_LAB_ROOMS',
+                 'ALL_TEACHERS', 'ALL_ROOMS', 'LAB_NAMES', 'LAB_TEACHER', 'SLOT_INDEX',
+                 'LAB_START_INDICES', 'TEACHER_SECTIONS', 'ROOM_SECTIONS')
+
     def __init__(self, data):
+        validate(data)
+        derived = derive(data)
         self.data = data
-        self._process_data()
-
-    def _process_data(self):
-        """Processes raw data to create derived lists like all teachers, rooms, etc."""
-        self.DAYS = self.data['settings']['days']
-        self.ALL_SLOTS = self.data['settings']['all_slots']
-        self.LAB_SLOT_STARTS = self.data['settings']['lab_slot_starts']
-        self.GROUPS = self.data['settings']['groups']
-        self.SECTIONS = self.data['sections']
-        self.LAB_ROOMS = self.data['lab_rooms']
-        self.SUBJECTS = self.data['subjects']
-        self.LABS = self.data['labs']
-        self.SECTION_THEORY_ROOM = self.data['section_theory_rooms']
-        self.WEIGHTS = self.data['objective_weights']
-        
-        # Derived properties
-        self.ALL_TEACHERS = sorted(list(set(
-            teacher for section_subjects in self.SUBJECTS.values() for _, teacher in section_subjects
-        )))
-        self.ALL_ROOMS = sorted(list(set(self.SECTION_THEORY_ROOM.values()) | set(self.LAB_ROOMS)))
-        self.LAB_NAMES = sorted(list({lab for labs in self.LABS.values() for lab in labs}))
+        self.DAYS = data['settings']['days']
+        self.ALL_SLOTS = data['settings']['all_slots']
+        self.LAB_SLOT_STARTS = data['settings']['lab_slot_starts']
+        self.GROUPS = data['settings']['groups']
+        self.SECTIONS = data['sections']
+        self.LAB_ROOMS = data['lab_rooms']
+        self.SUBJECTS = data['subjects']
+        self.LABS = data['labs']
+        self.SECTION_THEORY_ROOM = data['section_theory_rooms']
+        self.WEIGHTS = data['objective_weights']
+        # Optional: restrict a section's labs to a subset of the lab rooms (e.g. per school)
+        self.SECTION_LAB_ROOMS = data.get('section_lab_rooms', {})
+
+        # Derived, read-only lookups
+        self.ALL_TEACHERS = derived['ALL_TEACHERS']
+        self.ALL_ROOMS = derived['ALL_ROOMS']
+        self.LAB_NAMES = derived['LAB_NAMES']
+        self.LAB_TEACHER = MappingProxyType(derived['LAB_TEACHER'])            # (section, lab) -> teacher
+        self.SLOT_INDEX = MappingProxyType(derived['SLOT_INDEX'])              # slot name -> index
+        self.LAB_START_INDICES = frozenset(derived['LAB_START_INDICES'])       # slot indices a lab may start at
+        self.TEACHER_SECTIONS = MappingProxyType(
+            {teacher: tuple(sections) for teacher, sections in derived['TEACHER_SECTIONS'].items()})
+        self.ROOM_SECTIONS = MappingProxyType(
+            {room: tuple(sections) for room, sections in derived['ROOM_SECTIONS'].items()})
+
+    def __reduce__(self):
+        # The frozen maps are not picklable; rebuild them from the raw data instead
+        return (Config, (self.data,))
+
+    def get_lab_rooms(self, section):
+        return self.SECTION_LAB_ROOMS.get(section, self.LAB_ROOMS)
 
     def get_teacher_for_lab(self, section, lab_name):
-        subject_name_map = {'Web Programming Lab': 'IWP', 'Artificial Intelligence Lab': 'AI', 'Seminar Lab': 'SM'}
-        subject_name = subject_name_map.get(lab_name, lab_name.replace(' Lab', ''))
-        for subject, teacher in self.SUBJECTS.get(section, []):
-            if subject == subject_name:
-                return teacher
-        return None
+        return self.LAB_TEACHER.get((section, lab_name))
+
 
 def load_config(filepath="src/python/config.json"):
     """Loads the configuration from a JSON file and returns a Config object."""
-    with open(filepath, 'r') as f:
+    with open(filepath, 'r', encoding="utf-8") as f:
         data = json.load(f)
-    return Config(data)
\ No newline at end of file
+    return Config(data)
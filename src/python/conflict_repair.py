@@ -0,0 +1,285 @@
+# conflict_repair.py
+"""Global repair of the room and teacher clashes left after lab merging.
+
+Replaces the greedy loop of timetable_resolve.js, which rebuilt the whole usage
+map on every iteration, fixed one clash at a time and only tried later blocks
+of the same day. Here:
+ - an OccupancyIndex counts the sessions of every (room | teacher | section,
+   day, slot) once and is updated incrementally as labs move, so the current
+   set of clashes is always known without rescanning the timetable;
+ - all clashing 2-hour labs are re-placed together by one small CP-SAT model
+   over every lab block of the week, which minimizes the number of moved labs
+   (a move to another day costs more than one within the day);
+ - the moves keep the hard rules of the solver model that lab placement can
+   break: at most two labs per group a day, one session per teacher and
+   section a day, and no session starting both at 12-1 and at 2-3 (recess) for
+   a teacher or a section;
+ - if clashes survive because the labs involved have nowhere to go, the model
+   is solved again with every lab of the timetable movable, so a clash is only
+   reported when no set of lab moves can remove it.
+The first model is sized by the number of clashing labs, not by the timetable.
+"""
+from collections import defaultdict, namedtuple, Counter
+
+from ortools.sat.python import cp_model
+
+# A 2-hour lab of one section: `start` is the index of its first slot in ALL_SLOTS
+LabBlock = namedtuple("LabBlock", "section day start entry")
+
+SAME_DAY_MOVE_COST = 1
+OTHER_DAY_MOVE_COST = 2
+MAX_LABS_PER_GROUP_DAY = 2  # workload_limits in constraints.py
+MAX_SESSIONS_PER_TEACHER_SECTION_DAY = 1  # teacher_once_per_section in constraints.py
+RECESS_SLOTS = ("12-1", "2-3")  # a teacher or section starts a session in at most one of them a day
+CLASH_KINDS = ("room", "teacher")
+
+
+def _keys(section, day, slot, entry):
+    return (("room", day, slot, entry["room"]),
+            ("teacher", day, slot, entry["teacher"]),
+            ("section", day, slot, section))
+
+
+class OccupancyIndex:
+    """Sessions per (kind, day, slot, name) for kind room/teacher/section, kept current on add/remove.
+
+    `clashes` always holds the room and teacher keys that are used more than once.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.clashes = set()
+
+    def add(self, section, day, slot, entry):
+        for key in _keys(section, day, slot, entry):
+            self.counts[key] += 1
+            if key[0] in CLASH_KINDS and self.counts[key] > 1:
+                self.clashes.add(key)
+
+    def remove(self, section, day, slot, entry):
+        for key in _keys(section, day, slot, entry):
+            self.counts[key] -= 1
+            if self.counts[key] <= 1:
+                self.clashes.discard(key)
+            if not self.counts[key]:
+                del self.counts[key]
+
+    @classmethod
+    def from_timetable(cls, timetable, slots):
+        index = cls()
+        for day, day_list in timetable.items():
+            for section_schedule in day_list:
+                for slot in slots:
+                    for entry in section_schedule.get(slot) or []:
+                        index.add(section_schedule["section"], day, slot, entry)
+        return index
+
+
+def find_lab_blocks(timetable, slots):
+    """Every 2-hour lab in the timetable: an isLab entry shown in two consecutive slots."""
+    blocks = []
+    for day, day_list in timetable.items():
+        for section_schedule in day_list:
+            continued = []  # entries already claimed as the second hour of a block
+            for i, slot in enumerate(slots[:-1]):
+                current = section_schedule.get(slot) or []
+                following = section_schedule.get(slots[i + 1]) or []
+                starting = []
+                for entry in current:
+                    if entry in continued:
+                        continued.remove(entry)
+                    elif entry.get("isLab") and entry in following:
+                        starting.append(entry)
+                        blocks.append(LabBlock(section_schedule["section"], day, i, entry))
+                continued = starting
+    return blocks
+
+
+def _block_slots(block_start, slots):
+    return slots[block_start:block_start + 2]
+
+
+def _start_keys(section, day, slot, entry):
+    """The counted keys of a session of `section` starting at (day, slot)."""
+    return (("teacher_section", day, entry["teacher"], section),
+            ("teacher_start", day, slot, entry["teacher"]),
+            ("section_start", day, slot, section))
+
+
+def count_starts(timetable, blocks, slots):
+    """Sessions per start key: every entry starts a session except the second hour of a lab block."""
+    counts = Counter()
+    for day, day_list in timetable.items():
+        for section_schedule in day_list:
+            for slot in slots:
+                for entry in section_schedule.get(slot) or []:
+                    counts.update(_start_keys(section_schedule["section"], day, slot, entry))
+    for block in blocks:
+        counts.subtract(_start_keys(block.section, block.day, slots[block.start + 1], block.entry))
+    return counts
+
+
+def _solve_placements(candidates, all_blocks, index, starts_count, config, time_limit):
+    """Jointly chooses a (day, start) for every candidate lab. Returns the new placements, or None.
+
+    `starts_count` is count_starts of the current timetable.
+    """
+    slots = config.ALL_SLOTS
+    starts = [start for start in sorted(config.LAB_START_INDICES) if start + 1 < len(slots)]
+    model = cp_model.CpModel()
+
+    # Occupancy that does not move: everything in the index minus the candidates themselves
+    movable = Counter()
+    for block in candidates:
+        for slot in _block_slots(block.start, slots):
+            movable.update(_keys(block.section, block.day, slot, block.entry))
+    group_day_current = Counter((b.section, b.entry.get("group"), b.day) for b in candidates)
+    group_day_fixed = Counter((b.section, b.entry.get("group"), b.day) for b in all_blocks)
+    group_day_fixed.subtract(group_day_current)
+    starts_current = Counter()
+    for block in candidates:
+        starts_current.update(_start_keys(block.section, block.day, slots[block.start], block.entry))
+
+    def fixed(key):
+        return index.counts[key] - movable[key]
+
+    choices = []
+    covering = defaultdict(list)  # occupancy key -> [(literal, is_move)]
+    group_day = defaultdict(list)
+    starting = defaultdict(list)  # start key -> literals of the options starting a session there
+    move_costs = []
+    for i, block in enumerate(candidates):
+        options = {}
+        for day in config.DAYS:
+            for start in starts:
+                is_current = (day, start) == (block.day, block.start)
+                block_slots = _block_slots(start, slots)
+                # Like the greedy resolver, a lab only moves into slots where its section is free
+                if not is_current and any(fixed(("section", day, slot, block.section)) for slot in block_slots):
+                    continue
+                options[(day, start)] = model.NewBoolVar(f"place_{i}_{day}_{start}")
+        if (block.day, block.start) not in options:  # a lab sitting outside LAB_SLOT_STARTS may stay
+            options[(block.day, block.start)] = model.NewBoolVar(f"place_{i}_{block.day}_{block.start}")
+        model.AddExactlyOne(options.values())
+
+        for (day, start), literal in options.items():
+            is_move = (day, start) != (block.day, block.start)
+            for slot in _block_slots(start, slots):
+                for key in _keys(block.section, day, slot, block.entry):
+                    covering[key].append((literal, is_move))
+            group_day[(block.section, block.entry.get("group"), day)].append(literal)
+            for key in _start_keys(block.section, day, slots[start], block.entry):
+                starting[key].append(literal)
+            if is_move:
+                move_costs.append((SAME_DAY_MOVE_COST if day == block.day else OTHER_DAY_MOVE_COST) * literal)
+        choices.append(options)
+
+    excess = []
+    for key, literals in covering.items():
+        if key[0] == "section":
+            # A section slot entered by a moved lab must be otherwise empty
+            moves = [literal for literal, is_move in literals if is_move]
+            if moves:
+                model.AddAtMostOne(moves)
+                for literal, is_move in literals:
+                    if not is_move:
+                        model.AddAtMostOne(moves + [literal])
+        else:
+            over = model.NewIntVar(0, len(literals) + max(fixed(key), 0), f"excess_{len(excess)}")
+            model.Add(sum(literal for literal, _ in literals) + fixed(key) <= 1 + over)
+            excess.append(over)
+    for key, literals in group_day.items():
+        # Staying put is always allowed, even for a day that was already over the limit
+        limit = max(MAX_LABS_PER_GROUP_DAY, group_day_fixed[key] + group_day_current[key])
+        model.Add(sum(literals) + group_day_fixed[key] <= limit)
+
+    def starts(key):
+        """Sessions starting at `key`: the literals of the candidates plus the fixed count."""
+        return sum(starting.get(key, [])) + starts_count[key] - starts_current[key]
+
+    def limit(keys, most):
+        # As above, a timetable that already breaks the rule may keep doing so where it stands
+        return max(most, sum(starts_count[key] for key in keys))
+
+    for key in starting:
+        if key[0] == "teacher_section":
+            model.Add(starts(key) <= limit([key], MAX_SESSIONS_PER_TEACHER_SECTION_DAY))
+    if all(slot in config.SLOT_INDEX for slot in RECESS_SLOTS):
+        recess_days = {(kind, day, name) for kind, day, slot, name in
+                       (key for key in starting if key[0] != "teacher_section") if slot in RECESS_SLOTS}
+        for kind, day, name in recess_days:
+            keys = [(kind, day, slot, name) for slot in RECESS_SLOTS]
+            model.Add(sum(starts(key) for key in keys) <= limit(keys, 1))
+
+    # Any remaining clash outweighs moving every candidate to another day
+    clash_weight = OTHER_DAY_MOVE_COST * len(candidates) + 1
+    model.Minimize(clash_weight * sum(excess) + sum(move_costs))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    num_workers = int(config.data['settings'].get('num_workers', 0))
+    if num_workers:
+        solver.parameters.num_workers = num_workers
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    return [next(place for place, literal in options.items() if solver.BooleanValue(literal))
+            for options in choices]
+
+
+def _move(block, new_day, new_start, schedules, index, slots):
+    old_schedule = schedules[(block.day, block.section)]
+    for slot in _block_slots(block.start, slots):
+        old_schedule[slot].remove(block.entry)
+        index.remove(block.section, block.day, slot, block.entry)
+    new_schedule = schedules[(new_day, block.section)]
+    for slot in _block_slots(new_start, slots):
+        entry = dict(block.entry)
+        new_schedule.setdefault(slot, []).append(entry)
+        index.add(block.section, new_day, slot, entry)
+
+
+def _labs_in_clashes(blocks, clashes, slots):
+    clashing = set(clashes)
+    return [block for block in blocks
+            if any(key in clashing for slot in _block_slots(block.start, slots)
+                   for key in _keys(block.section, block.day, slot, block.entry))]
+
+
+def repair_conflicts(timetable, config, time_limit=10.0):
+    """Moves as few labs as possible so that no room or teacher is double-booked. Modifies in place.
+
+    Returns the sorted list of (day, slot, room or teacher) clashes that no lab move can remove.
+    """
+    slots = config.ALL_SLOTS
+    index = OccupancyIndex.from_timetable(timetable, slots)
+    if not index.clashes:
+        return []
+    schedules = {(day, s["section"]): s for day, day_list in timetable.items() for s in day_list}
+    print(f"   - {len(index.clashes)} room/teacher clash(es) found; re-placing the labs involved...")
+
+    all_blocks = find_lab_blocks(timetable, slots)
+    for scope in ("clashing", "all"):
+        candidates = _labs_in_clashes(all_blocks, index.clashes, slots) if scope == "clashing" else all_blocks
+        if not candidates:
+            break
+        placements = _solve_placements(candidates, all_blocks, index, count_starts(timetable, all_blocks, slots),
+                                       config, time_limit)
+        if placements is None:
+            print(f"   - ❌ No re-placement found for the {scope} labs within {time_limit:.0f}s.")
+            continue
+        for block, (day, start) in zip(candidates, placements):
+            if (day, start) != (block.day, block.start):
+                _move(block, day, start, schedules, index, slots)
+                label = block.entry["subject"] + (f" (Group {block.entry['group']})" if "group" in block.entry else "")
+                print(f"   - ✅ Moved {label} of {block.section} from {block.day} {slots[block.start]} "
+                      f"to {day} {slots[start]}.")
+        if not index.clashes:
+            break
+        all_blocks = find_lab_blocks(timetable, slots)
+
+    unresolved = sorted(((day, slot, name) for _, day, slot, name in index.clashes),
+                        key=lambda c: (config.DAYS.index(c[0]), config.SLOT_INDEX[c[1]], c[2]))
+    for day, slot, name in unresolved:
+        print(f"⚠️  {name} is double-booked on {day} at {slot}; no lab move can free it.")
+    return unresolved
@@ -1,12 +1,99 @@
 # constraints.py
-
-def add_hard_constraints(model, class_vars, config):
-    """Adds all the mandatory (hard) constraints to the model."""
-    _add_resource_uniqueness(model, class_vars, config)
-    _add_scheduling_rules(model, class_vars, config)
-    _add_workload_limits(model, class_vars, config)
-    _add_teacher_constraints(model, class_vars, config)
-    _add_section_recess_constraints(model, class_vars, config)
+import interval_model
+from metrics import timed
+
+FAMILIES = (
+    "resource_uniqueness", "weekly_theory", "lab_once",
+    "workload_limits", "teacher_once_per_section", "recess",
+)
+
+
+class ConstraintGuard:
+    """Decides which constraint families are added and, when tracking, guards them.
+
+    Families (or single scopes of a family, written "family:scope" with a section,
+    teacher or room name) listed in settings.disabled_constraints are left out.
+    With track=True every added constraint is enforced by a named literal per
+    family, or per (family, scope) with granularity="scope"; solving with those
+    literals as assumptions lets CP-SAT name the rules that conflict.
+    """
+
+    def __init__(self, model, disabled=(), track=False, granularity="family"):
+        unknown = {entry.split(':', 1)[0] for entry in disabled} - set(FAMILIES)
+        if unknown:
+            raise ValueError(f"Unknown constraint families {sorted(unknown)}; expected {FAMILIES}")
+        self.model = model
+        self.disabled = set(disabled)
+        self.track = track
+        self.granularity = granularity
+        self.literals = {}  # (family, scope or None) -> enforcement literal
+
+    @classmethod
+    def from_config(cls, model, config, track=False):
+        settings = config.data['settings']
+        return cls(model, settings.get('disabled_constraints', []), track,
+                   settings.get('explain_granularity', "family"))
+
+    def enabled(self, family, scope=None):
+        return family not in self.disabled and f"{family}:{scope}" not in self.disabled
+
+    def literal(self, family, scope=None):
+        """The enforcement literal for a constraint, or None when not tracking."""
+        if not self.track:
+            return None
+        key = (family, scope if self.granularity == "scope" else None)
+        if key not in self.literals:
+            name = f"enforce_{family}" + (f"_{key[1]}" if key[1] is not None else "")
+            self.literals[key] = self.model.NewBoolVar(name)
+        return self.literals[key]
+
+    def add(self, family, scope, constraint):
+        """Adds the constraint (a bounded linear expression) unless its family/scope is disabled."""
+        if not self.enabled(family, scope):
+            return None
+        ct = self.model.Add(constraint)
+        lit = self.literal(family, scope)
+        if lit is not None:
+            ct.OnlyEnforceIf(lit)
+        return ct
+
+    def add_at_most_one(self, family, scope, literals):
+        if not self.enabled(family, scope):
+            return None
+        # AtMostOne has no enforcement literal, so tracked copies use the linear form
+        if self.track:
+            return self.add(family, scope, sum(literals) <= 1)
+        return self.model.AddAtMostOne(literals)
+
+    def add_exactly_one(self, family, scope, literals):
+        if not self.enabled(family, scope):
+            return None
+        if self.track:
+            return self.add(family, scope, sum(literals) == 1)
+        return self.model.AddExactlyOne(literals)
+
+
+def add_hard_constraints(model, class_vars, config, guard=None, metrics=None):
+    """Adds all the mandatory (hard) constraints to the model.
+
+    With a metrics.Metrics, each rule family is recorded as its own phase.
+    """
+    guard = guard or ConstraintGuard.from_config(model, config)
+    backend = config.data['settings'].get('model_backend', 'boolean')
+    # NoOverlap cannot carry an enforcement literal, so tracked runs use the boolean form
+    if backend == 'interval' and not guard.track:
+        with timed(metrics, "constraints.resource_no_overlap", model):
+            if guard.enabled("resource_uniqueness"):
+                interval_model.add_resource_no_overlap(model, class_vars, config, guard)
+    else:
+        with timed(metrics, "constraints.resource_uniqueness", model):
+            _add_resource_uniqueness(model, class_vars, config, guard)
+    for name, add in (("scheduling_rules", _add_scheduling_rules),
+                      ("workload_limits", _add_workload_limits),
+                      ("teacher_constraints", _add_teacher_constraints),
+                      ("section_recess", _add_section_recess_constraints)):
+        with timed(metrics, f"constraints.{name}", model):
+            add(model, class_vars, config, guard)
 
 
 def add_soft_constraints(model, class_vars, config, penalties):
@@ -16,141 +103,121 @@ def add_soft_constraints(model, class_vars, config, penalties):
 
 # ---------------- HARD CONSTRAINTS ---------------- #
 
-def _add_resource_uniqueness(model, class_vars, config):
+def _add_resource_uniqueness(model, class_vars, config, guard):
     """Ensures rooms, teachers, and sections are not double-booked."""
 
     # 1. A room can have only one class per slot
     for day_idx in range(len(config.DAYS)):
         for slot_idx in range(len(config.ALL_SLOTS)):
             for room in config.ALL_ROOMS:
-                active_in_slot = []
-                for (sec, grp, subj, tc, d, s, rm), var in class_vars.items():
-                    if d == day_idx and rm == room:
-                        if ('Lab' in subj and (s == slot_idx or s + 1 == slot_idx)) or \
-                           ('Lab' not in subj and s == slot_idx):
-                            active_in_slot.append(var)
-                model.AddAtMostOne(active_in_slot)
+                active_in_slot = class_vars.by_room_slot.get((day_idx, slot_idx, room))
+                if active_in_slot:
+                    guard.add_at_most_one("resource_uniqueness", room, active_in_slot)
 
     # 2. A teacher can teach only one class per slot
     for day_idx in range(len(config.DAYS)):
         for slot_idx in range(len(config.ALL_SLOTS)):
             for teacher in config.ALL_TEACHERS:
-                active_in_slot = []
-                for (sec, grp, subj, tc, d, s, rm), var in class_vars.items():
-                    if d == day_idx and tc == teacher:
-                        if ('Lab' in subj and (s == slot_idx or s + 1 == slot_idx)) or \
-                           ('Lab' not in subj and s == slot_idx):
-                            active_in_slot.append(var)
-                model.AddAtMostOne(active_in_slot)
+                active_in_slot = class_vars.by_teacher_slot.get((teacher, day_idx, slot_idx))
+                if active_in_slot:
+                    guard.add_at_most_one("resource_uniqueness", teacher, active_in_slot)
 
     # 3. A section/group can have only one class per slot
     for section in config.SECTIONS:
         for group in config.GROUPS + ['ALL']:
             for day_idx in range(len(config.DAYS)):
                 for slot_idx in range(len(config.ALL_SLOTS)):
-                    active_in_slot = []
-                    for (sec, grp, subj, tc, d, s, rm), var in class_vars.items():
-                        if sec == section and d == day_idx and (grp == group or (group == 'ALL' and grp in config.GROUPS)):
-                            if ('Lab' in subj and (s == slot_idx or s + 1 == slot_idx)) or \
-                               ('Lab' not in subj and s == slot_idx):
-                                active_in_slot.append(var)
-                    model.AddAtMostOne(active_in_slot)
+                    active_in_slot = class_vars.by_group_slot.get((section, group, day_idx, slot_idx))
+                    if active_in_slot:
+                        guard.add_at_most_one("resource_uniqueness", section, active_in_slot)
 
 
-def _add_scheduling_rules(model, class_vars, config):
+def _add_scheduling_rules(model, class_vars, config, guard):
     """Adds specific rules like class counts and recess."""
 
     # 4. Each theory subject taught exactly 3 times a week
     for section, section_subjects in config.SUBJECTS.items():
         for subject, teacher in section_subjects:
-            vars_for_subject = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                                if sec == section and subj == subject]
+            vars_for_subject = class_vars.by_subject.get((section, subject))
             if vars_for_subject:
-                model.Add(sum(vars_for_subject) == 3)
+                guard.add("weekly_theory", section, sum(vars_for_subject) == 3)
 
     # 5. Each lab for each group scheduled exactly once
     for section, section_labs in config.LABS.items():
         for lab_name in section_labs:
             for group in config.GROUPS:
-                vars_for_lab = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                                if sec == section and grp == group and subj == lab_name]
+                vars_for_lab = class_vars.by_lab_group.get((section, group, lab_name))
                 if vars_for_lab:
-                    model.AddExactlyOne(vars_for_lab)
+                    guard.add_exactly_one("lab_once", section, vars_for_lab)
 
 
-def _add_workload_limits(model, class_vars, config):
+def _add_workload_limits(model, class_vars, config, guard):
     """Adds rules to limit the number of classes per day."""
 
     # 6. Max 4 theory classes per section per day
     for section in config.SECTIONS:
         for day_idx in range(len(config.DAYS)):
-            daily_theory = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                            if sec == section and d == day_idx and 'Lab' not in subj]
-            model.Add(sum(daily_theory) <= 4)
+            daily_theory = class_vars.by_section_day_theory.get((section, day_idx))
+            if daily_theory:
+                guard.add("workload_limits", section, sum(daily_theory) <= 4)
 
     # 7. Max 2 labs per section per group per day
     for section in config.SECTIONS:
         for group in config.GROUPS:
             for day_idx in range(len(config.DAYS)):
-                daily_labs = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                              if sec == section and grp == group and d == day_idx and 'Lab' in subj]
-                model.Add(sum(daily_labs) <= 2)
+                daily_labs = class_vars.by_group_day_labs.get((section, group, day_idx))
+                if daily_labs:
+                    guard.add("workload_limits", section, sum(daily_labs) <= 2)
 
 
-def _add_teacher_constraints(model, class_vars, config):
+def _add_teacher_constraints(model, class_vars, config, guard):
     """A teacher can teach at most one class per section per day + recess rule."""
-    slot_12_1_idx = config.ALL_SLOTS.index("12-1")
-    slot_2_3_idx = config.ALL_SLOTS.index("2-3")
+    slot_12_1_idx = config.SLOT_INDEX["12-1"]
+    slot_2_3_idx = config.SLOT_INDEX["2-3"]
 
     for teacher in config.ALL_TEACHERS:
         for section in config.SECTIONS:
             for day_idx in range(len(config.DAYS)):
-                classes_for_teacher = [
-                    var for (sec, grp, subj, tc, d, s, rm), var in class_vars.items()
-                    if tc == teacher and sec == section and d == day_idx
-                ]
+                classes_for_teacher = class_vars.by_teacher_section_day.get((teacher, section, day_idx))
                 if classes_for_teacher:
-                    model.Add(sum(classes_for_teacher) <= 1)
+                    guard.add("teacher_once_per_section", teacher, sum(classes_for_teacher) <= 1)
 
         # Recess rule for teachers
         for day_idx in range(len(config.DAYS)):
-            busy_at_12 = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                          if tc == teacher and d == day_idx and s == slot_12_1_idx]
-            busy_at_2 = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                         if tc == teacher and d == day_idx and s == slot_2_3_idx]
+            busy_at_12 = class_vars.by_teacher_start.get((teacher, day_idx, slot_12_1_idx))
+            busy_at_2 = class_vars.by_teacher_start.get((teacher, day_idx, slot_2_3_idx))
             if busy_at_12 and busy_at_2:
-                model.Add(sum(busy_at_12) + sum(busy_at_2) <= 1)
+                guard.add("recess", teacher, sum(busy_at_12) + sum(busy_at_2) <= 1)
 
 
-def _add_section_recess_constraints(model, class_vars, config):
+def _add_section_recess_constraints(model, class_vars, config, guard):
     """Recess rule also applies to sections: no 12–1 and 2–3 on the same day."""
-    slot_12_1_idx = config.ALL_SLOTS.index("12-1")
-    slot_2_3_idx = config.ALL_SLOTS.index("2-3")
+    slot_12_1_idx = config.SLOT_INDEX["12-1"]
+    slot_2_3_idx = config.SLOT_INDEX["2-3"]
 
     for section in config.SECTIONS:
         for day_idx in range(len(config.DAYS)):
-            busy_at_12 = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                          if sec == section and d == day_idx and s == slot_12_1_idx]
-            busy_at_2 = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                         if sec == section and d == day_idx and s == slot_2_3_idx]
+            busy_at_12 = class_vars.by_section_start.get((section, day_idx, slot_12_1_idx))
+            busy_at_2 = class_vars.by_section_start.get((section, day_idx, slot_2_3_idx))
             if busy_at_12 and busy_at_2:
-                model.Add(sum(busy_at_12) + sum(busy_at_2) <= 1)
+                guard.add("recess", section, sum(busy_at_12) + sum(busy_at_2) <= 1)
 
 
 # ---------------- SOFT CONSTRAINTS ---------------- #
 
 def _add_continuous_blocks_preference(model, class_vars, config, penalties):
     """Encourage continuous classes for each section."""
+    indicators = class_vars.indicators
     for section in config.SECTIONS:
         for day_idx in range(len(config.DAYS)):
             for slot_idx in range(len(config.ALL_SLOTS) - 1):
-                v1 = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                      if sec == section and d == day_idx and s == slot_idx]
-                v2 = [v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items()
-                      if sec == section and d == day_idx and s == slot_idx + 1]
-
-                if v1 and v2:
-                    penalty = model.NewIntVar(0, 1, f"gap_{section}_{day_idx}_{slot_idx}")
-                    model.Add(sum(v1) - sum(v2) <= penalty)
-                    model.Add(sum(v2) - sum(v1) <= penalty)
-                    penalties.append(penalty)
+                if not class_vars.by_section_start.get((section, day_idx, slot_idx)) or \
+                   not class_vars.by_section_start.get((section, day_idx, slot_idx + 1)):
+                    continue
+                busy_1 = indicators.busy(section, day_idx, slot_idx)
+                busy_2 = indicators.busy(section, day_idx, slot_idx + 1)
+
+                penalty = model.NewIntVar(0, 1, f"gap_{section}_{day_idx}_{slot_idx}")
+                model.Add(busy_1 - busy_2 <= penalty)
+                model.Add(busy_2 - busy_1 <= penalty)
+                penalties.append(penalty)
@@ -0,0 +1,186 @@
+# decomposition.py
+"""Splits the university into independent groups of sections and solves them in parallel.
+
+Two sections must be scheduled together when they can compete for a resource:
+ - a teacher (from SUBJECTS, which also gives the lab teachers),
+ - a theory room (SECTION_THEORY_ROOM),
+ - a lab subject, since each lab subject gets one room across all sections,
+ - the lab room that lab subject is in.
+The model picks the room of every lab subject from a shared pool, which would
+tie every section with labs together. So the lab-room decision is taken first
+(assign_lab_rooms): each lab subject is pinned to one room, spreading subjects
+over free rooms and only sharing a room within a group that is already joined.
+Each sub-model then sees just its own rooms (via section_lab_rooms), so every
+combined solution is one the full model could also have chosen.
+
+The connected components share nothing, so each one is solved as its own CP-SAT
+model in a process pool and the results are merged into the usual JSON. Pinning
+the rooms can make an instance infeasible that the full model could solve; the
+caller then falls back to the single model. The decomposed solve has no warm
+start, anytime phases, streamed solutions, model cache or infeasibility
+explanation: those run only on the single-model path.
+"""
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _find(parent, x):
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+
+def _lab_sections(config):
+    """{lab subject: [sections that have it]}, for labs that have a teacher."""
+    sections = {}
+    for section in config.SECTIONS:
+        for lab in config.LABS.get(section, []):
+            if config.get_teacher_for_lab(section, lab):
+                sections.setdefault(lab, []).append(section)
+    return sections
+
+
+def _components(config, lab_rooms):
+    """Connected components of the resource-sharing graph, given a room for every lab subject."""
+    parent = {section: section for section in config.SECTIONS}
+
+    shared = {}
+    for section in config.SECTIONS:
+        resources = [("teacher", teacher) for _, teacher in config.SUBJECTS.get(section, [])]
+        if section in config.SECTION_THEORY_ROOM:
+            resources.append(("room", config.SECTION_THEORY_ROOM[section]))
+        for resource in resources:
+            shared.setdefault(resource, []).append(section)
+    for lab, sections in _lab_sections(config).items():
+        shared.setdefault(("lab", lab), []).extend(sections)
+        if lab in lab_rooms:
+            shared.setdefault(("room", lab_rooms[lab]), []).extend(sections)
+    for sections in shared.values():
+        for other in sections[1:]:
+            parent[_find(parent, other)] = _find(parent, sections[0])
+
+    components = {}
+    for section in config.SECTIONS:
+        components.setdefault(_find(parent, section), []).append(section)
+    return list(components.values())
+
+
+def assign_lab_rooms(config):
+    """Pins every lab subject to one room; returns {lab subject: room}.
+
+    Subjects with the most sessions go first. Each takes an unused room allowed for
+    all of its sections if there is one, else the least loaded room of its own group
+    with space left, else the least loaded allowed room (which joins two groups).
+    A subject whose sections have no room in common is left out: the capacity check
+    in feasibility.py reports it.
+    """
+    labs = _lab_sections(config)
+    group_of = {section: i for i, sections in enumerate(_components(config, {})) for section in sections}
+    capacity = len(config.DAYS) * len(config.LAB_START_INDICES)
+    load, owner, rooms = {}, {}, {}
+    for lab in sorted(labs, key=lambda lab: (-len(labs[lab]), lab)):
+        sections = labs[lab]
+        allowed = [room for room in config.get_lab_rooms(sections[0])
+                   if all(room in config.get_lab_rooms(s) for s in sections[1:])]
+        if not allowed:
+            continue
+        demand = len(sections) * len(config.GROUPS)
+        group = group_of[sections[0]]
+        free = [room for room in allowed if room not in load]
+        same_group = [room for room in allowed if owner.get(room) == group and load[room] + demand <= capacity]
+        room = (free or sorted(same_group, key=load.get) or sorted(allowed, key=lambda r: load.get(r, 0)))[0]
+        rooms[lab] = room
+        load[room] = load.get(room, 0) + demand
+        owner.setdefault(room, group)
+    return rooms
+
+
+def section_components(config, lab_rooms=None):
+    """Returns the connected components of the resource-sharing graph, as lists of sections.
+
+    `lab_rooms` defaults to assign_lab_rooms(config).
+    """
+    return _components(config, assign_lab_rooms(config) if lab_rooms is None else lab_rooms)
+
+
+def sub_config_data(data, sections, lab_rooms=None):
+    """Returns a copy of the raw config restricted to `sections`.
+
+    With `lab_rooms` ({lab subject: room}) each section may only use the rooms of its labs.
+    """
+    sections = set(sections)
+    sub = copy.deepcopy(data)
+    sub['sections'] = [s for s in data['sections'] if s in sections]
+    for key in ('section_theory_rooms', 'subjects', 'labs', 'section_lab_rooms'):
+        if key in sub:
+            sub[key] = {s: v for s, v in data[key].items() if s in sections}
+    if lab_rooms:
+        pinned = sub.setdefault('section_lab_rooms', {})
+        for section in sub['sections']:
+            rooms = sorted({lab_rooms[lab] for lab in sub['labs'].get(section, []) if lab in lab_rooms})
+            if rooms:
+                pinned[section] = rooms
+    return sub
+
+
+def _solve_component(data, num_workers):
+    """Process-pool worker: builds and solves one component, returning picklable results."""
+    from ortools.sat.python import cp_model
+    import config_loader
+    import model_builder
+    import solver_setup
+    import solution_handler
+
+    config = config_loader.Config(data)
+    model, class_vars = model_builder.build_model(config)
+    solver = solver_setup.create_solver(config)
+    solver.parameters.num_workers = num_workers
+    status = solver.Solve(model)
+    keys = []
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        keys = solution_handler.scheduled_keys(class_vars, solver.ResponseProto())
+    return {
+        "sections": config.SECTIONS,
+        "status": solver.StatusName(status),
+        "objective": solver.ObjectiveValue() if keys else None,
+        "wall_time": solver.WallTime(),
+        "keys": keys,
+    }
+
+
+def solve_decomposed(config, max_processes=None, lab_rooms=None, components=None):
+    """Solves every component in a process pool.
+
+    Returns (status_name, keys, results): the overall status, the merged list of
+    scheduled class_vars keys, and the per-component results.
+    """
+    lab_rooms = assign_lab_rooms(config) if lab_rooms is None else lab_rooms
+    components = components or section_components(config, lab_rooms)
+    processes = max(1, min(len(components), max_processes or os.cpu_count() or 1))
+    # Split the cores between the concurrently running solvers unless the config pins a count.
+    num_workers = int(config.data['settings'].get('num_workers', 0)) or max(1, (os.cpu_count() or 1) // processes)
+    print(f"   - Decomposed into {len(components)} independent group(s) of sections; "
+          f"solving with {processes} process(es) x {num_workers} worker(s)...")
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_solve_component, sub_config_data(config.data, sections, lab_rooms), num_workers)
+                   for sections in components]
+        results = [future.result() for future in futures]
+
+    keys = []
+    for result in results:
+        print(f"   - {', '.join(result['sections'])}: {result['status']} in {result['wall_time']:.1f}s")
+        keys.extend(result["keys"])
+
+    statuses = {result["status"] for result in results}
+    if statuses <= {"OPTIMAL"}:
+        status = "OPTIMAL"
+    elif statuses <= {"OPTIMAL", "FEASIBLE"}:
+        status = "FEASIBLE"
+    elif "INFEASIBLE" in statuses:
+        status = "INFEASIBLE"
+    else:
+        status = "UNKNOWN"
+    return status, keys, results
@@ -0,0 +1,61 @@
+# diagnostics.py
+"""Names the constraint families that make a model infeasible.
+
+The model is rebuilt without an objective, with every hard-constraint family
+guarded by an enforcement literal (see constraints.ConstraintGuard). Solving
+with those literals as assumptions makes CP-SAT return a subset of them that is
+already infeasible on its own: the rules (and, with explain_granularity "scope",
+the sections/teachers/rooms) to look at first.
+"""
+from ortools.sat.python import cp_model
+import model_builder
+import constraints
+
+
+def find_conflicting_rules(config, max_time_in_seconds=60.0, restrict=None):
+    """Returns a list of (family, scope) pairs that together are infeasible.
+
+    `restrict(model, class_vars)` may add unguarded constraints first, e.g. a
+    local repair's change, to explain why the model plus that change is infeasible.
+
+    Returns None if the guarded model turns out to be feasible (or the time limit
+    is hit before a proof), and [] if the model is infeasible even with every
+    family switched off (e.g. the lab-room choice alone cannot be satisfied).
+    """
+    model = cp_model.CpModel()
+    class_vars = model_builder.create_class_variables(model, config)
+    model_builder.create_and_link_lab_room_choices(model, class_vars, config)
+    guard = constraints.ConstraintGuard.from_config(model, config, track=True)
+    constraints.add_hard_constraints(model, class_vars, config, guard)
+    if restrict is not None:
+        restrict(model, class_vars)
+
+    literal_to_rule = {literal.Index(): rule for rule, literal in guard.literals.items()}
+    model.AddAssumptions(list(guard.literals.values()))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = max_time_in_seconds
+    # Core extraction from assumptions is only reported by the sequential search
+    solver.parameters.num_workers = 1
+    status = solver.Solve(model)
+    if status != cp_model.INFEASIBLE:
+        return None
+    return [literal_to_rule[index] for index in solver.SufficientAssumptionsForInfeasibility()
+            if index in literal_to_rule]
+
+
+def explain_infeasibility(config):
+    """Prints the conflicting rules found by find_conflicting_rules."""
+    print("🔎 Looking for the rules that conflict...")
+    timeout = float(config.data['settings'].get('explain_timeout_seconds', 60))
+    rules = find_conflicting_rules(config, timeout)
+    if rules is None:
+        print("   - Could not prove infeasibility with guarded rules within the time limit.")
+    elif not rules:
+        print("   - The model is infeasible even without any rule family (check lab rooms).")
+    else:
+        print("   - These rules cannot all hold together:")
+        for family, scope in sorted(rules, key=lambda rule: (rule[0], rule[1] or "")):
+            print(f"     • {family}" + (f" ({scope})" if scope is not None else ""))
+        print("   - Disable one of them with settings.disabled_constraints to confirm.")
+    return rules
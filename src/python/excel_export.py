@@ -0,0 +1,156 @@
+# excel_export.py
+"""Streams the timetable into an Excel workbook.
+
+One sheet per section, per teacher and per room; rows are days and columns are
+period slots, and 2-hour labs are merged across their two columns. Every view is
+filled from a single pass over the compact timetable grid, and the sheets are
+written with openpyxl's write-only mode, so memory stays bounded even for
+workbooks with hundreds of sheets.
+
+Usage: python src/python/excel_export.py [timetable_resolved.json] [Timetable.xlsx]
+"""
+import json
+import re
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+from compact import CompactTimetable, EMPTY, TEACHER, ROOM, IS_LAB
+
+EXCEL_PATH = "src/output/Timetable.xlsx"
+MAX_SHEET_NAME = 31
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def _sheet_name(prefix, name, used):
+    """A unique Excel-safe sheet name (max 31 chars, no []:*?/\\)."""
+    base = f"{prefix} {INVALID_SHEET_CHARS.sub('-', name)}"[:MAX_SHEET_NAME]
+    candidate, n = base, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate = base[:MAX_SHEET_NAME - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def collect_views(compact):
+    """Single pass over the grid that files every session under its section, teacher and room.
+
+    Returns {"section"|"teacher"|"room": {id: {(day, slot): [(entry id, section id), ...]}}}.
+    """
+    views = {"section": defaultdict(lambda: defaultdict(list)),
+             "teacher": defaultdict(lambda: defaultdict(list)),
+             "room": defaultdict(lambda: defaultdict(list))}
+    days, sections, slots, ks = np.nonzero(compact.grid != EMPTY)
+    entry_ids = compact.grid[days, sections, slots, ks]
+    teachers = compact.entries[entry_ids, TEACHER]
+    rooms = compact.entries[entry_ids, ROOM]
+    for d, sec, s, e, t, r in zip(days.tolist(), sections.tolist(), slots.tolist(),
+                                  entry_ids.tolist(), teachers.tolist(), rooms.tolist()):
+        cell = (e, sec)
+        views["section"][sec][(d, s)].append(cell)
+        views["teacher"][t][(d, s)].append(cell)
+        views["room"][r][(d, s)].append(cell)
+    return views
+
+
+def _label(compact, entry_id, section_id, view):
+    entry = compact.entry_dict(entry_id)
+    text = entry["subject"]
+    if entry.get("group"):
+        text += f" (Group {entry['group']})"
+    details = []
+    if view != "section":
+        details.append(compact.sections.names[section_id])
+    if view != "teacher":
+        details.append(entry["teacher"])
+    if view != "room":
+        details.append(entry["room"])
+    return f"{text} – {', '.join(details)}"
+
+
+def write_workbook(compact, excel_path=EXCEL_PATH):
+    """Writes the section, teacher and room sheets for a CompactTimetable."""
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Font, PatternFill
+        from openpyxl.utils import get_column_letter
+        from openpyxl.worksheet.cell_range import CellRange
+    except ImportError:
+        raise ImportError("Excel export needs openpyxl: pip install openpyxl") from None
+
+    bold = Font(bold=True)
+    wrap = Alignment(wrap_text=True, vertical="center", horizontal="center")
+    lab_fill = PatternFill("solid", fgColor="FFF176")  # same yellow as the PDF
+    views = collect_views(compact)
+    labels = {}
+    workbook = Workbook(write_only=True)
+    used_names = set()
+
+    def label(entry_id, section_id, view):
+        key = (entry_id, section_id, view)
+        if key not in labels:
+            labels[key] = _label(compact, entry_id, section_id, view)
+        return labels[key]
+
+    def styled(sheet, value, font=None, fill=None):
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.alignment = wrap
+        if font:
+            cell.font = font
+        if fill:
+            cell.fill = fill
+        return cell
+
+    for view, prefix, names in (("section", "Sec", compact.sections.names),
+                                ("teacher", "Tch", compact.teachers.names),
+                                ("room", "Room", compact.rooms.names)):
+        for item_id, name in enumerate(names):
+            cells = views[view].get(item_id, {})
+            sheet = workbook.create_sheet(_sheet_name(prefix, name, used_names))
+            sheet.column_dimensions["A"].width = 12
+            for col in range(2, len(compact.slots) + 2):
+                sheet.column_dimensions[get_column_letter(col)].width = 24
+            sheet.append([styled(sheet, name, bold)] + [styled(sheet, slot, bold) for slot in compact.slots])
+
+            for d, day in enumerate(compact.days):
+                row = [styled(sheet, day, bold)]
+                s = 0
+                while s < len(compact.slots):
+                    cell = cells.get((d, s), [])
+                    is_lab = bool(cell) and all(compact.entries[e, IS_LAB] for e, _ in cell)
+                    text = "\n".join(label(e, sec, view) for e, sec in cell) or None
+                    fill = lab_fill if is_lab else None
+                    # A 2-hour lab occupies the same cell content in two consecutive slots
+                    if is_lab and s + 1 < len(compact.slots) and cells.get((d, s + 1), []) == cell:
+                        row += [styled(sheet, text, fill=fill), styled(sheet, None, fill=fill)]
+                        sheet.merged_cells.add(CellRange(min_col=s + 2, max_col=s + 3,
+                                                         min_row=d + 2, max_row=d + 2))
+                        s += 2
+                    else:
+                        row.append(styled(sheet, text, fill=fill))
+                        s += 1
+                sheet.append(row)
+
+    workbook.save(excel_path)
+    print(f"✅ Excel workbook exported to {excel_path} ({len(used_names)} sheets)")
+    return excel_path
+
+
+def export_timetable(timetable, excel_path=EXCEL_PATH):
+    """Writes the workbook for a timetable in the JSON structure."""
+    return write_workbook(CompactTimetable.from_json(timetable), excel_path)
+
+
+def main():
+    json_path = sys.argv[1] if len(sys.argv) > 1 else "src/output/timetable_resolved.json"
+    excel_path = sys.argv[2] if len(sys.argv) > 2 else EXCEL_PATH
+    with open(json_path, 'r', encoding="utf-8") as f:
+        export_timetable(json.load(f), excel_path)
+
+
+if __name__ == "__main__":
+    main()
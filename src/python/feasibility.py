@@ -0,0 +1,166 @@
+# feasibility.py
+"""Pre-solve capacity analysis.
+
+Counts the sessions every rule demands from each teacher, room and section and
+compares them with the hours that resource actually has, before any model is
+built. Each check is a necessary condition of the CP model, so a reported error
+means the solver could never find a timetable; a clean report does not prove the
+opposite. Runs in milliseconds and needs no OR-Tools.
+
+Usage: python src/python/feasibility.py [config.json]
+"""
+import sys
+from collections import defaultdict, namedtuple
+
+import config_loader
+
+Issue = namedtuple("Issue", ["severity", "resource", "message"])
+
+THEORY_PER_WEEK = 3
+MAX_THEORY_PER_DAY = 4
+MAX_LABS_PER_GROUP_PER_DAY = 2
+
+
+def analyze(config):
+    """Returns a list of Issues; any with severity 'error' make the model infeasible."""
+    issues = []
+    error = lambda resource, message: issues.append(Issue("error", resource, message))
+    warning = lambda resource, message: issues.append(Issue("warning", resource, message))
+
+    days = len(config.DAYS)
+    slots = len(config.ALL_SLOTS)
+    for recess_slot in ("12-1", "2-3"):
+        if recess_slot not in config.ALL_SLOTS:
+            error("settings.all_slots", f"slot '{recess_slot}' is required by the recess rule but is missing")
+    lab_starts = sorted(config.LAB_START_INDICES)
+    if any(issue.severity == "error" for issue in issues):
+        return issues
+
+    # With both recess slots in a day, nobody can start a class in both of them.
+    theory_slots_per_day = slots - 1
+    lab_blocks_per_day = len(lab_starts)
+    week_hours = days * slots
+
+    # --- Demand per resource, mirroring model_builder / constraints ---
+    teacher_theory = defaultdict(int)          # sessions
+    teacher_hours = defaultdict(int)           # occupied slots
+    teacher_section = defaultdict(int)         # (teacher, section) -> sessions
+    theory_room_sessions = defaultdict(int)
+    theory_room_sections = defaultdict(list)
+    lab_name_sessions = defaultdict(int)
+    lab_name_sections = defaultdict(list)
+    lab_sessions_total = 0
+
+    for section in config.SECTIONS:
+        room = config.SECTION_THEORY_ROOM.get(section)
+        subjects = config.SUBJECTS.get(section, [])
+        if not room:
+            warning(f"section {section}", "has no theory room, so none of its theory classes will be scheduled")
+        elif subjects:
+            theory_room_sessions[room] += THEORY_PER_WEEK * len(subjects)
+            theory_room_sections[room].append(section)
+            for subject, teacher in subjects:
+                teacher_theory[teacher] += THEORY_PER_WEEK
+                teacher_hours[teacher] += THEORY_PER_WEEK
+                teacher_section[(teacher, section)] += THEORY_PER_WEEK
+
+        section_theory = THEORY_PER_WEEK * len(subjects) if room else 0
+        section_lab_sessions = 0
+        labs_per_group = 0
+        for lab_name in config.LABS.get(section, []):
+            teacher = config.get_teacher_for_lab(section, lab_name)
+            if not teacher:
+                warning(f"section {section}", f"'{lab_name}' has no matching subject teacher and will be skipped")
+                continue
+            if not config.get_lab_rooms(section):
+                error(f"section {section}", f"'{lab_name}' has no lab room it may use")
+                continue
+            labs_per_group += 1
+            sessions = len(config.GROUPS)
+            section_lab_sessions += sessions
+            lab_name_sessions[lab_name] += sessions
+            lab_name_sections[lab_name].append(section)
+            lab_sessions_total += sessions
+            teacher_hours[teacher] += 2 * sessions
+            teacher_section[(teacher, section)] += sessions
+
+        # Section-level rules
+        if section_theory > days * min(MAX_THEORY_PER_DAY, theory_slots_per_day):
+            error(f"section {section}",
+                  f"needs {section_theory} theory classes but at most "
+                  f"{days * min(MAX_THEORY_PER_DAY, theory_slots_per_day)} fit "
+                  f"({MAX_THEORY_PER_DAY}/day cap and recess rule over {days} days)")
+        if labs_per_group > days * min(MAX_LABS_PER_GROUP_PER_DAY, lab_blocks_per_day):
+            error(f"section {section}",
+                  f"each group needs {labs_per_group} labs but at most "
+                  f"{days * min(MAX_LABS_PER_GROUP_PER_DAY, lab_blocks_per_day)} lab blocks are available")
+        if section_lab_sessions > days * lab_blocks_per_day:
+            error(f"section {section}",
+                  f"needs {section_lab_sessions} lab sessions (groups cannot overlap) but only "
+                  f"{days * lab_blocks_per_day} lab blocks exist per week")
+        section_hours = section_theory + 2 * section_lab_sessions
+        if section_hours > week_hours:
+            error(f"section {section}", f"needs {section_hours} hours but the week has {week_hours} slots")
+
+    # Teachers
+    for teacher in sorted(teacher_hours):
+        if teacher_hours[teacher] > week_hours:
+            error(f"teacher {teacher}", f"needs {teacher_hours[teacher]} teaching hours but the week has {week_hours}")
+        if teacher_theory[teacher] > days * theory_slots_per_day:
+            error(f"teacher {teacher}",
+                  f"needs {teacher_theory[teacher]} theory classes but the recess rule leaves "
+                  f"{days * theory_slots_per_day} slots")
+    for (teacher, section), sessions in sorted(teacher_section.items()):
+        if sessions > days:
+            error(f"teacher {teacher}",
+                  f"has {sessions} classes with {section} but may teach it at most once a day ({days} days)")
+
+    # Theory rooms
+    theory_room_capacity = days * slots
+    for room, sessions in sorted(theory_room_sessions.items()):
+        if sessions > theory_room_capacity:
+            error(f"room {room}",
+                  f"is shared by {', '.join(theory_room_sections[room])} who need {sessions} theory classes, "
+                  f"but it has only {theory_room_capacity} slots")
+
+    # Lab rooms: each lab subject uses one room for every section and group
+    for lab_name, sections in sorted(lab_name_sections.items()):
+        common = set(config.get_lab_rooms(sections[0])).intersection(*(config.get_lab_rooms(s) for s in sections[1:]))
+        if not common:
+            error(f"lab {lab_name}",
+                  f"is taught to {', '.join(sections)} in a single room, but their section_lab_rooms share none")
+    for lab_name, sessions in sorted(lab_name_sessions.items()):
+        if sessions > days * lab_blocks_per_day:
+            error(f"lab {lab_name}",
+                  f"needs {sessions} sessions in its single room but a room has {days * lab_blocks_per_day} lab blocks")
+    lab_room_capacity = len(config.LAB_ROOMS) * days * lab_blocks_per_day
+    if lab_sessions_total > lab_room_capacity:
+        error("lab rooms",
+              f"{lab_sessions_total} lab sessions need rooms but {len(config.LAB_ROOMS)} rooms offer "
+              f"{lab_room_capacity} lab blocks")
+    if len(lab_name_sessions) and not config.LAB_ROOMS:
+        error("lab rooms", "labs are configured but lab_rooms is empty")
+
+    return issues
+
+
+def print_report(issues):
+    """Prints the issues and returns True when none of them is an error."""
+    errors = [issue for issue in issues if issue.severity == "error"]
+    for issue in issues:
+        marker = "❌" if issue.severity == "error" else "⚠️ "
+        print(f"   {marker} {issue.resource}: {issue.message}")
+    if not errors:
+        print("   - Capacity check passed.")
+    return not errors
+
+
+def main():
+    config_path = sys.argv[1] if len(sys.argv) > 1 else "src/python/config.json"
+    config = config_loader.load_config(config_path)
+    ok = print_report(analyze(config))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# indicators.py
+
+class IndicatorCache:
+    """Creates each reified "something is scheduled here" literal once and reuses it.
+
+    The objective and the soft constraints ask the same questions about the same
+    (section, day, slot) sums; going through this cache means each question adds
+    one named boolean to the model no matter how many terms use it.
+    """
+
+    def __init__(self, model, class_vars):
+        self.model = model
+        self.class_vars = class_vars
+        self._cache = {}
+        self._false = None
+
+    def busy(self, section, day_idx, slot_idx):
+        """True iff the section has any class (theory or lab) starting at the slot."""
+        key = ('busy', section, day_idx, slot_idx)
+        variables = self.class_vars.by_section_start.get((section, day_idx, slot_idx))
+        return self._indicator(key, variables)
+
+    def theory_at(self, section, day_idx, slot_idx):
+        """True iff the section has a theory class at the slot."""
+        key = ('theory_at', section, day_idx, slot_idx)
+        variables = self.class_vars.by_theory_start.get((section, day_idx, slot_idx))
+        return self._indicator(key, variables)
+
+    def group_active(self, section, group, day_idx, slot_idx):
+        """True iff the group of the section starts a session at the slot."""
+        key = ('active', section, group, day_idx, slot_idx)
+        variables = self.class_vars.by_group_start.get((section, group, day_idx, slot_idx))
+        return self._indicator(key, variables)
+
+    def _indicator(self, key, variables):
+        if key in self._cache:
+            return self._cache[key]
+        if not variables:
+            literal = self._always_false()
+        else:
+            literal = self.model.NewBoolVar('_'.join(str(part) for part in key))
+            self.model.Add(sum(variables) > 0).OnlyEnforceIf(literal)
+            self.model.Add(sum(variables) == 0).OnlyEnforceIf(literal.Not())
+        self._cache[key] = literal
+        return literal
+
+    def _always_false(self):
+        if self._false is None:
+            self._false = self.model.NewBoolVar('always_false')
+            self.model.Add(self._false == 0)
+        return self._false
+
+    def snapshot(self):
+        """({key: literal}, always-false literal or None), for caching a built model."""
+        return dict(self._cache), self._false
+
+    def restore(self, cache, false):
+        """Reuses the literals a model loaded from the cache already contains."""
+        self._cache = dict(cache)
+        self._false = false
+
+    def __len__(self):
+        return len(self._cache)
@@ -0,0 +1,118 @@
+# instance_generator.py
+"""Writes synthetic config.json files of adjustable size.
+
+The generated instances follow the same shape as the hand-written config.json:
+pairs of sections share a theory room, every lab is named "<subject> Lab" so
+`Config.get_teacher_for_lab` finds its teacher, and no teacher gets two subjects
+in the same section (which the one-class-per-section-per-day rule would forbid).
+
+Usage: python src/python/instance_generator.py --sections 70 --teachers 280 -o big.json
+"""
+import argparse
+import json
+
+WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MORNING_SLOTS = ["9-10", "10-11", "11-12", "12-1"]
+DEFAULT_WEIGHTS = {
+    "workload_penalty": 10,
+    "parallel_lab_penalty": 8,
+    "daily_lab_penalty": 3,
+    "continuity_penalty": 1,
+    "group_daily_lab_penalty": 6
+}
+
+
+def _slot_names(count):
+    """Morning slots 9-1, a recess, then afternoon slots from 2 onwards."""
+    if count < 5:
+        raise ValueError("At least 5 slots are needed so that both '12-1' and '2-3' exist.")
+    slots = list(MORNING_SLOTS)
+    hour = 2
+    while len(slots) < count:
+        slots.append(f"{hour}-{hour + 1}")
+        hour += 1
+    return slots
+
+
+def _lab_starts(slots):
+    """Non-overlapping 2-hour blocks: 9-11, 11-1, then 3-5, 5-7, ... after the recess."""
+    starts = [0, 2]
+    start = 5
+    while start + 1 < len(slots):
+        starts.append(start)
+        start += 2
+    return [slots[i] for i in starts]
+
+
+def generate_config(sections=7, teachers=28, subjects=4, labs=3, lab_rooms=8,
+                    days=5, slots=7, sections_per_cohort=3, timeout=20):
+    """Returns the raw config dict for a synthetic instance."""
+    if not 1 <= days <= len(WEEK):
+        raise ValueError(f"days must be between 1 and {len(WEEK)}")
+    if labs > subjects:
+        raise ValueError("labs cannot exceed subjects: every lab belongs to a subject")
+    if teachers < subjects:
+        raise ValueError("teachers must be at least subjects so no teacher repeats within a section")
+
+    all_slots = _slot_names(slots)
+    section_names = [f"SEC-{i + 1}" for i in range(sections)]
+    teacher_names = [f"T{i + 1:03d}" for i in range(teachers)]
+
+    data = {
+        "settings": {
+            "days": WEEK[:days],
+            "all_slots": all_slots,
+            "lab_slot_starts": _lab_starts(all_slots),
+            "groups": ["A", "B"],
+            "solver_timeout_seconds": timeout
+        },
+        "sections": section_names,
+        "section_theory_rooms": {},
+        "lab_rooms": [f"LAB{101 + i}" for i in range(lab_rooms)],
+        "subjects": {},
+        "labs": {},
+        "objective_weights": dict(DEFAULT_WEIGHTS)
+    }
+
+    for i, section in enumerate(section_names):
+        # Sections of one cohort study the same subjects; two sections share a room.
+        cohort = i // sections_per_cohort
+        data["section_theory_rooms"][section] = f"R-{i // 2 + 1}"
+        section_subjects = [f"C{cohort + 1}S{j + 1}" for j in range(subjects)]
+        data["subjects"][section] = [
+            [subject, teacher_names[(i * subjects + j) % teachers]]
+            for j, subject in enumerate(section_subjects)
+        ]
+        data["labs"][section] = [f"{subject} Lab" for subject in section_subjects[:labs]]
+    return data
+
+
+def write_config(path, **params):
+    """Generates an instance and writes it to `path`."""
+    data = generate_config(**params)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic timetable config.json")
+    parser.add_argument("-o", "--output", default="generated_config.json")
+    parser.add_argument("--sections", type=int, default=7)
+    parser.add_argument("--teachers", type=int, default=28)
+    parser.add_argument("--subjects", type=int, default=4, help="theory subjects per section")
+    parser.add_argument("--labs", type=int, default=3, help="labs per section")
+    parser.add_argument("--lab-rooms", type=int, default=8)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=7)
+    parser.add_argument("--timeout", type=int, default=20, help="solver_timeout_seconds")
+    args = parser.parse_args()
+
+    data = write_config(args.output, sections=args.sections, teachers=args.teachers,
+                        subjects=args.subjects, labs=args.labs, lab_rooms=args.lab_rooms,
+                        days=args.days, slots=args.slots, timeout=args.timeout)
+    print(f"✅ Wrote {len(data['sections'])} sections to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
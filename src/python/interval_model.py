@@ -0,0 +1,50 @@
+# interval_model.py
+"""Interval-variable backend for the resource exclusivity rules.
+
+Instead of one AtMostOne per (day, slot, resource), every candidate session gets
+an optional fixed interval on a week-long timeline (day * slots_per_day + slot,
+lasting 1 slot for theory and 2 for labs) whose presence is its class variable.
+Each room, teacher and section then needs a single AddNoOverlap, which is a much
+smaller model and lets CP-SAT propagate over whole days at once.
+
+Selected with "model_backend": "interval" in config.json settings. The no-overlap
+constraints replace the boolean AtMostOne family rather than being added next to
+it; the session literals stay, as every other rule reads them. Entries of
+settings.disabled_constraints are honoured as in constraints.py, for the whole
+"resource_uniqueness" family or one "resource_uniqueness:<room/teacher/section>".
+"""
+
+
+def create_intervals(model, class_vars, config):
+    """Returns {key: optional interval} for every class variable."""
+    slots_per_day = len(config.ALL_SLOTS)
+    intervals = {}
+    for key, var in class_vars.items():
+        sec, grp, subj, tc, d, s, rm = key
+        # A lab in the last slot of the day must not spill into the next morning
+        size = min(2, slots_per_day - s) if 'Lab' in subj else 1
+        intervals[key] = model.NewOptionalFixedSizeIntervalVar(
+            d * slots_per_day + s, size, var, f"interval_{var.Name()}")
+    return intervals
+
+
+def add_resource_no_overlap(model, class_vars, config, guard=None):
+    """Ensures rooms, teachers, and sections are not double-booked, using AddNoOverlap.
+
+    With a constraints.ConstraintGuard, scopes it has disabled get no constraint.
+    """
+    enabled = (lambda scope: guard.enabled("resource_uniqueness", scope)) if guard else (lambda scope: True)
+    intervals = create_intervals(model, class_vars, config)
+    by_room, by_teacher, by_section = {}, {}, {}
+    for (sec, grp, subj, tc, d, s, rm), interval in intervals.items():
+        by_room.setdefault(rm, []).append(interval)
+        by_teacher.setdefault(tc, []).append(interval)
+        # The whole-section rule also covers each lab group on its own
+        by_section.setdefault(sec, []).append(interval)
+
+    for names, by_name in ((config.ALL_ROOMS, by_room), (config.ALL_TEACHERS, by_teacher),
+                           (config.SECTIONS, by_section)):
+        for name in names:
+            if name in by_name and enabled(name):
+                model.AddNoOverlap(by_name[name])
+    return intervals
@@ -0,0 +1,304 @@
+# local_repair.py
+"""Interactive-speed repair of a published timetable after a small change.
+
+A change blocks a teacher or a room (for a day, or some slots of it), drops a
+room for the whole week, or moves one session. The built model is taken from
+the model cache (or the caller, e.g. a service worker) and cloned, the change is
+added as extra constraints, and every class_vars literal outside a small
+neighbourhood is fixed to its value in the current master timetable. Only the
+neighbourhood is re-solved, minimizing the number of sessions that change, so
+the rest of the published timetable stays exactly as it was.
+
+Neighbourhoods grow until the sub-model is feasible:
+  0. the sections whose sessions the change touches,
+  1. plus every section sharing a teacher or theory room with them,
+  2. everything (a full re-solve that still minimizes changes).
+They share one time budget: each gets an equal part of what is left, so time a
+small neighbourhood does not use carries over to the larger ones. If the last
+one is proven infeasible, the guarded model of diagnostics.py is solved with
+the change applied to name the rules the change conflicts with.
+
+Usage:
+  python src/python/local_repair.py block-teacher SK --day Wednesday [--slots 9-10 10-11]
+  python src/python/local_repair.py block-room B-209 --day Monday --slots 9-10
+  python src/python/local_repair.py drop-room CS105
+  python src/python/local_repair.py move CSE-5 OS --from Monday 9-10 --to Tuesday 11-12 [--group A]
+"""
+import argparse
+import time
+
+from ortools.sat.python import cp_model
+
+import config_loader
+import diagnostics
+import model_builder
+import model_cache
+import solution_handler
+import solver_setup
+import warm_start
+
+DEFAULT_TIME_LIMIT = 3.0
+DEFAULT_EXPLAIN_TIMEOUT = 10.0
+NEIGHBOURHOODS = ("affected sections", "sections sharing a teacher or theory room", "all sections")
+REPAIRED_TIMETABLE_PATH = "src/output/University_Master_Timetable_repaired.json"
+
+
+def _occupied(key, config):
+    """(day, slot) pairs a class_vars key occupies (labs take two slots)."""
+    sec, grp, subj, tc, d, s, rm = key
+    return [(d, s), (d, s + 1)] if 'Lab' in subj and s + 1 < len(config.ALL_SLOTS) else [(d, s)]
+
+
+def _blocked_slots(change, config):
+    day = config.DAYS.index(change["day"]) if change.get("day") else None
+    days = range(len(config.DAYS)) if day is None else [day]
+    slots = [config.SLOT_INDEX[slot] for slot in change["slots"]] if change.get("slots") else range(len(config.ALL_SLOTS))
+    return {(d, s) for d in days for s in slots}
+
+
+def _is_forbidden(key, change, config, blocked):
+    """Whether the change rules out scheduling `key` at all."""
+    sec, grp, subj, tc, d, s, rm = key
+    kind = change["kind"]
+    if kind == "block_teacher" and tc != change["teacher"]:
+        return False
+    if kind in ("block_room", "drop_room") and rm != change["room"]:
+        return False
+    if kind == "drop_room":
+        return True
+    return any(slot in blocked for slot in _occupied(key, config))
+
+
+def validate_change(change, config):
+    kind = change["kind"]
+    if kind == "block_teacher" and change["teacher"] not in config.ALL_TEACHERS:
+        raise ValueError(f"Unknown teacher '{change['teacher']}'")
+    if kind in ("block_room", "drop_room") and change["room"] not in config.ALL_ROOMS:
+        raise ValueError(f"Unknown room '{change['room']}'")
+    if kind == "drop_room" and change["room"] in config.SECTION_THEORY_ROOM.values():
+        sections = [s for s, room in config.SECTION_THEORY_ROOM.items() if room == change["room"]]
+        raise ValueError(f"{change['room']} is the only theory room of {', '.join(sections)}; "
+                         f"change section_theory_rooms instead")
+    if change.get("day") and change["day"] not in config.DAYS:
+        raise ValueError(f"Unknown day '{change['day']}'")
+    for slot in change.get("slots") or []:
+        if slot not in config.SLOT_INDEX:
+            raise ValueError(f"Unknown slot '{slot}'")
+    if kind == "move":
+        for day, slot in (change["from"], change["to"]):
+            if day not in config.DAYS or slot not in config.SLOT_INDEX:
+                raise ValueError(f"Unknown day/slot '{day} {slot}'")
+
+
+def _apply_move(model, class_vars, change, config, previous_keys):
+    """Forces the session to its new start and off its old one; returns the session's current keys."""
+    section, subject, group = change["section"], change["subject"], change.get("group") or 'ALL'
+    from_day, from_slot = config.DAYS.index(change["from"][0]), config.SLOT_INDEX[change["from"][1]]
+    to_day, to_slot = config.DAYS.index(change["to"][0]), config.SLOT_INDEX[change["to"][1]]
+    current = [key for key in previous_keys
+               if key[:3] == (section, group, subject) and key[4:6] == (from_day, from_slot)]
+    if not current:
+        raise ValueError(f"{section} has no {subject} ({group}) starting {change['from'][0]} {change['from'][1]}")
+    targets = [var for key, var in class_vars.items()
+               if key[:3] == (section, group, subject) and key[4:6] == (to_day, to_slot)]
+    if not targets:
+        raise ValueError(f"{subject} cannot start at {change['to'][0]} {change['to'][1]} "
+                         f"(labs may only start at {', '.join(config.LAB_SLOT_STARTS)})")
+    model.AddExactlyOne(targets)
+    for key in current:
+        model.Add(class_vars[key] == 0)
+    return current
+
+
+def _apply_change(model, class_vars, change, config, previous_keys):
+    """Adds the change to the model; returns the currently scheduled keys it touches."""
+    if change["kind"] == "move":
+        return _apply_move(model, class_vars, change, config, previous_keys)
+    blocked = _blocked_slots(change, config)
+    touched = []
+    for key, var in class_vars.items():
+        if _is_forbidden(key, change, config, blocked):
+            model.Add(var == 0)
+            if key in previous_keys:
+                touched.append(key)
+    return touched
+
+
+def base_model(config):
+    """The built (model, class_vars) from the model cache, or built (and cached) now."""
+    settings = config.data['settings'].get('model_cache', {})
+    directory = settings.get('directory', model_cache.CACHE_DIR)
+    built = model_cache.load(config, directory) if settings.get('enabled', False) else None
+    if built is None:
+        built = model_builder.build_model(config)
+        if settings.get('enabled', False):
+            model_cache.store(*built, config, directory,
+                              settings.get('max_megabytes', model_cache.DEFAULT_MAX_MEGABYTES))
+    return built
+
+
+def _explain(config, change, previous_keys):
+    """Conflicting rules if the change is infeasible with the hard constraints, else None."""
+    timeout = float(config.data['settings'].get('local_repair', {}).get(
+        'explain_timeout_seconds', DEFAULT_EXPLAIN_TIMEOUT))
+    return diagnostics.find_conflicting_rules(
+        config, timeout, lambda model, class_vars: _apply_change(model, class_vars, change, config, previous_keys))
+
+
+def _neighbourhood(level, affected_sections, config):
+    if level == 0:
+        return set(affected_sections)
+    if level == 1:
+        sections = set(affected_sections)
+        for section in affected_sections:
+            for _, teacher in config.SUBJECTS.get(section, []):
+                sections.update(config.TEACHER_SECTIONS.get(teacher, ()))
+            room = config.SECTION_THEORY_ROOM.get(section)
+            sections.update(config.ROOM_SECTIONS.get(room, ()) if room else ())
+        return sections
+    return set(config.SECTIONS)
+
+
+def _affected_sections(change, touched_keys, config):
+    sections = {key[0] for key in touched_keys}
+    if change["kind"] == "drop_room":
+        # One room per lab subject: every section with a moved lab has to move with it
+        labs = {key[2] for key in touched_keys if 'Lab' in key[2]}
+        sections |= {section for section in config.SECTIONS if labs & set(config.LABS.get(section, []))}
+    return sections
+
+
+def repair(config, change, timetable_path=solution_handler.MASTER_TIMETABLE_PATH, time_limit=None,
+           base=None):
+    """Re-solves the smallest neighbourhood that absorbs `change`.
+
+    `time_limit` is the solve budget in seconds for all neighbourhoods together.
+    `base` is a built (model, class_vars) to reuse; it is cloned, never modified.
+    Returns (timetable, removed, added): the repaired timetable (None if no
+    neighbourhood could absorb the change) and the class_vars keys that left and
+    joined the schedule.
+    """
+    validate_change(change, config)
+    time_limit = float(time_limit or config.data['settings'].get('local_repair', {}).get(
+        'time_limit_seconds', DEFAULT_TIME_LIMIT))
+    started = time.perf_counter()
+
+    base_model_, class_vars = base or base_model(config)
+    model = base_model_.Clone()
+    previous_keys, unmatched = warm_start.load_previous_assignment(timetable_path, class_vars, config)
+    if unmatched:
+        print(f"   - ⚠️  {len(unmatched)} sessions of {timetable_path} no longer match the config; "
+              f"their sections are re-planned.")
+
+    # class_vars belongs to the base model; the clone has the same proto indices
+    touched = _apply_change(model, class_vars, change, config, previous_keys)
+    affected = _affected_sections(change, touched, config) | {s for _, s, _, _ in unmatched}
+    if not affected:
+        print("   - The change does not touch any scheduled session; nothing to repair.")
+        return solution_handler.timetable_from_keys(sorted(previous_keys), config), [], []
+    print(f"   - The change touches {len(touched)} session(s) in {', '.join(sorted(affected))} "
+          f"(model ready after {time.perf_counter() - started:.2f}s).")
+
+    warm_start.add_hints(model, class_vars, previous_keys)
+    # Fewest changed sessions: every literal that flips from its current value costs 1
+    # (this replaces the timetable objective of the cached model)
+    model.Minimize(sum((1 - var) if key in previous_keys else var for key, var in class_vars.items()))
+
+    levels = []
+    for level, description in enumerate(NEIGHBOURHOODS):
+        free = _neighbourhood(level, affected, config)
+        if not levels or free != levels[-1][2]:
+            levels.append((level, description, free))
+
+    status = cp_model.UNKNOWN
+    remaining = time_limit
+    for index, (level, description, free) in enumerate(levels):
+        sub_model = model.Clone()
+        for key, var in class_vars.items():
+            if key[0] not in free:
+                sub_model.Add(sub_model.GetBoolVarFromProtoIndex(var.Index()) == int(key in previous_keys))
+        solver = solver_setup.create_solver(config, max_time_in_seconds=remaining / (len(levels) - index))
+        status = solver.Solve(sub_model)
+        remaining = max(remaining - solver.WallTime(), 0.0)
+        print(f"   - Neighbourhood {level} ({description}, {len(free)} section(s)): "
+              f"{solver.StatusName(status)} in {solver.WallTime():.2f}s")
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            keys = set(solution_handler.scheduled_keys(class_vars, solver.ResponseProto()))
+            removed, added = sorted(previous_keys - keys), sorted(keys - previous_keys)
+            print(f"✅ Repaired in {time.perf_counter() - started:.2f}s: "
+                  f"{len(removed)} session(s) moved, everything else unchanged.")
+            return solution_handler.timetable_from_keys(sorted(keys), config), removed, added
+    # The last level frees every section, so INFEASIBLE there is a proof
+    if status == cp_model.INFEASIBLE:
+        print("❌ The change cannot be satisfied together with the hard constraints.")
+        rules = _explain(config, change, previous_keys)
+        if rules:
+            print("   - It conflicts with these rules:")
+            for family, scope in sorted(rules, key=lambda rule: (rule[0], rule[1] or "")):
+                print(f"     • {family}" + (f" ({scope})" if scope is not None else ""))
+    else:
+        print(f"❌ No neighbourhood could absorb the change within {time_limit:.0f}s "
+              f"(settings.local_repair.time_limit_seconds).")
+    return None, [], []
+
+
+def describe(key, config):
+    sec, grp, subj, tc, d, s, rm = key
+    group = f" (Group {grp})" if grp != 'ALL' else ""
+    return f"{sec} {subj}{group} with {tc} in {rm} on {config.DAYS[d]} {config.ALL_SLOTS[s]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-solve a small part of the timetable after a change")
+    parser.add_argument("-c", "--config", default="src/python/config.json")
+    parser.add_argument("-t", "--timetable", default=solution_handler.MASTER_TIMETABLE_PATH,
+                        help="current master timetable")
+    parser.add_argument("-o", "--output", default=REPAIRED_TIMETABLE_PATH,
+                        help="where to write the repaired master timetable")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds for all neighbourhoods together")
+    commands = parser.add_subparsers(dest="command", required=True)
+    teacher = commands.add_parser("block-teacher", help="the teacher cannot teach on a day (or some of its slots)")
+    teacher.add_argument("teacher")
+    room = commands.add_parser("block-room", help="the room is unavailable on a day (or some of its slots)")
+    room.add_argument("room")
+    for sub in (teacher, room):
+        sub.add_argument("--day", help="default: every day")
+        sub.add_argument("--slots", nargs="+", help="default: the whole day")
+    drop = commands.add_parser("drop-room", help="the room is unavailable all week")
+    drop.add_argument("room")
+    move = commands.add_parser("move", help="move one session to another start slot")
+    move.add_argument("section")
+    move.add_argument("subject")
+    move.add_argument("--group", help="the lab group (A/B) for labs")
+    move.add_argument("--from", dest="from_", nargs=2, metavar=("DAY", "SLOT"), required=True)
+    move.add_argument("--to", nargs=2, metavar=("DAY", "SLOT"), required=True)
+    args = parser.parse_args()
+
+    change = {"kind": args.command.replace('-', '_')}
+    if args.command == "block-teacher":
+        change.update(teacher=args.teacher, day=args.day, slots=args.slots)
+    elif args.command == "block-room":
+        change.update(room=args.room, day=args.day, slots=args.slots)
+    elif args.command == "drop-room":
+        change.update(room=args.room)
+    else:
+        change.update(section=args.section, subject=args.subject, group=args.group,
+                      **{"from": tuple(args.from_), "to": tuple(args.to)})
+
+    config = config_loader.load_config(args.config)
+    try:
+        timetable, removed, added = repair(config, change, args.timetable, args.time_limit)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    if timetable is None:
+        raise SystemExit(1)
+    for key in removed:
+        print(f"   - {describe(key, config)}")
+    for key in added:
+        print(f"   + {describe(key, config)}")
+    solution_handler.write_json_atomic(timetable, args.output)
+    print(f"✅ Repaired master timetable saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,37 +5,172 @@ import model_builder
 import constraints
 import objective
 import solution_handler
+import solver_setup
+import warm_start
+import decomposition
+import feasibility
+import diagnostics
+import postprocess
+import metrics as run_metrics
+import anytime
+import model_cache
 
-def main():
-    """Main function to generate the timetable."""
-    print("🚀 Starting timetable generation process...")
+CONFIG_PATH = "src/python/config.json"
+# Settings the decomposed solve does not apply (see decomposition.py)
+SINGLE_MODEL_ONLY = ("warm_start", "anytime", "model_cache")
 
-    # 1. Load configuration from JSON
-    config = config_loader.load_config("src/python/config.json")
-    print("   - Configuration loaded from config.json.")
 
+def solve(model, solver, class_vars, config):
+    """Runs the solver, streaming intermediate solutions if enabled in settings."""
+    if config.data['settings'].get('stream_solutions', False):
+        streamer = solution_handler.SolutionStreamer(class_vars, config)
+        return solver.Solve(model, streamer)
+    return solver.Solve(model)
+
+
+def write_metrics(metrics, config):
+    """Saves the run metrics if settings.metrics is enabled."""
+    settings = config.data['settings'].get('metrics', {})
+    if settings.get('enabled', False):
+        written = metrics.write(settings.get('json_path', "src/output/metrics/metrics.json"),
+                                settings.get('prometheus_path'))
+        print(f"📈 Run metrics saved to {', '.join(written)}")
+
+
+def build_model(config, metrics):
+    """Creates the variables, hard constraints and objective, timing each step."""
     # 2. Create the model and variables
     model = cp_model.CpModel()
-    class_vars = model_builder.create_class_variables(model, config)
-    model_builder.create_and_link_lab_room_choices(model, class_vars, config)
+    with metrics.phase("create_class_variables", model):
+        class_vars = model_builder.create_class_variables(model, config)
+    with metrics.phase("lab_room_choices", model):
+        model_builder.create_and_link_lab_room_choices(model, class_vars, config)
     print(f"   - Created {len(class_vars)} decision variables.")
 
     # 3. Add all hard constraints
-    constraints.add_hard_constraints(model, class_vars, config)
+    constraints.add_hard_constraints(model, class_vars, config, metrics=metrics)
     print("   - Hard constraints added.")
 
     # 4. Set the objective function (pass class_vars + config properly)
-    objective.set_objective(model, class_vars, config)
+    objective.set_objective(model, class_vars, config, metrics=metrics)
     print("   - Objective function set.")
+    return model, class_vars
+
+
+def solve_decomposed(config, settings, metrics):
+    """Solves independent groups of sections in parallel and post-processes the result.
+
+    Returns False, having written nothing, when the single-model path should run
+    instead: the sections form one group, or pinning the lab rooms made a group
+    infeasible.
+    """
+    lab_rooms = decomposition.assign_lab_rooms(config)
+    components = decomposition.section_components(config, lab_rooms)
+    if len(components) < 2:
+        print("   - Decomposition: every section shares a resource with the others; solving one model.")
+        return False
+    bypassed = [name for name in SINGLE_MODEL_ONLY if config.data['settings'].get(name, {}).get('enabled', False)]
+    bypassed += [name for name in ("stream_solutions", "explain_infeasibility") if config.data['settings'].get(name)]
+    if bypassed:
+        print(f"   - Decomposition: {', '.join(bypassed)} only apply to the single-model solve and are skipped.")
+
+    with metrics.phase("solve_decomposed"):
+        status_name, keys, results = decomposition.solve_decomposed(
+            config, settings.get('max_processes'), lab_rooms, components)
+    if status_name == "INFEASIBLE":
+        print("   - A group is infeasible with the lab rooms pinned; solving one model instead.")
+        return False
+    metrics.solver = {"status": status_name, "components": len(results),
+                      "wall_time": max((r["wall_time"] for r in results), default=0.0)}
+    with metrics.phase("export"):
+        timetable = solution_handler.export_keys(status_name, keys, config)
+    if timetable is not None:
+        with metrics.phase("postprocess"):
+            postprocess.run(timetable, config)
+    write_metrics(metrics, config)
+    print("✨ Process complete.")
+    return True
+
+
+def main(config_path=CONFIG_PATH, timeout=None):
+    """Main function to generate the timetable; `timeout` overrides settings.solver_timeout_seconds."""
+    print("🚀 Starting timetable generation process...")
+    metrics = run_metrics.Metrics(config_path)
+
+    # 1. Load configuration from JSON
+    with metrics.phase("load_config"):
+        config = config_loader.load_config(config_path)
+    if timeout is not None:
+        config.data['settings']['solver_timeout_seconds'] = timeout
+    print(f"   - Configuration loaded from {config_path}.")
+
+    # Catch over-subscribed teachers/rooms/sections before spending minutes in the solver
+    with metrics.phase("feasibility"):
+        issues = feasibility.analyze(config)
+    if not feasibility.print_report(issues):
+        print("❌ The configuration cannot produce a timetable; fix the resources above and re-run.")
+        return
+
+    # Independent groups of sections can be solved as separate models in parallel
+    decomposition_settings = config.data['settings'].get('decomposition', {})
+    if decomposition_settings.get('enabled', False) and solve_decomposed(config, decomposition_settings, metrics):
+        return
+
+    # 2-4. Build the model, or load the identical model an earlier run built and cached
+    cache_settings = config.data['settings'].get('model_cache', {})
+    cached = None
+    if cache_settings.get('enabled', False):
+        with metrics.phase("model_cache.load"):
+            cached = model_cache.load(config, cache_settings.get('directory', model_cache.CACHE_DIR))
+    if cached:
+        model, class_vars = cached
+        print(f"   - Model loaded from the cache ({len(class_vars)} decision variables).")
+    else:
+        model, class_vars = build_model(config, metrics)
+        if cache_settings.get('enabled', False):
+            with metrics.phase("model_cache.store"):
+                model_cache.store(model, class_vars, config,
+                                  cache_settings.get('directory', model_cache.CACHE_DIR),
+                                  cache_settings.get('max_megabytes', model_cache.DEFAULT_MAX_MEGABYTES))
+    metrics.record_model(model)
+
+    # 5. Solve the model (optionally warm-started from the previous timetable)
+    warm_settings = config.data['settings'].get('warm_start', {})
+    model_to_solve, timeout = model, None
+    if warm_settings.get('enabled', False):
+        with metrics.phase("warm_start"):
+            model_to_solve, _ = warm_start.prepare(model, class_vars, config)
+        timeout = warm_settings.get('solver_timeout_seconds')
 
-    # 5. Solve the model
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = float(config.data['settings']['solver_timeout_seconds'])
-    print(f"   - Solver is running (max {solver.parameters.max_time_in_seconds} seconds)...")
-    status = solver.Solve(model)
+    solver = solver_setup.create_solver(config, max_time_in_seconds=timeout)
+    print(f"   - Solver is running (max {solver.parameters.max_time_in_seconds} seconds, "
+          f"{solver.parameters.num_workers or 'all'} workers)...")
+    with metrics.phase("solve"):
+        if config.data['settings'].get('anytime', {}).get('enabled', False):
+            # A hard-constraints-only timetable is written first, then improved for the rest of the budget
+            status, solver = anytime.solve_anytime(model_to_solve, class_vars, config,
+                                                   lambda m, s: solve(m, s, class_vars, config),
+                                                   timeout, metrics)
+        else:
+            status = solve(model_to_solve, solver, class_vars, config)
+    if model_to_solve is not model and status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        print("   - Pinned re-solve failed; re-solving every section from the hints...")
+        solver = solver_setup.create_solver(config, max_time_in_seconds=timeout)
+        with metrics.phase("solve"):
+            status = solve(model, solver, class_vars, config)
+    metrics.record_solver(solver, status)
 
     # 6. Process and export the solution
-    solution_handler.export_solution(status, solver, class_vars, config)
+    with metrics.phase("export"):
+        timetable = solution_handler.export_solution(status, solver, class_vars, config)
+    if timetable is not None:
+        # 7. Merge parallel labs and resolve room clashes in memory (was labassign.js + timetable_resolve.js)
+        with metrics.phase("postprocess"):
+            postprocess.run(timetable, config)
+    if status == cp_model.INFEASIBLE and config.data['settings'].get('explain_infeasibility', False):
+        with metrics.phase("explain_infeasibility"):
+            diagnostics.explain_infeasibility(config)
+    write_metrics(metrics, config)
     print("✨ Process complete.")
 
 if __name__ == "__main__":
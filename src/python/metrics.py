@@ -0,0 +1,141 @@
+# metrics.py
+"""Structured run metrics: per-phase timings, model growth and CP-SAT statistics.
+
+A Metrics object records, for every phase of a run, its wall time and how many
+variables and constraints it added to the model, plus the solver's response
+statistics (status, wall time, conflicts, branches, objective, best bound and
+gap). write() saves them as JSON and, optionally, in the Prometheus text format
+so a node_exporter textfile collector can pick them up after nightly runs.
+
+Enabled with settings.metrics:
+    "metrics": {"enabled": true, "json_path": "src/output/metrics/metrics.json",
+                "prometheus_path": "src/output/metrics/timetable.prom"}
+"""
+import contextlib
+import time
+from datetime import datetime, timezone
+
+import solution_handler
+
+PROMETHEUS_PREFIX = "timetable"
+
+
+def model_size(model):
+    """(variables, constraints) currently in a CpModel."""
+    proto = model.Proto()
+    return len(proto.variables), len(proto.constraints)
+
+
+class Metrics:
+    """Collects phase timings and solver statistics for one run."""
+
+    def __init__(self, config_path=None):
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.config_path = config_path
+        self.phases = []
+        self.solver = {}
+        self.info = {}
+
+    @contextlib.contextmanager
+    def phase(self, name, model=None):
+        """Times the enclosed block; with a model, also counts the variables/constraints it adds."""
+        before = model_size(model) if model is not None else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = {"name": name, "seconds": round(time.perf_counter() - start, 6)}
+            if before is not None:
+                after = model_size(model)
+                entry["variables"] = after[0] - before[0]
+                entry["constraints"] = after[1] - before[1]
+            self.phases.append(entry)
+
+    def record_model(self, model):
+        self.info["variables"], self.info["constraints"] = model_size(model)
+
+    def record_solver(self, solver, status):
+        """Copies the response statistics of the last Solve()."""
+        from ortools.sat.python import cp_model
+        stats = {
+            "status": solver.StatusName(status),
+            "wall_time": solver.WallTime(),
+            "user_time": solver.UserTime(),
+            "conflicts": solver.NumConflicts(),
+            "branches": solver.NumBranches(),
+        }
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            objective, bound = solver.ObjectiveValue(), solver.BestObjectiveBound()
+            stats.update(objective=objective, best_bound=bound,
+                         gap=abs(objective - bound) / max(1.0, abs(objective)))
+        self.solver = stats
+
+    def as_dict(self):
+        return {
+            "started_at": self.started_at,
+            "config": self.config_path,
+            "phases": self.phases,
+            "model": self.info,
+            "solver": self.solver,
+        }
+
+    def prometheus_text(self):
+        """The metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def gauge(name, help_text, samples):
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{PROMETHEUS_PREFIX}_{name}{{{label_text}}} {value}" if label_text
+                             else f"{PROMETHEUS_PREFIX}_{name} {value}")
+
+        # The same phase name can occur twice (e.g. a fallback solve); label them apart
+        seen = {}
+        phases = []
+        for phase in self.phases:
+            seen[phase["name"]] = seen.get(phase["name"], 0) + 1
+            phases.append(({"phase": phase["name"], "run": str(seen[phase["name"]])}, phase))
+        gauge("phase_seconds", "Wall time of each pipeline phase.",
+              [(labels, p["seconds"]) for labels, p in phases])
+        gauge("phase_variables_added", "Model variables added by each phase.",
+              [(labels, p["variables"]) for labels, p in phases if "variables" in p])
+        gauge("phase_constraints_added", "Model constraints added by each phase.",
+              [(labels, p["constraints"]) for labels, p in phases if "constraints" in p])
+        for key in ("variables", "constraints"):
+            if key in self.info:
+                gauge(f"model_{key}", f"Model {key} in total.", [({}, self.info[key])])
+        if self.solver:
+            gauge("solver_status", "Final CP-SAT status (1 for the reported status).",
+                  [({"status": self.solver["status"]}, 1)])
+            for key, help_text in (("wall_time", "Solver wall time in seconds."),
+                                   ("user_time", "Solver user time in seconds."),
+                                   ("conflicts", "Conflicts explored by the solver."),
+                                   ("branches", "Branches explored by the solver."),
+                                   ("objective", "Objective value of the best solution."),
+                                   ("best_bound", "Best proven objective bound."),
+                                   ("gap", "Relative gap between objective and bound.")):
+                if key in self.solver:
+                    gauge(f"solver_{key}", help_text, [({}, self.solver[key])])
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path, prometheus_path=None):
+        """Writes the JSON file and, if a path is given, the Prometheus text file (both atomically)."""
+        written = []
+        if json_path:
+            solution_handler.write_json_atomic(self.as_dict(), json_path)
+            written.append(json_path)
+        if prometheus_path:
+            solution_handler.write_text_atomic(self.prometheus_text(), prometheus_path, suffix=".prom")
+            written.append(prometheus_path)
+        return written
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def timed(metrics, name, model=None):
+    """metrics.phase(...) when collecting metrics, otherwise a no-op context."""
+    return metrics.phase(name, model) if metrics is not None else contextlib.nullcontext()
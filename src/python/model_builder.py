@@ -1,9 +1,74 @@
 # model_builder.py
+from collections import defaultdict
+
+from ortools.sat.python import cp_model
+from indicators import IndicatorCache
+import constraints
+import objective
+
+
+class ClassVars(dict):
+    """class_vars dict that also keeps precomputed buckets of its variables.
+
+    Keys are (section, group, subject, teacher, day_idx, slot_idx, room) as before,
+    so existing `class_vars.items()` loops keep working. The buckets let the
+    constraint and objective code fetch the variables for one (day, slot, resource)
+    combination in O(1) instead of scanning the whole dict.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.indicators = None  # IndicatorCache shared by constraints and objective
+        # Indexed by every slot a session occupies (labs take two slots)
+        self.by_room_slot = defaultdict(list)          # (day, slot, room)
+        self.by_teacher_slot = defaultdict(list)       # (teacher, day, slot)
+        self.by_group_slot = defaultdict(list)         # (section, group, day, slot); 'ALL' = whole section
+        # Indexed by subject / day / start slot
+        self.by_subject = defaultdict(list)            # (section, subject)
+        self.by_lab_group = defaultdict(list)          # (section, group, lab_name)
+        self.by_section_day_theory = defaultdict(list) # (section, day)
+        self.by_group_day_labs = defaultdict(list)     # (section, group, day)
+        self.by_teacher_day = defaultdict(list)        # (teacher, day)
+        self.by_teacher_section_day = defaultdict(list)  # (teacher, section, day)
+        self.by_teacher_start = defaultdict(list)      # (teacher, day, start slot)
+        self.by_section_start = defaultdict(list)      # (section, day, start slot)
+        self.by_theory_start = defaultdict(list)       # (section, day, start slot)
+        self.by_group_start = defaultdict(list)        # (section, group, day, start slot)
+
+    def __setitem__(self, key, var):
+        super().__setitem__(key, var)
+        self._index(key, var)
+
+    def _index(self, key, var):
+        sec, grp, subj, tc, d, s, rm = key
+        is_lab = 'Lab' in subj
+        occupied = (s, s + 1) if is_lab else (s,)
+        for slot in occupied:
+            self.by_room_slot[(d, slot, rm)].append(var)
+            self.by_teacher_slot[(tc, d, slot)].append(var)
+            self.by_group_slot[(sec, grp, d, slot)].append(var)
+            if grp != 'ALL':
+                self.by_group_slot[(sec, 'ALL', d, slot)].append(var)
+
+        self.by_subject[(sec, subj)].append(var)
+        self.by_teacher_day[(tc, d)].append(var)
+        self.by_teacher_section_day[(tc, sec, d)].append(var)
+        self.by_teacher_start[(tc, d, s)].append(var)
+        self.by_section_start[(sec, d, s)].append(var)
+        self.by_group_start[(sec, grp, d, s)].append(var)
+        if is_lab:
+            self.by_lab_group[(sec, grp, subj)].append(var)
+            self.by_group_day_labs[(sec, grp, d)].append(var)
+        else:
+            self.by_section_day_theory[(sec, d)].append(var)
+            self.by_theory_start[(sec, d, s)].append(var)
+
 
 def create_class_variables(model, config):
     """Creates boolean variables for every possible class session."""
-    class_vars = {}
-    
+    class_vars = ClassVars()
+    class_vars.indicators = IndicatorCache(model, class_vars)
+
     # Theory class variables
     for section in config.SECTIONS:
         theory_room = config.SECTION_THEORY_ROOM.get(section)
@@ -13,7 +78,7 @@ def create_class_variables(model, config):
                 for slot_idx in range(len(config.ALL_SLOTS)):
                     name = f"theory_{section}_{subject}_{day_idx}_{slot_idx}"
                     class_vars[(section, 'ALL', subject, teacher, day_idx, slot_idx, theory_room)] = model.NewBoolVar(name)
-    
+
     # Lab variables
     for section in config.LABS:
         for lab_name in config.LABS.get(section, []):
@@ -21,9 +86,9 @@ def create_class_variables(model, config):
             if not teacher: continue
             for group in config.GROUPS:
                 for day_idx in range(len(config.DAYS)):
-                    for slot_idx, slot in enumerate(config.ALL_SLOTS):
-                        if slot not in config.LAB_SLOT_STARTS: continue
-                        for room in config.LAB_ROOMS:
+                    for slot_idx in range(len(config.ALL_SLOTS)):
+                        if slot_idx not in config.LAB_START_INDICES: continue
+                        for room in config.get_lab_rooms(section):
                             name = f"lab_{section}_{group}_{lab_name}_{day_idx}_{slot_idx}_{room}"
                             class_vars[(section, group, lab_name, teacher, day_idx, slot_idx, room)] = model.NewBoolVar(name)
     return class_vars
@@ -40,4 +105,14 @@ def create_and_link_lab_room_choices(model, class_vars, config):
     # Link lab class variables to the global room choice
     for (sec, grp, subj, tc, d, s, rm), var in class_vars.items():
         if 'Lab' in subj and (subj, rm) in lab_room_choice:
-            model.AddImplication(var, lab_room_choice[(subj, rm)])
\ No newline at end of file
+            model.AddImplication(var, lab_room_choice[(subj, rm)])
+
+def build_model(config, with_objective=True):
+    """Builds the complete CP-SAT model for a config and returns (model, class_vars)."""
+    model = cp_model.CpModel()
+    class_vars = create_class_variables(model, config)
+    create_and_link_lab_room_choices(model, class_vars, config)
+    constraints.add_hard_constraints(model, class_vars, config)
+    if with_objective:
+        objective.set_objective(model, class_vars, config)
+    return model, class_vars
@@ -0,0 +1,165 @@
+# model_cache.py
+"""On-disk cache of the built CP-SAT model.
+
+Building the model is pure Python and is repeated identically on every run,
+even when only the solver timeout or seed changed. The built CpModelProto is
+stored together with the class_vars keys in variable order, under a hash of
+  - config.json without the settings that only affect solving or exporting,
+  - the source of the modules that build the model,
+  - the OR-Tools version.
+A later run with the same hash parses the proto and goes straight to the solve.
+Entries are evicted least recently used first once the cache grows past
+settings.model_cache.max_megabytes.
+
+The proto is stored in the binary wire format when the OR-Tools Python binding
+can serialize it (protobuf-backed releases); the pybind binding of newer
+releases can only parse text, so those entries are text. The OR-Tools version
+is part of the hash, so an entry is always read back in the format it was
+written. Parsing the text format takes about as long as building the model, so
+settings.model_cache is off by default.
+
+On a hit class_vars is rebuilt as a model_builder.ClassVars, buckets and
+IndicatorCache included, so code that adds constraints or objective terms to a
+cached model sees the same class_vars as after a fresh build.
+"""
+import copy
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from ortools.sat.python import cp_model
+
+from indicators import IndicatorCache
+from model_builder import ClassVars
+
+CACHE_DIR = "src/output/cache/model"
+DEFAULT_MAX_MEGABYTES = 256
+# Settings that change how a model is solved or exported, but not the model itself
+RUN_ONLY_SETTINGS = (
+    "solver_timeout_seconds", "num_workers", "random_seed", "search_branching", "linearization_level",
+    "stream_solutions", "explain_infeasibility", "explain_granularity", "warm_start", "postprocess",
+    "decomposition", "anytime", "metrics", "local_repair", "model_cache",
+)
+MODEL_MODULES = ("config_loader", "model_builder", "constraints", "objective", "indicators", "interval_model")
+
+
+def cache_key(config):
+    """Hex digest identifying the model a config builds with the current code."""
+    import ortools
+
+    data = copy.deepcopy(config.data)
+    for name in RUN_ONLY_SETTINGS:
+        data['settings'].pop(name, None)
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for module in MODEL_MODULES:
+        with open(os.path.join(here, f"{module}.py"), 'rb') as f:
+            digest.update(f.read())
+    digest.update(ortools.__version__.encode())
+    return digest.hexdigest()
+
+
+def _binary_protos():
+    return hasattr(cp_model.CpModel().Proto(), "SerializeToString")
+
+
+def _paths(cache_dir, key):
+    suffix = "pb" if _binary_protos() else "pbtxt"
+    return os.path.join(cache_dir, f"{key}.{suffix}"), os.path.join(cache_dir, f"{key}.keys.pickle")
+
+
+def load(config, cache_dir=CACHE_DIR):
+    """Returns (model, class_vars) from the cache, or None on a miss."""
+    key = cache_key(config)
+    model_path, keys_path = _paths(cache_dir, key)
+    try:
+        with open(keys_path, 'rb') as f:
+            entry = pickle.load(f)
+        with open(model_path, 'rb') as f:
+            data = f.read()
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if not isinstance(entry, dict):  # written before the indicators were cached
+        return None
+
+    model = cp_model.CpModel()
+    if _binary_protos():
+        model.Proto().ParseFromString(data)
+    else:
+        model.Proto().parse_text_format(data.decode("utf-8"))
+    class_vars = ClassVars()
+    for k, index in entry["class_vars"]:
+        class_vars[k] = model.GetBoolVarFromProtoIndex(index)
+    class_vars.indicators = IndicatorCache(model, class_vars)
+    class_vars.indicators.restore(
+        {k: model.GetBoolVarFromProtoIndex(index) for k, index in entry["indicators"]},
+        None if entry["false"] is None else model.GetBoolVarFromProtoIndex(entry["false"]))
+    # Mark the entry as recently used for the LRU eviction
+    for path in (model_path, keys_path):
+        os.utime(path)
+    return model, class_vars
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def store(model, class_vars, config, cache_dir=CACHE_DIR, max_megabytes=DEFAULT_MAX_MEGABYTES):
+    """Saves a freshly built model and evicts old entries beyond `max_megabytes`."""
+    key = cache_key(config)
+    model_path, keys_path = _paths(cache_dir, key)
+    indicators = getattr(class_vars, "indicators", None)
+    cached, false = indicators.snapshot() if indicators is not None else ({}, None)
+    entry = {
+        "class_vars": [(k, var.Index()) for k, var in class_vars.items()],
+        "indicators": [(k, var.Index()) for k, var in cached.items()],
+        "false": None if false is None else false.Index(),
+    }
+    proto = model.Proto()
+    data = proto.SerializeToString() if _binary_protos() else str(proto).encode("utf-8")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # The proto goes last: an entry only counts once both files exist
+        _write_atomic(keys_path, pickle.dumps(entry))
+        _write_atomic(model_path, data)
+    except OSError as e:
+        print(f"   - ⚠️  Could not cache the model: {e}")
+        return None
+    evict(cache_dir, max_megabytes, keep=key)
+    return key
+
+
+def evict(cache_dir=CACHE_DIR, max_megabytes=DEFAULT_MAX_MEGABYTES, keep=None):
+    """Deletes least recently used entries until the cache fits in `max_megabytes`."""
+    entries = {}
+    for name in os.listdir(cache_dir):
+        if name.startswith(".tmp_"):
+            continue
+        key = name.split('.', 1)[0]
+        path = os.path.join(cache_dir, name)
+        stat = os.stat(path)
+        size, used = entries.get(key, (0, 0.0))
+        entries[key] = (size + stat.st_size, max(used, stat.st_mtime))
+
+    total = sum(size for size, _ in entries.values())
+    limit = max_megabytes * 1024 * 1024
+    for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+        if total <= limit:
+            break
+        if key == keep:
+            continue
+        for path in _paths(cache_dir, key):
+            if os.path.exists(path):
+                os.remove(path)
+        total -= size
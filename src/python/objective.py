@@ -1,89 +1,254 @@
 # objective.py
+"""The weighted penalty objective, in two interchangeable formulations.
 
-def set_objective(model, class_vars, config):
-    """Defines the objective function to minimize penalties."""
+ - "reified" (the original): every continuity transition, unbalanced lab slot
+   and busy slot is a boolean tied to its condition in both directions, and the
+   teacher term adds up daily loads (a constant, given 3 classes per subject).
+ - "linear": transitions and imbalances are bounded from below by the linear
+   difference of the 0/1 occupancy sums they compare (uniqueness already keeps
+   those sums at most 1), busy slots only get the implications that the
+   minimisation needs, and each teacher's daily load spread (max - min, via
+   AddMaxEquality/AddMinEquality) is penalised so load is actually balanced.
+Choose with settings.objective_formulation; bench_objective.py compares them.
+"""
+from collections import defaultdict
+
+from metrics import timed
+
+FORMULATIONS = ("reified", "linear")
+
+
+def set_objective(model, class_vars, config, metrics=None, formulation=None):
+    """Defines the objective function to minimize penalties.
+
+    With a metrics.Metrics, each penalty term is recorded as its own phase.
+    """
+    formulation = formulation or config.data['settings'].get('objective_formulation', 'reified')
+    if formulation not in FORMULATIONS:
+        raise ValueError(f"Unknown objective_formulation '{formulation}'; expected one of {FORMULATIONS}")
+    if formulation == 'linear':
+        terms = (("teacher_balance", _teacher_balance_terms),
+                 ("continuity", _linear_continuity_terms),
+                 ("parallel_labs", _linear_parallel_lab_terms),
+                 ("daily_labs", _linear_daily_lab_terms))
+    else:
+        terms = (("teacher_load", _teacher_load_terms),
+                 ("continuity", _continuity_terms),
+                 ("parallel_labs", _parallel_lab_terms),
+                 ("daily_labs", _daily_lab_terms))
+
+    penalties = []
+    for name, term in terms:
+        with timed(metrics, f"objective.{name}", model):
+            penalties += term(model, class_vars, config)
+
+    # Final optimization objective
+    model.Minimize(sum(penalties))
+
+
+def _teacher_load_terms(model, class_vars, config):
+    """1. Balance teacher daily load"""
     penalties = []
-    
-    # 1. Balance teacher daily load
     for teacher in config.ALL_TEACHERS:
         for day_idx in range(len(config.DAYS)):
-            daily_load = sum(v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items() 
-                             if tc == teacher and d == day_idx)
+            daily_load = sum(class_vars.by_teacher_day.get((teacher, day_idx), []))
             penalties.append(daily_load * config.WEIGHTS['workload_penalty'])
+    return penalties
 
-    # 2. Prefer continuous theory blocks
+
+def _continuity_terms(model, class_vars, config):
+    """2. Prefer continuous theory blocks"""
+    penalties = []
+    indicators = class_vars.indicators
     for section in config.SECTIONS:
         for day_idx in range(len(config.DAYS)):
             for i in range(len(config.ALL_SLOTS) - 1):
-                theory_at_i = sum(v for (s, grp, subj, tc, d, s_idx, rm), v in class_vars.items() 
-                                  if s == section and d == day_idx and s_idx == i and 'Lab' not in subj)
-                theory_at_i1 = sum(v for (s, grp, subj, tc, d, s_idx, rm), v in class_vars.items() 
-                                   if s == section and d == day_idx and s_idx == i + 1 and 'Lab' not in subj)
-                
-                is_theory_i = model.NewBoolVar('')
-                model.Add(theory_at_i > 0).OnlyEnforceIf(is_theory_i)
-                model.Add(theory_at_i == 0).OnlyEnforceIf(is_theory_i.Not())
-
-                is_theory_i1 = model.NewBoolVar('')
-                model.Add(theory_at_i1 > 0).OnlyEnforceIf(is_theory_i1)
-                model.Add(theory_at_i1 == 0).OnlyEnforceIf(is_theory_i1.Not())
-
-                transition = model.NewBoolVar('')
+                is_theory_i = indicators.theory_at(section, day_idx, i)
+                is_theory_i1 = indicators.theory_at(section, day_idx, i + 1)
+
+                transition = model.NewBoolVar(f"transition_{section}_{day_idx}_{i}")
                 model.Add(is_theory_i != is_theory_i1).OnlyEnforceIf(transition)
                 model.Add(is_theory_i == is_theory_i1).OnlyEnforceIf(transition.Not())
                 penalties.append(transition * config.WEIGHTS['continuity_penalty'])
+    return penalties
+
 
-    # 3. Prefer parallel labs
+def _parallel_lab_terms(model, class_vars, config):
+    """3. Prefer parallel labs"""
+    penalties = []
+    indicators = class_vars.indicators
     for section in config.SECTIONS:
         for day_idx in range(len(config.DAYS)):
-            for slot_idx, slot in enumerate(config.ALL_SLOTS):
-                if slot not in config.LAB_SLOT_STARTS:
-                    continue
-                
-                gA_active = model.NewBoolVar('')
-                gB_active = model.NewBoolVar('')
-                
-                sum_gA = sum(v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items() 
-                             if sec == section and grp == 'A' and d == day_idx and s == slot_idx)
-                sum_gB = sum(v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items() 
-                             if sec == section and grp == 'B' and d == day_idx and s == slot_idx)
-
-                model.Add(sum_gA > 0).OnlyEnforceIf(gA_active)
-                model.Add(sum_gA == 0).OnlyEnforceIf(gA_active.Not())
-                model.Add(sum_gB > 0).OnlyEnforceIf(gB_active)
-                model.Add(sum_gB == 0).OnlyEnforceIf(gB_active.Not())
-
-                unbalanced = model.NewBoolVar('')
+            for slot_idx in sorted(config.LAB_START_INDICES):
+                gA_active = indicators.group_active(section, 'A', day_idx, slot_idx)
+                gB_active = indicators.group_active(section, 'B', day_idx, slot_idx)
+
+                unbalanced = model.NewBoolVar(f"unbalanced_{section}_{day_idx}_{slot_idx}")
                 model.Add(gA_active != gB_active).OnlyEnforceIf(unbalanced)
                 model.Add(gA_active == gB_active).OnlyEnforceIf(unbalanced.Not())
                 penalties.append(unbalanced * config.WEIGHTS['parallel_lab_penalty'])
+    return penalties
+
 
-    # 4 & 5. Penalize more than one lab session per day (for section and group)
+def _daily_lab_terms(model, class_vars, config):
+    """4 & 5. Penalize more than one lab session per day (for section and group)"""
+    penalties = []
+    indicators = class_vars.indicators
+    lab_start_indices = sorted(config.LAB_START_INDICES)
+    # At most one lab per start, so at most len(starts) - 1 extra labs a day
+    max_penalty = max(len(lab_start_indices) - 1, 0)
     for section in config.SECTIONS:
         for day_idx in range(len(config.DAYS)):
             # Section penalty
-            section_lab_sessions = []
-            for slot_idx, slot in enumerate(config.ALL_SLOTS):
-                if slot not in config.LAB_SLOT_STARTS:
-                    continue
-                session_active = model.NewBoolVar('')
-                sum_labs = sum(v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items() 
-                               if sec == section and d == day_idx and s == slot_idx)
-                model.Add(sum_labs > 0).OnlyEnforceIf(session_active)
-                model.Add(sum_labs == 0).OnlyEnforceIf(session_active.Not())
-                section_lab_sessions.append(session_active)
-            
-            section_penalty = model.NewIntVar(0, 5, '')
+            section_lab_sessions = [indicators.busy(section, day_idx, slot_idx) for slot_idx in lab_start_indices]
+
+            section_penalty = model.NewIntVar(0, max_penalty, f"daily_lab_penalty_{section}_{day_idx}")
             model.Add(section_penalty >= sum(section_lab_sessions) - 1)
             penalties.append(section_penalty * config.WEIGHTS['daily_lab_penalty'])
-            
+
             # Group penalty
             for group in config.GROUPS:
-                group_labs_today = sum(v for (sec, grp, subj, tc, d, s, rm), v in class_vars.items() 
-                                       if sec == section and grp == group and d == day_idx)
-                group_penalty = model.NewIntVar(0, 5, '')
+                group_labs_today = sum(class_vars.by_group_day_labs.get((section, group, day_idx), []))
+                group_penalty = model.NewIntVar(0, max_penalty, f"group_daily_lab_penalty_{section}_{group}_{day_idx}")
                 model.Add(group_penalty >= group_labs_today - 1)
                 penalties.append(group_penalty * config.WEIGHTS['group_daily_lab_penalty'])
-    
-    # Final optimization objective
-    model.Minimize(sum(penalties))
+    return penalties
+
+
+# ---------------- Linear formulation ---------------- #
+
+def _teacher_balance_terms(model, class_vars, config):
+    """1. Balance teacher daily load: penalise the spread between the busiest and the lightest day"""
+    penalties = []
+    max_load = len(config.ALL_SLOTS)
+    for teacher in config.ALL_TEACHERS:
+        loads = [sum(class_vars.by_teacher_day.get((teacher, day_idx), [])) for day_idx in range(len(config.DAYS))]
+        heaviest = model.NewIntVar(0, max_load, f"max_load_{teacher}")
+        lightest = model.NewIntVar(0, max_load, f"min_load_{teacher}")
+        model.AddMaxEquality(heaviest, loads)
+        model.AddMinEquality(lightest, loads)
+        penalties.append((heaviest - lightest) * config.WEIGHTS['workload_penalty'])
+    return penalties
+
+
+def _abs_difference(model, a, b, upper, name):
+    """A variable that is at least |a - b|; minimisation makes it equal."""
+    difference = model.NewIntVar(0, upper, name)
+    model.Add(difference >= a - b)
+    model.Add(difference >= b - a)
+    return difference
+
+
+def _linear_continuity_terms(model, class_vars, config):
+    """2. Prefer continuous theory blocks"""
+    penalties = []
+    for section in config.SECTIONS:
+        for day_idx in range(len(config.DAYS)):
+            theory = [class_vars.by_theory_start.get((section, day_idx, i), [])
+                      for i in range(len(config.ALL_SLOTS))]
+            for i in range(len(config.ALL_SLOTS) - 1):
+                if not theory[i] and not theory[i + 1]:
+                    continue
+                upper = max(len(theory[i]), len(theory[i + 1]))
+                transition = _abs_difference(model, sum(theory[i]), sum(theory[i + 1]), upper,
+                                             f"transition_{section}_{day_idx}_{i}")
+                penalties.append(transition * config.WEIGHTS['continuity_penalty'])
+    return penalties
+
+
+def _linear_parallel_lab_terms(model, class_vars, config):
+    """3. Prefer parallel labs"""
+    penalties = []
+    for section in config.SECTIONS:
+        for day_idx in range(len(config.DAYS)):
+            for slot_idx in sorted(config.LAB_START_INDICES):
+                group_a = class_vars.by_group_start.get((section, 'A', day_idx, slot_idx), [])
+                group_b = class_vars.by_group_start.get((section, 'B', day_idx, slot_idx), [])
+                if not group_a and not group_b:
+                    continue
+                unbalanced = _abs_difference(model, sum(group_a), sum(group_b), max(len(group_a), len(group_b)),
+                                             f"unbalanced_{section}_{day_idx}_{slot_idx}")
+                penalties.append(unbalanced * config.WEIGHTS['parallel_lab_penalty'])
+    return penalties
+
+
+def _linear_daily_lab_terms(model, class_vars, config):
+    """4 & 5. Penalize more than one lab session per day (for section and group)"""
+    penalties = []
+    lab_start_indices = sorted(config.LAB_START_INDICES)
+    # At most one lab per start, so at most len(starts) - 1 extra labs a day
+    max_penalty = max(len(lab_start_indices) - 1, 0)
+    for section in config.SECTIONS:
+        for day_idx in range(len(config.DAYS)):
+            # Section penalty: a busy literal only needs to be forced up, once per group,
+            # since each group (and 'ALL' for theory) starts at most one session per slot
+            section_lab_sessions = []
+            for slot_idx in lab_start_indices:
+                per_group = [class_vars.by_group_start.get((section, group, day_idx, slot_idx), [])
+                             for group in config.GROUPS + ['ALL']]
+                per_group = [starting for starting in per_group if starting]
+                if per_group:
+                    busy = model.NewBoolVar(f"busy_{section}_{day_idx}_{slot_idx}")
+                    for starting in per_group:
+                        model.Add(busy >= sum(starting))
+                    section_lab_sessions.append(busy)
+
+            if len(section_lab_sessions) > 1:
+                section_penalty = model.NewIntVar(0, len(section_lab_sessions) - 1,
+                                                  f"daily_lab_penalty_{section}_{day_idx}")
+                model.Add(section_penalty >= sum(section_lab_sessions) - 1)
+                penalties.append(section_penalty * config.WEIGHTS['daily_lab_penalty'])
+
+            # Group penalty
+            for group in config.GROUPS:
+                group_labs = class_vars.by_group_day_labs.get((section, group, day_idx), [])
+                if len(group_labs) > 1:
+                    group_penalty = model.NewIntVar(0, len(group_labs) - 1,
+                                                    f"group_daily_lab_penalty_{section}_{group}_{day_idx}")
+                    model.Add(group_penalty >= sum(group_labs) - 1)
+                    penalties.append(group_penalty * config.WEIGHTS['group_daily_lab_penalty'])
+    return penalties
+
+
+# ---------------- Evaluation ---------------- #
+
+def evaluate(keys, config):
+    """Scores a solution (its scheduled class_vars keys) on every term of both formulations.
+
+    Independent of the model, so timetables solved with either formulation can be
+    compared. "penalty" is the weighted sum of the terms both formulations share
+    (the teacher term differs between them and is reported on its own).
+    """
+    theory = set()
+    group_starts = defaultdict(int)
+    section_starts = set()
+    group_day_labs = defaultdict(int)
+    teacher_day = defaultdict(int)
+    for sec, grp, subj, tc, d, s, rm in keys:
+        teacher_day[(tc, d)] += 1
+        group_starts[(sec, grp, d, s)] += 1
+        section_starts.add((sec, d, s))
+        if 'Lab' in subj:
+            group_day_labs[(sec, grp, d)] += 1
+        else:
+            theory.add((sec, d, s))
+
+    days, slots = range(len(config.DAYS)), range(len(config.ALL_SLOTS))
+    lab_starts = sorted(config.LAB_START_INDICES)
+    weights = config.WEIGHTS
+    terms = {
+        "transitions": sum(((sec, d, i) in theory) != ((sec, d, i + 1) in theory)
+                           for sec in config.SECTIONS for d in days for i in slots[:-1]),
+        "unbalanced_lab_slots": sum(group_starts[(sec, 'A', d, s)] != group_starts[(sec, 'B', d, s)]
+                                    for sec in config.SECTIONS for d in days for s in lab_starts),
+        "extra_section_lab_slots": sum(max(0, sum((sec, d, s) in section_starts for s in lab_starts) - 1)
+                                       for sec in config.SECTIONS for d in days),
+        "extra_group_labs": sum(max(0, n - 1) for n in group_day_labs.values()),
+        "teacher_load_spread": sum(max(teacher_day[(t, d)] for d in days) - min(teacher_day[(t, d)] for d in days)
+                                   for t in config.ALL_TEACHERS),
+    }
+    terms["penalty"] = (terms["transitions"] * weights['continuity_penalty'] +
+                        terms["unbalanced_lab_slots"] * weights['parallel_lab_penalty'] +
+                        terms["extra_section_lab_slots"] * weights['daily_lab_penalty'] +
+                        terms["extra_group_labs"] * weights['group_daily_lab_penalty'])
+    return terms
@@ -0,0 +1,98 @@
+# postprocess.py
+"""In-process post-processing of the master timetable.
+
+Runs the stages that used to be separate Node scripts directly on the solution in
+memory and writes their output files once at the end:
+ - merge_labs (was labassign.js): a section's 2-hour labs on the same day are
+   run in parallel in the earliest of their blocks.
+ - resolve_conflicts (was timetable_resolve.js): room and teacher clashes
+   created by the merge are fixed by re-placing the clashing labs together,
+   moving as few of them as possible (conflict_repair.py).
+
+Stages are switched with settings.postprocess.merge_labs / resolve_conflicts;
+export_excel also writes the section/teacher/room workbook (excel_export.py).
+"""
+import copy
+
+import solution_handler
+import conflict_repair
+from compact import CompactTimetable, TEACHER
+
+MERGED_TIMETABLE_PATH = "src/output/timetable.json"
+RESOLVED_TIMETABLE_PATH = "src/output/timetable_resolved.json"
+
+
+def merge_labs(timetable, config):
+    """Moves all 2-hour labs of a section on one day into its earliest lab block. Modifies in place."""
+    slots = config.ALL_SLOTS
+    for day_list in timetable.values():
+        for section_schedule in day_list:
+            labs_for_section = []
+            lab_slots_to_clear = []
+
+            i = 0
+            while i < len(slots) - 1:
+                first = section_schedule.get(slots[i]) or []
+                second = section_schedule.get(slots[i + 1]) or []
+                # A 2-hour lab block is two consecutive slots holding the same single lab
+                if len(first) == 1 and first[0].get("isLab") and len(second) == 1 and first[0] == second[0]:
+                    labs_for_section.append((first[0], i))
+                    lab_slots_to_clear += [slots[i], slots[i + 1]]
+                    i += 2
+                else:
+                    i += 1
+
+            if len(labs_for_section) > 1:
+                for slot in lab_slots_to_clear:
+                    section_schedule[slot] = []
+                start_idx = labs_for_section[0][1]
+                details = [lab for lab, _ in labs_for_section]
+                section_schedule[slots[start_idx]] = list(details)
+                section_schedule[slots[start_idx + 1]] = [dict(lab) for lab in details]
+    return timetable
+
+
+def resolve_conflicts(timetable, config):
+    """Removes room and teacher clashes by re-placing labs jointly (see conflict_repair). Modifies in place.
+
+    Returns the list of (day, slot, room or teacher) clashes that could not be resolved.
+    """
+    settings = config.data['settings'].get('postprocess', {})
+    return conflict_repair.repair_conflicts(timetable, config,
+                                            float(settings.get('repair_timeout_seconds', 10)))
+
+
+def run(timetable, config, merged_path=MERGED_TIMETABLE_PATH, resolved_path=RESOLVED_TIMETABLE_PATH,
+        excel_path=None):
+    """Runs the enabled stages on the in-memory timetable and writes their files once at the end.
+
+    Nothing is written until every stage has run, so a failing stage never leaves a
+    half-processed file under a final name. The workbook goes to `excel_path`
+    (default excel_export.EXCEL_PATH) when export_excel is set.
+    """
+    settings = config.data['settings'].get('postprocess', {})
+    merged = None
+    if settings.get('merge_labs', True):
+        merge_labs(timetable, config)
+        # Kept as a copy because resolve_conflicts keeps modifying the same object
+        merged = copy.deepcopy(timetable)
+    if settings.get('resolve_conflicts', True):
+        resolve_conflicts(timetable, config)
+
+    compact = CompactTimetable.from_json(timetable)
+    for kind, clashes in (("room", compact.clashes()), ("teacher", compact.clashes(TEACHER))):
+        if clashes:
+            print(f"⚠️  {len(clashes)} {kind} clash(es) remain: " +
+                  ", ".join(f"{name} on {day} {slot}" for day, slot, name in clashes))
+
+    outputs = []
+    if merged is not None:
+        solution_handler.write_json_atomic(merged, merged_path)
+        outputs.append(merged_path)
+    solution_handler.write_json_atomic(timetable, resolved_path)
+    outputs.append(resolved_path)
+    if settings.get('export_excel', False):
+        import excel_export
+        outputs.append(excel_export.write_workbook(compact, excel_path or excel_export.EXCEL_PATH))
+    print(f"✅ Post-processed timetable saved to {', '.join(outputs)}")
+    return timetable
@@ -0,0 +1,246 @@
+# scenarios.py
+"""What-if scenarios solved side by side from one base model.
+
+The base model is built once from config.json and exported as a proto. Every
+worker of a process pool parses that proto once; each scenario then clones it,
+applies its delta and solves:
+  - close_room     {"room", "days"?, "slots"?}  no session may use the room then
+  - teacher_leave  {"teacher", "days"?}         the teacher teaches nothing then
+  - theory_cap     {"value"}                    max theory classes per section per day (4)
+  - lab_cap        {"value"}                    max labs per group per day (2)
+Scenarios that change the set of sessions cannot be expressed as a delta of the
+base proto, so they are built from a patched copy of the config instead:
+  - config         {"set": {"dotted.path": value}, "append": {"dotted.path": [items]}}
+  - teacher_leave  with a "substitute", who takes over all of the teacher's classes
+
+Usage:
+  python src/python/scenarios.py src/python/scenarios.json [--timeout 20] [--processes N] [-o comparison.csv]
+"""
+import argparse
+import copy
+import csv
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import config_loader
+
+DELTA_KINDS = ("close_room", "teacher_leave", "theory_cap", "lab_cap")
+DEFAULT_OUTPUT = "src/output/scenarios/comparison.csv"
+COLUMNS = ("name", "kind", "mode", "status", "objective", "best_bound", "setup_seconds", "solve_seconds", "changes")
+
+# Set in every pool worker by _init_worker
+_base = {}
+
+
+def cap_constraints(model, class_vars):
+    """Proto indices of the daily theory and lab cap constraints, found by their variables."""
+    targets = {}
+    for key, variables in class_vars.by_section_day_theory.items():
+        targets[frozenset(v.Index() for v in variables)] = "theory_cap"
+    for key, variables in class_vars.by_group_day_labs.items():
+        targets[frozenset(v.Index() for v in variables)] = "lab_cap"
+    caps = {"theory_cap": [], "lab_cap": []}
+    for index, ct in enumerate(model.Proto().constraints):
+        if ct.has_linear() and not ct.enforcement_literal:
+            kind = targets.get(frozenset(ct.linear.vars))
+            if kind:
+                caps[kind].append(index)
+    return caps
+
+
+def patched_data(data, scenario):
+    """A copy of the raw config with a structural scenario applied."""
+    data = copy.deepcopy(data)
+    if scenario["kind"] == "teacher_leave":
+        teacher, substitute = scenario["teacher"], scenario["substitute"]
+        for pairs in data['subjects'].values():
+            for pair in pairs:
+                if pair[1] == teacher:
+                    pair[1] = substitute
+        return data
+    for operation in ("set", "append"):
+        for path, value in scenario.get(operation, {}).items():
+            *parents, last = path.split('.')
+            node = data
+            for part in parents:
+                node = node.setdefault(part, {})
+            if operation == "set":
+                node[last] = value
+            else:
+                node.setdefault(last, []).extend(value)
+    return data
+
+
+def _is_delta(scenario):
+    return scenario["kind"] in DELTA_KINDS + ("baseline",) and not scenario.get("substitute")
+
+
+def _init_worker(model_path, keys, caps, data):
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    with open(model_path, 'r', encoding="utf-8") as f:
+        model.Proto().parse_text_format(f.read())
+    _base.update(model=model, keys=keys, caps=caps, config=config_loader.Config(data))
+
+
+def _apply_delta(model, scenario, config):
+    """Applies a delta scenario to a copy of the base model; returns how many variables/constraints it touched."""
+    kind = scenario["kind"]
+    if kind == "baseline":
+        return 0
+    if kind in ("theory_cap", "lab_cap"):
+        for index in _base["caps"][kind]:
+            model.Proto().constraints[index].linear.domain[1] = int(scenario["value"])
+        return len(_base["caps"][kind])
+
+    days = {config.DAYS.index(day) for day in scenario.get("days") or config.DAYS}
+    slots = {config.SLOT_INDEX[slot] for slot in scenario.get("slots") or config.ALL_SLOTS}
+    changes = 0
+    for (sec, grp, subj, tc, d, s, rm), index in _base["keys"]:
+        if kind == "close_room" and rm != scenario["room"]:
+            continue
+        if kind == "teacher_leave" and tc != scenario["teacher"]:
+            continue
+        occupied = {s, s + 1} if 'Lab' in subj else {s}
+        if d in days and occupied & slots:
+            model.Add(model.GetBoolVarFromProtoIndex(index) == 0)
+            changes += 1
+    return changes
+
+
+def _solve_scenario(scenario, data, timeout, num_workers):
+    """Process-pool worker: solves one scenario, from the base proto or from its own config."""
+    from ortools.sat.python import cp_model
+    import model_builder
+    import solver_setup
+
+    start = time.perf_counter()
+    if data is None:
+        config = _base["config"]
+        model = _base["model"].Clone()
+        changes = _apply_delta(model, scenario, config)
+        mode = "delta"
+    else:
+        config = config_loader.Config(data)
+        model, _ = model_builder.build_model(config)
+        changes = None
+        mode = "rebuild"
+    setup_seconds = time.perf_counter() - start
+
+    solver = solver_setup.create_solver(config, max_time_in_seconds=timeout)
+    solver.parameters.num_workers = num_workers
+    status = solver.Solve(model)
+    solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        "name": scenario["name"],
+        "kind": scenario["kind"],
+        "mode": mode,
+        "status": solver.StatusName(status),
+        "objective": solver.ObjectiveValue() if solved else None,
+        "best_bound": solver.BestObjectiveBound() if solved else None,
+        "setup_seconds": round(setup_seconds, 3),
+        "solve_seconds": round(solver.WallTime(), 3),
+        "changes": changes,
+    }
+
+
+def validate_scenario(scenario, config):
+    """Raises ValueError if a scenario names an unknown kind, day, slot, room or teacher."""
+    kind = scenario.get("kind")
+    if kind not in DELTA_KINDS + ("config",):
+        raise ValueError(f"unknown kind '{kind}'; expected one of {DELTA_KINDS + ('config',)}")
+    if kind == "close_room" and scenario["room"] not in config.ALL_ROOMS:
+        raise ValueError(f"unknown room '{scenario['room']}'")
+    if kind == "teacher_leave" and scenario["teacher"] not in config.ALL_TEACHERS:
+        raise ValueError(f"unknown teacher '{scenario['teacher']}'")
+    if kind in ("theory_cap", "lab_cap") and not isinstance(scenario.get("value"), int):
+        raise ValueError(f"{kind} needs an integer 'value'")
+    for day in scenario.get("days") or []:
+        if day not in config.DAYS:
+            raise ValueError(f"unknown day '{day}'")
+    for slot in scenario.get("slots") or []:
+        if slot not in config.SLOT_INDEX:
+            raise ValueError(f"unknown slot '{slot}'")
+
+
+def run_scenarios(config, scenarios, timeout=None, max_processes=None):
+    """Solves the baseline and every scenario; returns one result dict per row."""
+    import model_builder
+
+    timeout = float(timeout or config.data['settings']['solver_timeout_seconds'])
+    jobs, results = [(0, {"name": "baseline", "kind": "baseline"}, None)], {}
+    for position, scenario in enumerate(scenarios, start=1):
+        try:
+            validate_scenario(scenario, config)
+            data = None if _is_delta(scenario) else patched_data(config.data, scenario)
+            if data is not None:
+                config_loader.validate(data)
+        except (ValueError, KeyError) as e:
+            results[position] = {"name": scenario.get("name", f"#{position}"), "kind": scenario.get("kind"),
+                                 "mode": "-", "status": f"INVALID: {e}"}
+            continue
+        jobs.append((position, scenario, data))
+
+    start = time.perf_counter()
+    model, class_vars = model_builder.build_model(config)
+    keys = [(key, var.Index()) for key, var in class_vars.items()]
+    caps = cap_constraints(model, class_vars)
+    print(f"   - Base model built once in {time.perf_counter() - start:.2f}s "
+          f"({len(model.Proto().variables)} variables, {len(model.Proto().constraints)} constraints).")
+
+    processes = max(1, min(len(jobs), max_processes or os.cpu_count() or 1))
+    num_workers = int(config.data['settings'].get('num_workers', 0)) or max(1, (os.cpu_count() or 1) // processes)
+    print(f"   - Solving {len(jobs)} scenario(s) with {processes} process(es) x {num_workers} worker(s), "
+          f"max {timeout:.0f}s each...")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "base_model.pbtxt")
+        model.ExportToFile(model_path)
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(model_path, keys, caps, config.data)) as pool:
+            futures = {position: pool.submit(_solve_scenario, scenario, data, timeout, num_workers)
+                       for position, scenario, data in jobs}
+            for position, future in futures.items():
+                results[position] = future.result()
+    return [results[position] for position in sorted(results)]
+
+
+def write_table(results, csv_path):
+    directory = os.path.dirname(csv_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(csv_path, 'w', newline='', encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare what-if scenarios against the current config")
+    parser.add_argument("scenarios", help="JSON file with a list of scenarios")
+    parser.add_argument("-c", "--config", default="src/python/config.json")
+    parser.add_argument("--timeout", type=float, default=None, help="solver time limit per scenario in seconds")
+    parser.add_argument("--processes", type=int, default=None, help="scenarios solved at once (default: one per core)")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="comparison table (CSV)")
+    args = parser.parse_args()
+
+    config = config_loader.load_config(args.config)
+    with open(args.scenarios, 'r', encoding="utf-8") as f:
+        scenarios = json.load(f)
+    results = run_scenarios(config, scenarios, args.timeout, args.processes)
+
+    print(f"{'scenario':<28} {'mode':<8} {'status':<10} {'objective':>9} {'setup (s)':>9} {'solve (s)':>9}")
+    for row in results:
+        objective = row.get("objective")
+        print(f"{row['name']:<28} {row['mode']:<8} {row['status']:<10} "
+              f"{objective if objective is not None else '-':>9} "
+              f"{row.get('setup_seconds', '-'):>9} {row.get('solve_seconds', '-'):>9}")
+    write_table(results, args.output)
+    print(f"✅ Comparison table saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,504 @@
+# service.py
+"""Local scheduling service: an asyncio HTTP server with an async job queue.
+
+Instead of starting Python (and Node) for every portal request, the service
+stays up and keeps its state warm:
+  - the service process keeps parsed configs and the availability index of every
+    finished timetable, so query jobs are answered in-process,
+  - each worker of a bounded process pool keeps the models it has built (cloned
+    per job) and the configs it has parsed, so a repeated solve skips both,
+  - every job writes its files to its own directory (src/output/jobs/<id>/),
+    so concurrent jobs never overwrite each other.
+Progress and every improving solution are streamed as server-sent events.
+
+Endpoints (JSON in, JSON out):
+  POST /jobs                 {"type": "solve", "config"?, "timeout"?}
+                             {"type": "repair", "change": {...}, "job"? | "timetable"?, "config"?}
+                             {"type": "query", "command": "free" | "free_rooms" | "common", ..., "job"? | "timetable"?}
+  GET  /jobs                 every job
+  GET  /jobs/<id>            one job
+  GET  /jobs/<id>/events     text/event-stream of status, progress and solution events
+  GET  /jobs/<id>/timetable  the job's final timetable JSON
+  GET  /health
+A "config" must lie inside the repository and a "timetable" inside src/output/
+(or the jobs directory); other paths are rejected.
+
+Usage:
+  python src/python/service.py [--host 127.0.0.1] [--port 8765] [--processes 2]
+  python src/python/service_client.py solve --timeout 20 --watch
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import config_loader
+
+DEFAULT_CONFIG = "src/python/config.json"
+JOBS_DIR = "src/output/jobs"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+OUTPUT_DIR = os.path.join(REPO_ROOT, "src", "output")
+JOB_TYPES = ("solve", "repair", "query")
+MAX_BODY_BYTES = 1 << 20
+MAX_FINISHED_JOBS = 1000  # older finished jobs are forgotten (their files stay on disk)
+DRAIN_TIMEOUT_SECONDS = 5  # how long a failed job waits for events of a worker that may have died
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 503: "Service Unavailable"}
+
+# ---------------- Pool workers ---------------- #
+
+# Per worker process: config path -> (mtime, Config), model cache key -> (model, class_vars)
+_worker_configs = {}
+_worker_models = {}
+_MAX_WORKER_MODELS = 4
+
+
+def _worker_config(path):
+    mtime = os.path.getmtime(path)
+    cached = _worker_configs.get(path)
+    if cached is None or cached[0] != mtime:
+        _worker_configs[path] = cached = (mtime, config_loader.load_config(path))
+    return cached[1]
+
+
+def _worker_model(config, emit):
+    """The built (model, class_vars) for a config, from this worker's memory, the disk cache or a build."""
+    import model_builder
+    import model_cache
+
+    key = model_cache.cache_key(config)
+    if key in _worker_models:
+        emit("progress", {"message": "model reused from the worker's memory"})
+        return _worker_models[key]
+    settings = config.data['settings'].get('model_cache', {})
+    directory = settings.get('directory', model_cache.CACHE_DIR)
+    built = model_cache.load(config, directory) if settings.get('enabled', False) else None
+    if built:
+        emit("progress", {"message": "model loaded from the disk cache"})
+    else:
+        emit("progress", {"message": "building the model"})
+        built = model_builder.build_model(config)
+        if settings.get('enabled', False):
+            model_cache.store(*built, config, directory,
+                              settings.get('max_megabytes', model_cache.DEFAULT_MAX_MEGABYTES))
+    if len(_worker_models) >= _MAX_WORKER_MODELS:
+        _worker_models.pop(next(iter(_worker_models)))
+    _worker_models[key] = built
+    return built
+
+
+def _run_job(job_id, kind, params, out_dir, events, num_workers):
+    """Process-pool entry point: runs one solve or repair job; its console output goes to out_dir/job.log."""
+    os.makedirs(out_dir, exist_ok=True)
+
+    def emit(event, data):
+        events.put((job_id, event, data))
+
+    emit("progress", {"message": f"started in worker {os.getpid()}"})
+    try:
+        with open(os.path.join(out_dir, "job.log"), "w", encoding="utf-8") as log, \
+                contextlib.redirect_stdout(log):
+            if kind == "solve":
+                return _solve(params, out_dir, emit, num_workers)
+            return _repair(params, out_dir, emit)
+    finally:
+        emit("end", None)  # sentinel: every event of this job is already on the queue
+
+
+def _solve(params, out_dir, emit, num_workers):
+    import postprocess
+    import solution_handler
+    import solver_setup
+
+    config = _worker_config(params["config"])
+    model, class_vars = _worker_model(config, emit)
+    model = model.Clone()
+    master_path = os.path.join(out_dir, "University_Master_Timetable.json")
+
+    class Streamer(solution_handler.SolutionStreamer):
+        def on_solution_callback(self):
+            super().on_solution_callback()
+            emit("solution", {"number": self.solution_count, "objective": self.ObjectiveValue(),
+                              "seconds": round(self.WallTime(), 3), "path": self.json_path})
+
+    solver = solver_setup.create_solver(config, max_time_in_seconds=params.get("timeout"))
+    if not config.data['settings'].get('num_workers'):
+        solver.parameters.num_workers = num_workers
+    emit("progress", {"message": f"solving (max {solver.parameters.max_time_in_seconds:g} seconds)"})
+    status = solver.Solve(model, Streamer(class_vars, config, master_path))
+    result = {"status": solver.StatusName(status), "wall_time": round(solver.WallTime(), 3)}
+    timetable = solution_handler.export_solution(status, solver, class_vars, config, master_path)
+    if timetable is None:
+        return result
+
+    emit("progress", {"message": "post-processing"})
+    resolved_path = os.path.join(out_dir, "timetable_resolved.json")
+    postprocess.run(timetable, config, os.path.join(out_dir, "timetable.json"), resolved_path,
+                    os.path.join(out_dir, "Timetable.xlsx"))
+    result.update(objective=solver.ObjectiveValue(), best_bound=solver.BestObjectiveBound(),
+                  timetable=resolved_path)
+    return result
+
+
+def _repair(params, out_dir, emit):
+    import local_repair
+    import solution_handler
+
+    config = _worker_config(params["config"])
+    emit("progress", {"message": f"repairing {params['timetable']}"})
+    timetable, removed, added = local_repair.repair(config, params["change"], params["timetable"],
+                                                    params.get("time_limit"), _worker_model(config, emit))
+    if timetable is None:
+        return {"status": "FAILED"}
+    path = os.path.join(out_dir, "University_Master_Timetable_repaired.json")
+    solution_handler.write_json_atomic(timetable, path)
+    return {"status": "REPAIRED", "timetable": path,
+            "removed": [local_repair.describe(key, config) for key in removed],
+            "added": [local_repair.describe(key, config) for key in added]}
+
+
+# ---------------- Service ---------------- #
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Job:
+    """One submitted job; `events` is kept so late subscribers can replay the stream."""
+
+    def __init__(self, kind, params, out_dir):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = params
+        self.out_dir = out_dir
+        self.status = "queued"
+        self.submitted = time.time()
+        self.finished = None
+        self.result = None
+        self.events = []
+        self.changed = asyncio.Condition()
+        self.drained = asyncio.Event()  # set once the worker's last event has been published
+
+    def as_dict(self):
+        return {"id": self.id, "type": self.kind, "status": self.status, "params": self.params,
+                "submitted": self.submitted, "finished": self.finished, "result": self.result}
+
+
+class SchedulingService:
+    """Job registry, process pool and in-memory caches behind the HTTP handlers."""
+
+    def __init__(self, processes=None, max_pending=None, jobs_dir=JOBS_DIR):
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.max_pending = max_pending or 4 * self.processes
+        self.jobs_dir = jobs_dir
+        self.jobs = {}
+        self.configs = {}         # path -> (mtime, Config)
+        self.availability = {}    # timetable path -> (mtime, AvailabilityIndex)
+        self.num_workers = max(1, (os.cpu_count() or 1) // self.processes)
+        self.loop = None
+        self.pool = None
+        self.events = None
+        self._manager = None
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._manager = multiprocessing.Manager()
+        self.events = self._manager.Queue()
+        self.pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+        threading.Thread(target=self._forward_events, daemon=True).start()
+
+    def close(self):
+        self.events.put(None)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
+
+    def _forward_events(self):
+        """Moves worker events from the manager queue onto the event loop."""
+        while True:
+            item = self.events.get()
+            if item is None:
+                return
+            job_id, event, data = item
+            job = self.jobs.get(job_id)
+            if job is None:  # already forgotten
+                continue
+            if event == "end":
+                asyncio.run_coroutine_threadsafe(self._drained(job), self.loop)
+            else:
+                asyncio.run_coroutine_threadsafe(self._publish(job, event, data), self.loop)
+
+    async def _publish(self, job, event, data):
+        if event == "progress" and job.status == "queued":
+            job.status = "running"
+        async with job.changed:
+            job.events.append((event, data))
+            job.changed.notify_all()
+
+    async def _drained(self, job):
+        # Taking the lock queues this behind the _publish calls scheduled before it
+        async with job.changed:
+            job.drained.set()
+
+    async def _set_status(self, job, status, result=None):
+        job.status = status
+        if result is not None:
+            job.result = result
+        if status in ("done", "failed"):
+            job.finished = time.time()
+        await self._publish(job, "status", {"status": status, "result": job.result})
+
+    def config(self, path):
+        mtime = os.path.getmtime(path)
+        cached = self.configs.get(path)
+        if cached is None or cached[0] != mtime:
+            self.configs[path] = cached = (mtime, config_loader.load_config(path))
+        return cached[1]
+
+    @staticmethod
+    def _allowed_path(path, roots, what):
+        """`path` with symlinks resolved, or HTTPError(400) if it is not inside one of `roots`."""
+        real = os.path.realpath(path)
+        for root in roots:
+            root = os.path.realpath(root)
+            if os.path.commonpath([real, root]) == root:
+                return real
+        raise HTTPError(400, f"{what} '{path}' is not inside {' or '.join(roots)}")
+
+    def _timetable_path(self, params, final_key="timetable"):
+        """The timetable a repair/query job refers to: another job's result or a file."""
+        if params.get("job"):
+            source = self.jobs.get(params["job"])
+            if source is None or source.status != "done" or not (source.result or {}).get(final_key):
+                raise HTTPError(400, f"job {params['job']} has no finished timetable")
+            return source.result[final_key]
+        path = params.get("timetable")
+        if not path:
+            raise HTTPError(400, "a 'job' or 'timetable' is required")
+        path = self._allowed_path(path, (OUTPUT_DIR, self.jobs_dir), "timetable")
+        if not os.path.exists(path):
+            raise HTTPError(400, f"timetable '{params['timetable']}' not found")
+        return path
+
+    def _forget_old_jobs(self):
+        finished = [job for job in self.jobs.values() if job.status in ("done", "failed")]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+
+    async def submit(self, params):
+        self._forget_old_jobs()
+        kind = params.get("type")
+        if kind not in JOB_TYPES:
+            raise HTTPError(400, f"'type' must be one of {JOB_TYPES}")
+        params = dict(params)
+        params["config"] = self._allowed_path(params.get("config") or DEFAULT_CONFIG, (REPO_ROOT,), "config")
+        try:
+            config = self.config(params["config"])
+        except (OSError, ValueError) as e:
+            raise HTTPError(400, f"config {params['config']}: {e}")
+
+        if kind == "query":
+            params["timetable"] = self._timetable_path(params)
+            job = Job(kind, params, None)
+            try:
+                status, result = "done", self.query(params, config)
+            except (KeyError, ValueError) as e:
+                status, result = "failed", {"error": str(e)}
+            self.jobs[job.id] = job
+            await self._set_status(job, status, result)
+            return job
+
+        if kind == "repair":
+            if not isinstance(params.get("change"), dict):
+                raise HTTPError(400, "a repair job needs a 'change' object")
+            params["timetable"] = self._timetable_path(params, "master")
+        pending = sum(job.status in ("queued", "running") for job in self.jobs.values())
+        if pending >= self.max_pending:
+            raise HTTPError(503, f"{pending} jobs are pending; try again later")
+        job = Job(kind, params, None)
+        job.out_dir = os.path.join(self.jobs_dir, job.id)
+        self.jobs[job.id] = job
+        self.loop.create_task(self._run(job))
+        return job
+
+    async def _run(self, job):
+        await self._set_status(job, "queued")
+        future = self.pool.submit(_run_job, job.id, job.kind, job.params, job.out_dir, self.events,
+                                  self.num_workers)
+        try:
+            result = await asyncio.wrap_future(future)
+        except Exception as e:  # the worker's exception, re-raised here
+            # A worker that died never sends its sentinel, so only wait a little
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(job.drained.wait(), DRAIN_TIMEOUT_SECONDS)
+            await self._set_status(job, "failed", {"error": f"{type(e).__name__}: {e}"})
+            return
+        # The final status goes out only after the worker's remaining solution events
+        await job.drained.wait()
+        if job.kind == "solve" and result.get("timetable"):
+            result["master"] = os.path.join(job.out_dir, "University_Master_Timetable.json")
+        if job.kind == "repair" and result.get("timetable"):
+            result["master"] = result["timetable"]
+        await self._set_status(job, "done" if result.get("timetable") else "failed", result)
+
+    def query(self, params, config):
+        """Answers a free/busy query from the (cached) availability index of a timetable.
+
+        Unknown teachers, rooms, sections or groups are a 404 rather than "free all week"."""
+        import availability
+
+        path = params["timetable"]
+        mtime = os.path.getmtime(path)
+        cached = self.availability.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, 'r', encoding="utf-8") as f:
+                index = availability.AvailabilityIndex.from_timetable(json.load(f), config)
+            self.availability[path] = cached = (mtime, index)
+        index = cached[1]
+
+        def resource(kind, name):
+            return (kind, tuple(name.split(":", 1))) if kind == "group" else (kind, name)
+
+        command = params.get("command")
+        if command == "free":
+            resources = [resource(params["kind"], params["name"])]
+        elif command == "common":
+            resources = [resource(params["kind"], name) for name in params["names"]]
+        elif command == "free_rooms":
+            names = config.LAB_ROOMS if params.get("labs") else None
+            return {"rooms": sorted(index.free_resources("room", params["day"], params["slots"], names))}
+        else:
+            raise ValueError("'command' must be free, free_rooms or common")
+        try:
+            slots = index.common_free_slots(resources)
+        except KeyError as e:
+            raise HTTPError(404, e.args[0])
+        return {"slots": [list(pair) for pair in slots]}
+
+    async def stream(self, job, writer):
+        """Writes the job's events as server-sent events until it has finished."""
+        for position in itertools.count():
+            async with job.changed:
+                await job.changed.wait_for(lambda: position < len(job.events))
+                event, data = job.events[position]
+            writer.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+            await writer.drain()
+            if event == "status" and data["status"] in ("done", "failed"):
+                return
+
+
+# ---------------- HTTP ---------------- #
+
+async def _read_request(reader):
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    if not request_line:
+        return None
+    method, target, _ = request_line.split(" ", 2)
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], body
+
+
+def _response(writer, status, payload, content_type="application/json"):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: {content_type}\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+
+
+async def handle(service, reader, writer):
+    try:
+        request = await _read_request(reader)
+        if request is None:
+            return
+        method, path, body = request
+        parts = [part for part in path.split("/") if part]
+        if parts == ["health"]:
+            _response(writer, 200, {"status": "ok", "jobs": len(service.jobs), "processes": service.processes})
+        elif parts == ["jobs"] and method == "POST":
+            try:
+                params = json.loads(body or b"{}")
+            except json.JSONDecodeError as e:
+                raise HTTPError(400, f"invalid JSON: {e}")
+            if not isinstance(params, dict):
+                raise HTTPError(400, "the body must be a JSON object")
+            job = await service.submit(params)
+            _response(writer, 200 if job.status in ("done", "failed") else 202, job.as_dict())
+        elif parts == ["jobs"]:
+            _response(writer, 200, [job.as_dict() for job in service.jobs.values()])
+        elif len(parts) >= 2 and parts[0] == "jobs":
+            job = service.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(404, f"no job {parts[1]}")
+            if method != "GET":
+                raise HTTPError(405, "only GET is supported here")
+            if parts[2:] == []:
+                _response(writer, 200, job.as_dict())
+            elif parts[2:] == ["events"]:
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                             b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+                await service.stream(job, writer)
+            elif parts[2:] == ["timetable"] and (job.result or {}).get("timetable"):
+                with open(job.result["timetable"], 'rb') as f:
+                    _response(writer, 200, f.read())
+            else:
+                raise HTTPError(404, f"nothing at {path}")
+        else:
+            raise HTTPError(404, f"nothing at {path}")
+    except HTTPError as e:
+        _response(writer, e.status, {"error": str(e)})
+    except (ValueError, asyncio.IncompleteReadError) as e:
+        _response(writer, 400, {"error": f"malformed request: {e}"})
+    except ConnectionError:
+        pass
+    finally:
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
+            writer.close()
+
+
+async def serve(host, port, processes=None, max_pending=None):
+    service = SchedulingService(processes, max_pending)
+    service.start()
+    server = await asyncio.start_server(lambda r, w: handle(service, r, w), host, port)
+    print(f"🚀 Scheduling service on http://{host}:{port} "
+          f"({service.processes} solver process(es), jobs in {service.jobs_dir}/)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local scheduling service with an async job queue")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--processes", type=int, default=None, help="solver processes (default: one per core)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="queued + running solve/repair jobs before new ones get 503 (default: 4 per process)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.processes, args.max_pending))
+    except KeyboardInterrupt:
+        print("👋 Service stopped.")
+
+
+if __name__ == "__main__":
+    main()
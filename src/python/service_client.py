@@ -0,0 +1,173 @@
+# service_client.py
+"""Stand-in client and load test for service.py (standard library only).
+
+Usage:
+  python src/python/service_client.py solve [--config config.json] [--timeout 20] [--watch]
+  python src/python/service_client.py repair --job JOB '{"kind": "block_teacher", "teacher": "SK", "day": "Monday"}'
+  python src/python/service_client.py query [--job JOB | --timetable PATH] free teacher KN
+  python src/python/service_client.py watch JOB
+  python src/python/service_client.py load --queries 500 --solves 4 --concurrency 16 [--timeout 10]
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+DEFAULT_TIMETABLE = "src/output/timetable_resolved.json"
+DEFAULT_MASTER = "src/output/University_Master_Timetable.json"
+
+
+class Client:
+    def __init__(self, url=DEFAULT_URL):
+        self.url = url.rstrip("/")
+
+    def request(self, method, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise SystemExit(f"❌ {e.code}: {json.loads(e.read()).get('error')}")
+
+    def submit(self, params):
+        return self.request("POST", "/jobs", params)
+
+    def job(self, job_id):
+        return self.request("GET", f"/jobs/{job_id}")
+
+    def events(self, job_id):
+        """Yields (event, data) from the job's server-sent event stream until it ends."""
+        with urllib.request.urlopen(f"{self.url}/jobs/{job_id}/events") as response:
+            event = None
+            for raw in response:
+                line = raw.decode().rstrip("\n")
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    yield event, json.loads(line[len("data: "):])
+
+    def wait(self, job_id):
+        for event, data in self.events(job_id):
+            if event == "status" and data["status"] in ("done", "failed"):
+                break
+        return self.job(job_id)
+
+
+def watch(client, job_id):
+    for event, data in client.events(job_id):
+        if event == "solution":
+            print(f"   - Solution {data['number']}: objective {data['objective']:g} after {data['seconds']:.1f}s")
+        elif event == "progress":
+            print(f"   - {data['message']}")
+        else:
+            print(f"   [{data['status']}]" + (f" {json.dumps(data['result'])}" if data.get("result") else ""))
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else float("nan")
+
+
+def load_test(client, queries, solves, concurrency, timeout, timetable, config):
+    """Runs `solves` solve jobs and `queries` query jobs concurrently; prints throughput and latency."""
+
+    def timed(params, wait):
+        start = time.perf_counter()
+        job = client.submit(params)
+        if wait and job["status"] not in ("done", "failed"):
+            job = client.wait(job["id"])
+        return params["type"], job["status"], time.perf_counter() - start
+
+    query = {"type": "query", "timetable": timetable, "command": "free", "kind": "teacher", "name": "KN"}
+    solve = {"type": "solve", "timeout": timeout}
+    if config:
+        query["config"] = solve["config"] = config
+    jobs = [(solve, True)] * solves + [(query, False)] * queries
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda job: timed(*job), jobs))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'type':<6} {'jobs':>5} {'failed':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9}")
+    for kind in ("solve", "query"):
+        latencies = [1000 * seconds for k, _, seconds in results if k == kind]
+        failed = sum(1 for k, status, _ in results if k == kind and status != "done")
+        if latencies:
+            print(f"{kind:<6} {len(latencies):>5} {failed:>6} {_percentile(latencies, 0.5):>9.1f} "
+                  f"{_percentile(latencies, 0.95):>9.1f} {max(latencies):>9.1f}")
+    print(f"✅ {len(results)} jobs in {elapsed:.2f}s ({len(results) / elapsed:.1f} jobs/s); "
+          f"mean query latency {statistics.mean([s for k, _, s in results if k == 'query'] or [0]) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Client for the local scheduling service")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve")
+    solve.add_argument("--config", default=None)
+    solve.add_argument("--timeout", type=float, default=None)
+    solve.add_argument("--watch", action="store_true", help="stream progress until the job finishes")
+
+    repair = commands.add_parser("repair")
+    repair.add_argument("change", help="the change as JSON, e.g. '{\"kind\": \"drop_room\", \"room\": \"CS115\"}'")
+    query = commands.add_parser("query")
+    query.add_argument("query", nargs="+",
+                       help="free KIND NAME | common KIND NAME... | free-rooms DAY SLOT... (add --labs)")
+    query.add_argument("--labs", action="store_true")
+    for sub in (repair, query):
+        source = sub.add_mutually_exclusive_group()
+        source.add_argument("--job", help="use the timetable of a finished job")
+        source.add_argument("--timetable", help="use a timetable file readable by the service")
+
+    commands.add_parser("watch").add_argument("job")
+
+    load = commands.add_parser("load", help="load test: concurrent query and solve jobs")
+    load.add_argument("--queries", type=int, default=200)
+    load.add_argument("--solves", type=int, default=2)
+    load.add_argument("--concurrency", type=int, default=8)
+    load.add_argument("--timeout", type=float, default=10.0, help="solver time limit of each solve job")
+    load.add_argument("--timetable", default=DEFAULT_TIMETABLE, help="timetable the queries run against")
+    load.add_argument("--config", default=None)
+    args = parser.parse_args()
+
+    client = Client(args.url)
+    if args.command == "solve":
+        params = {"type": "solve", "config": args.config, "timeout": args.timeout}
+        job = client.submit({k: v for k, v in params.items() if v is not None})
+        print(f"📨 Job {job['id']} {job['status']}")
+        if args.watch:
+            watch(client, job["id"])
+    elif args.command in ("repair", "query"):
+        params = {"type": args.command, "job": args.job, "timetable": args.timetable}
+        if not args.job and not args.timetable:
+            params["timetable"] = DEFAULT_TIMETABLE if args.command == "query" else DEFAULT_MASTER
+        if args.command == "repair":
+            params["change"] = json.loads(args.change)
+        else:
+            command, *rest = args.query
+            if command == "free":
+                params.update(command="free", kind=rest[0], name=rest[1])
+            elif command == "common":
+                params.update(command="common", kind=rest[0], names=rest[1:])
+            else:
+                params.update(command="free_rooms", day=rest[0], slots=rest[1:], labs=args.labs)
+        job = client.submit({k: v for k, v in params.items() if v is not None})
+        if job["status"] not in ("done", "failed"):
+            job = client.wait(job["id"])
+        print(json.dumps(job["result"], indent=2))
+    elif args.command == "watch":
+        watch(client, args.job)
+    else:
+        load_test(client, args.queries, args.solves, args.concurrency, args.timeout, args.timetable, args.config)
+
+
+if __name__ == "__main__":
+    main()
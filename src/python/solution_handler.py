@@ -1,44 +1,147 @@
 # solution_handler.py
 import json
+import os
+import tempfile
+import time
 from ortools.sat.python import cp_model
 
-def export_solution(status, solver, class_vars, config):
-    """Processes the solver result and writes the timetable to a JSON file."""
+MASTER_TIMETABLE_PATH = "src/output/University_Master_Timetable.json"
+
+
+def scheduled_keys(class_vars, response, indices=None):
+    """Returns the keys of the sessions that are scheduled in a solver response.
+
+    All variable values are fetched in one batch from the response's flat solution
+    list instead of one solver.Value() call per variable; pass `indices` (the proto
+    index of each variable, in class_vars order) to reuse them across solutions.
+    """
+    solution = list(response.solution)
+    if not solution:
+        return []
+    if indices is None:
+        indices = [var.Index() for var in class_vars.values()]
+    return [key for key, index in zip(class_vars, indices) if solution[index]]
+
+
+def timetable_from_keys(keys, config):
+    """Builds the {day: [section schedules]} structure from the keys of the scheduled sessions.
+
+    Each key is dropped into its (day, section) bucket and slot in a single pass.
+    """
+    output = {day: [] for day in config.DAYS}
+    section_objs = {}
+    for day_idx, day in enumerate(config.DAYS):
+        for section in config.SECTIONS:
+            section_obj = {"section": section}
+            for slot in config.ALL_SLOTS:
+                section_obj[slot] = []
+            output[day].append(section_obj)
+            section_objs[(day_idx, section)] = section_obj
+
+    for (sec, grp, subj, tc, d, s, rm) in keys:
+        section_obj = section_objs.get((d, sec))
+        if section_obj is None:
+            continue
+        entry = {"teacher": tc, "subject": subj, "room": rm, "isLab": 'Lab' in subj}
+        if grp in config.GROUPS:
+            entry["group"] = grp
+        section_obj[config.ALL_SLOTS[s]].append(entry)
+        if 'Lab' in subj and s + 1 < len(config.ALL_SLOTS):
+            section_obj[config.ALL_SLOTS[s + 1]].append(entry.copy())
+    return output
+
+
+def _read_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# The mode a plain open(path, "w") creates files with. Read once at import: os.umask
+# can only be queried by setting it, which is not safe once worker threads exist.
+DEFAULT_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def write_text_atomic(text, path, suffix=".tmp"):
+    """Writes text to a temporary file next to path and renames it into place,
+    so readers never see a half-written file.
+
+    mkstemp creates the file owner-only; it is given the usual umask-based mode
+    before the rename so other users and services can still read it.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=suffix)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chmod(tmp_path, DEFAULT_FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(data, json_path):
+    """Writes JSON atomically (see write_text_atomic)."""
+    write_text_atomic(json.dumps(data, indent=2, ensure_ascii=False), json_path, suffix=".json")
+
+
+class SolutionStreamer(cp_model.CpSolverSolutionCallback):
+    """Writes every improving solution to disk as soon as the solver finds it.
+
+    If the run is interrupted or times out, json_path still holds the best
+    timetable found so far.
+    """
+
+    def __init__(self, class_vars, config, json_path=MASTER_TIMETABLE_PATH):
+        super().__init__()
+        self.class_vars = class_vars
+        self.config = config
+        self.json_path = json_path
+        self.indices = [var.Index() for var in class_vars.values()]
+        self.solution_count = 0
+        self.start_time = time.time()
+
+    def on_solution_callback(self):
+        self.solution_count += 1
+        keys = scheduled_keys(self.class_vars, self.Response(), self.indices)
+        write_json_atomic(timetable_from_keys(keys, self.config), self.json_path)
+        print(f"   - Solution {self.solution_count}: objective {self.ObjectiveValue():g} "
+              f"after {time.time() - self.start_time:.1f}s (saved)")
+
+
+def export_solution(status, solver, class_vars, config, json_path=MASTER_TIMETABLE_PATH):
+    """Processes the solver result and writes the timetable to a JSON file.
+
+    Returns the timetable, or None when there is no solution."""
     if status == cp_model.FEASIBLE or status == cp_model.OPTIMAL:
         print("✅ Solution found — exporting JSON...")
-        
-        output = {}
-        for day_idx, day in enumerate(config.DAYS):
-            day_list = []
-            for section in config.SECTIONS:
-                section_obj = {"section": section}
-                for slot in config.ALL_SLOTS:
-                    section_obj[slot] = []
-
-                for (sec, grp, subj, tc, d, s, rm), var in class_vars.items():
-                    if sec == section and d == day_idx and solver.Value(var):
-                        entry = {
-                            "teacher": tc, "subject": subj, "room": rm,
-                            "isLab": 'Lab' in subj
-                        }
-                        if grp in config.GROUPS:
-                            entry["group"] = grp
-                        
-                        start_slot_idx = s
-                        section_obj[config.ALL_SLOTS[start_slot_idx]].append(entry)
-                        if 'Lab' in subj and start_slot_idx + 1 < len(config.ALL_SLOTS):
-                             section_obj[config.ALL_SLOTS[start_slot_idx + 1]].append(entry.copy())
-                
-                day_list.append(section_obj)
-            output[day] = day_list
-        
-        # NOTE: Update this path to your desired output location
-        json_path = "src/output/University_Master_Timetable.json"
-        with open(json_path, "w", encoding="utf-8") as jf:
-            json.dump(output, jf, indent=2, ensure_ascii=False)
+
+        keys = scheduled_keys(class_vars, solver.ResponseProto())
+        timetable = timetable_from_keys(keys, config)
+        write_json_atomic(timetable, json_path)
         print(f"✅ JSON exported to {json_path}")
+        return timetable
 
     else:
         print("❌ No feasible solution found.")
         print("Solver status:", solver.StatusName(status))
-        print("Try relaxing constraints or increasing solver time.")
\ No newline at end of file
+        print("Try relaxing constraints or increasing solver time.")
+        return None
+
+
+def export_keys(status_name, keys, config, json_path=MASTER_TIMETABLE_PATH):
+    """Like export_solution, for results that arrive as scheduled keys (e.g. decomposed solves)."""
+    if status_name in ("OPTIMAL", "FEASIBLE"):
+        print("✅ Solution found — exporting JSON...")
+        timetable = timetable_from_keys(keys, config)
+        write_json_atomic(timetable, json_path)
+        print(f"✅ JSON exported to {json_path}")
+        return timetable
+    else:
+        print("❌ No feasible solution found.")
+        print("Solver status:", status_name)
+        print("Try relaxing constraints or increasing solver time.")
+        return None
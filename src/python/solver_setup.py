@@ -0,0 +1,35 @@
+# solver_setup.py
+from ortools.sat.python import cp_model
+
+SEARCH_BRANCHINGS = (
+    "AUTOMATIC_SEARCH", "FIXED_SEARCH", "PORTFOLIO_SEARCH", "LP_SEARCH",
+    "PSEUDO_COST_SEARCH", "PORTFOLIO_WITH_QUICK_RESTART_SEARCH", "HINT_SEARCH",
+    "PARTIAL_FIXED_SEARCH", "RANDOMIZED_SEARCH",
+)
+
+
+def create_solver(config, max_time_in_seconds=None):
+    """Creates a CpSolver configured from the `settings` block of config.json.
+
+    Recognised keys (all optional except the timeout):
+      solver_timeout_seconds, num_workers (0 = one per core), random_seed,
+      search_branching (e.g. "PORTFOLIO_SEARCH"), linearization_level (0-2).
+    """
+    settings = config.data['settings']
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(
+        max_time_in_seconds if max_time_in_seconds is not None else settings['solver_timeout_seconds'])
+
+    if 'num_workers' in settings:
+        solver.parameters.num_workers = int(settings['num_workers'])
+    if 'random_seed' in settings:
+        solver.parameters.random_seed = int(settings['random_seed'])
+    if 'search_branching' in settings:
+        branching = settings['search_branching'].upper()
+        if branching not in SEARCH_BRANCHINGS:
+            raise ValueError(f"Unknown search_branching '{settings['search_branching']}'. "
+                             f"Expected one of: {', '.join(SEARCH_BRANCHINGS)}")
+        solver.parameters.search_branching = getattr(cp_model, branching)
+    if 'linearization_level' in settings:
+        solver.parameters.linearization_level = int(settings['linearization_level'])
+    return solver
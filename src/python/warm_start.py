@@ -0,0 +1,108 @@
+# warm_start.py
+"""Re-solving from a previously published University_Master_Timetable.json.
+
+Entries of the old timetable are mapped back to class_vars keys and given to
+the solver as hints. Sections whose old schedule is still a complete, valid
+assignment under the current config ("untouched" sections) can optionally be
+pinned, so only the sections affected by a config change are re-planned.
+"""
+import json
+import os
+
+
+def load_previous_assignment(json_path, class_vars, config):
+    """Returns (keys, unmatched): the class_vars keys scheduled in the old timetable,
+    and the (day, section, slot, entry) items that no longer exist in the model."""
+    with open(json_path, 'r', encoding="utf-8") as f:
+        timetable = json.load(f)
+
+    keys, unmatched = set(), []
+    for day_idx, day in enumerate(config.DAYS):
+        for section_obj in timetable.get(day, []):
+            section = section_obj.get("section")
+            previous_slot_entries = []
+            for slot_idx, slot in enumerate(config.ALL_SLOTS):
+                slot_entries = section_obj.get(slot, [])
+                for entry in slot_entries:
+                    # The second hour of a 2-hour lab repeats the entry of the first hour
+                    if entry.get("isLab") and entry in previous_slot_entries:
+                        continue
+                    key = (section, entry.get("group", 'ALL'), entry["subject"], entry["teacher"],
+                           day_idx, slot_idx, entry["room"])
+                    if key in class_vars:
+                        keys.add(key)
+                    else:
+                        unmatched.append((day, section, slot, entry))
+                previous_slot_entries = slot_entries
+    return keys, unmatched
+
+
+def find_untouched_sections(previous_keys, unmatched, config):
+    """Sections whose old schedule fully satisfies the current weekly requirements."""
+    counts = {}
+    for (sec, grp, subj, tc, d, s, rm) in previous_keys:
+        counts[(sec, grp, subj)] = counts.get((sec, grp, subj), 0) + 1
+    broken = {section for _, section, _, _ in unmatched}
+
+    untouched = []
+    for section in config.SECTIONS:
+        if section in broken:
+            continue
+        required = {(section, 'ALL', subject): 3 for subject, _ in config.SUBJECTS.get(section, [])}
+        for lab_name in config.LABS.get(section, []):
+            if config.get_teacher_for_lab(section, lab_name):
+                for group in config.GROUPS:
+                    required[(section, group, lab_name)] = 1
+        scheduled = {k: v for k, v in counts.items() if k[0] == section}
+        if scheduled == required:
+            untouched.append(section)
+    return untouched
+
+
+def add_hints(model, class_vars, previous_keys):
+    """Hints every class variable with its value in the previous timetable."""
+    model.ClearHints()
+    for key, var in class_vars.items():
+        model.AddHint(var, key in previous_keys)
+
+
+def pin_sections(model, class_vars, previous_keys, sections):
+    """Returns a copy of `model` with every variable of `sections` fixed to its previous value.
+
+    The copy shares variable indices (and hints) with `model`, so class_vars can
+    still be used to read the solution of the pinned copy.
+    """
+    pinned = model.Clone()
+    sections = set(sections)
+    for key, var in class_vars.items():
+        if key[0] in sections:
+            pinned_var = pinned.GetBoolVarFromProtoIndex(var.Index())
+            pinned.Add(pinned_var == int(key in previous_keys))
+    return pinned
+
+
+def prepare(model, class_vars, config):
+    """Applies the `warm_start` settings to the model.
+
+    Returns the model to solve first (pinned or the original) and a short summary.
+    Hints are always added to the original model, so falling back to it after an
+    infeasible pinned solve still benefits from the previous timetable.
+    """
+    settings = config.data['settings'].get('warm_start', {})
+    json_path = settings.get('previous_timetable', "src/output/University_Master_Timetable.json")
+    if not os.path.exists(json_path):
+        print(f"   - Warm start skipped: {json_path} not found.")
+        return model, None
+
+    previous_keys, unmatched = load_previous_assignment(json_path, class_vars, config)
+    add_hints(model, class_vars, previous_keys)
+    summary = {"hinted": len(previous_keys), "unmatched": len(unmatched), "pinned_sections": []}
+    print(f"   - Warm start: {len(previous_keys)} sessions hinted from {json_path}, "
+          f"{len(unmatched)} no longer match the config.")
+
+    if not settings.get('pin_untouched_sections', False):
+        return model, summary
+    untouched = find_untouched_sections(previous_keys, unmatched, config)
+    summary["pinned_sections"] = untouched
+    print(f"   - Pinning {len(untouched)}/{len(config.SECTIONS)} untouched sections.")
+    return pin_sections(model, class_vars, previous_keys, untouched), summary
@@ -0,0 +1,61 @@
+const test = require("node:test");
+const assert = require("node:assert");
+const path = require("path");
+
+const { slotsOf, cellKey, buildRowCells, buildViews, planJobs } = require("../src/js/json2pdf.js");
+
+const lab = (group, room = "CS105") => ({ teacher: "SK", subject: "DS Lab", room, isLab: true, group });
+const theory = { teacher: "KN", subject: "DBE", room: "B-209", isLab: false };
+
+// A grid other than the bundled 9-10 ... 4-5 one
+const timetable = {
+  Monday: [{ section: "CSE-5", "8-9": [theory], "9-10": [lab("A")], "10-11": [lab("A")] }],
+  Tuesday: [{ section: "CSE-5", "8-9": [], "9-10": [], "10-11": [theory] }],
+};
+
+test("slotsOf reads the slot grid from the data", () => {
+  assert.deepStrictEqual(slotsOf(timetable), ["8-9", "9-10", "10-11"]);
+});
+
+test("cellKey is equal exactly for identical cells", () => {
+  assert.strictEqual(cellKey([]), "");
+  assert.strictEqual(cellKey(undefined), "");
+  assert.strictEqual(cellKey([lab("A")]), cellKey([lab("A")]));
+  assert.notStrictEqual(cellKey([lab("A")]), cellKey([lab("B")]));
+  assert.notStrictEqual(cellKey([lab("A")]), cellKey([lab("A", "CS106")]));
+  assert.notStrictEqual(cellKey([lab("A"), lab("B")]), cellKey([lab("B"), lab("A")]));
+});
+
+test("buildRowCells merges a lab that continues into the next slot", () => {
+  const row = buildRowCells([[theory], [lab("A")], [lab("A")], [lab("A")]], {});
+  assert.strictEqual(row.length, 4);
+  assert.strictEqual(row[1].colSpan, 2);
+  assert.deepStrictEqual(row[2], {});
+  assert.strictEqual(row[3].colSpan, undefined);
+});
+
+test("buildRowCells does not merge different labs or theory", () => {
+  const row = buildRowCells([[lab("A")], [lab("B")], [theory], [theory]], {});
+  assert.ok(row.every(cell => cell.colSpan === undefined));
+});
+
+test("buildViews keeps sessions in slots outside the default grid", () => {
+  const views = buildViews(timetable);
+  assert.deepStrictEqual(views.teacher.get("KN").Monday["8-9"].map(e => e.subject), ["DBE"]);
+  assert.strictEqual(views.room.get("CS105").Monday["10-11"][0].section, "CSE-5");
+  assert.deepStrictEqual([...views.section.keys()], ["CSE-5"]);
+});
+
+test("planJobs gives names that collide once sanitised distinct files", () => {
+  const views = { section: new Map(), teacher: new Map(), room: new Map() };
+  const cells = { Monday: { "9-10": [theory, theory] } };
+  views.teacher.set("A/B", cells).set("A B", cells).set("a_b", cells);
+  views.room.set("A/B", cells);
+  const jobs = planJobs(views, "out");
+  const files = jobs.map(job => path.relative("out", job.file));
+  assert.deepStrictEqual(files, [
+    path.join("teachers", "A_B.pdf"), path.join("teachers", "A_B_2.pdf"), path.join("teachers", "a_b_3.pdf"),
+    path.join("rooms", "A_B.pdf"),
+  ]);
+  assert.ok(jobs.every(job => job.entries === 2));
+});
@@ -0,0 +1,20 @@
+from ortools.sat.python import cp_model
+
+import anytime
+
+
+def test_hint_from_response_keeps_existing_hints():
+    model = cp_model.CpModel()
+    a = model.NewBoolVar("a")
+    b = model.NewBoolVar("b")
+    model.Add(a + b == 1)
+    model.AddHint(a, 1)
+
+    other = model.Clone()
+    other.Add(a == 0)
+    solver = cp_model.CpSolver()
+    assert solver.Solve(other) == cp_model.OPTIMAL
+
+    anytime.hint_from_response(model, solver.ResponseProto())
+    hint = model.Proto().solution_hint
+    assert dict(zip(hint.vars, hint.values)) == {a.Index(): 1, b.Index(): 1}
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from availability import AvailabilityIndex
+
+SLOTS = ["9-10", "10-11", "11-12"]
+
+
+def _section(name, **slots):
+    section = {"section": name}
+    for slot in SLOTS:
+        section[slot] = slots.get(slot, [])
+    return section
+
+
+def _entry(teacher, room, group=None):
+    entry = {"teacher": teacher, "subject": "Lab X" if group else "Maths", "room": room, "isLab": bool(group)}
+    if group:
+        entry["group"] = group
+    return entry
+
+
+@pytest.fixture
+def index():
+    timetable = {
+        "Monday": [_section("CSE-5", **{"9-10": [_entry("KN", "R1")],
+                                        "10-11": [_entry("SK", "LAB1", "A")]}),
+                   _section("IT-5")],
+        "Tuesday": [_section("CSE-5"), _section("IT-5", **{"11-12": [_entry("KN", "R2")]})],
+    }
+    config = SimpleNamespace(ALL_ROOMS=["R1", "R2", "R3", "LAB1"], ALL_TEACHERS=["KN", "SK", "PM"],
+                             GROUPS=["A", "B"])
+    return AvailabilityIndex.from_timetable(timetable, config)
+
+
+def test_busy_slots(index):
+    assert index.slots_of(index.busy("teacher", "KN")) == [("Monday", "9-10"), ("Tuesday", "11-12")]
+    assert index.slots_of(index.busy("room", "LAB1")) == [("Monday", "10-11")]
+    assert index.is_free("teacher", "KN", "Monday", ["10-11", "11-12"])
+    assert not index.is_free("section", "IT-5", "Tuesday", None)
+
+
+def test_groups_inherit_section_wide_sessions(index):
+    assert index.slots_of(index.busy("group", ("CSE-5", "A"))) == [("Monday", "9-10"), ("Monday", "10-11")]
+    assert index.slots_of(index.busy("group", ("CSE-5", "B"))) == [("Monday", "9-10")]
+
+
+def test_known_names_without_sessions_are_free(index):
+    assert index.busy("teacher", "PM") == 0
+    assert index.free("room", "R3") == index.full
+
+
+@pytest.mark.parametrize("kind, name", [("teacher", "NOSUCH"), ("room", "R9"), ("section", "ME-5"),
+                                        ("group", ("CSE-5", "Z")), ("group", ("ME-5", "A"))])
+def test_unknown_names_raise(index, kind, name):
+    with pytest.raises(KeyError):
+        index.free_slots(kind, name)
+
+
+def test_common_free_and_free_resources(index):
+    common = index.common_free_slots([("teacher", "KN"), ("section", "CSE-5")])
+    assert ("Monday", "9-10") not in common and ("Monday", "10-11") not in common
+    assert ("Tuesday", "11-12") not in common and ("Tuesday", "9-10") in common
+    assert sorted(index.free_resources("room", "Monday", ["9-10", "10-11"])) == ["R2", "R3"]
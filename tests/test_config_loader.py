@@ -0,0 +1,47 @@
+import json
+import os
+
+import pytest
+
+import config_loader
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(config_loader.__file__)), "config.json")
+
+
+@pytest.fixture
+def data():
+    with open(CONFIG_PATH, 'r', encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_bundled_config_is_valid(data):
+    config_loader.validate(data)
+
+
+def test_validate_lists_every_problem(data):
+    data['settings']['lab_slot_starts'] = ["9-10", "8-9"]
+    data['labs']['NO-SUCH-SECTION'] = ["DS Lab"]
+    data['objective_weights']['gaps'] = "high"
+    with pytest.raises(config_loader.ConfigError) as e:
+        config_loader.validate(data)
+    message = str(e.value)
+    assert "'8-9' is not one of all_slots" in message
+    assert "labs: 'NO-SUCH-SECTION' is not one of the sections" in message
+    assert "objective_weights.gaps must be a number" in message
+
+
+def test_missing_top_level_keys(data):
+    del data['sections']
+    with pytest.raises(config_loader.ConfigError, match="'sections' must be a list"):
+        config_loader.validate(data)
+
+
+def test_derived_maps_are_frozen(data):
+    config = config_loader.Config(data)
+    assert config.SLOT_INDEX[data['settings']['all_slots'][1]] == 1
+    with pytest.raises(TypeError):
+        config.SLOT_INDEX["8-9"] = 0
+    for teacher, sections in config.TEACHER_SECTIONS.items():
+        assert isinstance(sections, tuple)
+        assert all(teacher in [t for _, t in data['subjects'][s]] for s in sections)
+
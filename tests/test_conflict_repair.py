@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import conflict_repair
+
+SLOTS = ["9-10", "10-11", "11-12", "12-1", "2-3", "3-4"]
+CONFIG = SimpleNamespace(ALL_SLOTS=SLOTS, DAYS=["Monday", "Tuesday"], LAB_START_INDICES={0, 4},
+                         SLOT_INDEX={slot: i for i, slot in enumerate(SLOTS)}, data={"settings": {}})
+
+
+def _lab(subject, teacher, room):
+    return {"teacher": teacher, "subject": subject, "room": room, "isLab": True}
+
+
+def _theory(teacher, room):
+    return {"teacher": teacher, "subject": "Theory", "room": room}
+
+
+def _timetable(s2_tuesday=None):
+    """S1's and S2's labs share room L1 on Monday morning. S1's lab has nowhere else to go, and
+    S2's nearest free window (Monday 2-3) would give TB sessions starting at 12-1 and at 2-3."""
+    return {
+        "Monday": [
+            {"section": "S1", "9-10": [_lab("X Lab", "TA", "L1")], "10-11": [_lab("X Lab", "TA", "L1")],
+             "2-3": [_theory("TC", "R1")]},
+            {"section": "S2", "9-10": [_lab("Y Lab", "TB", "L1")], "10-11": [_lab("Y Lab", "TB", "L1")]},
+            {"section": "S3", "12-1": [_theory("TB", "R3")]},
+        ],
+        "Tuesday": [
+            {"section": "S1", "9-10": [_theory("TD", "R1")], "2-3": [_theory("TE", "R1")]},
+            {"section": "S2", **(s2_tuesday or {})},
+            {"section": "S3"},
+        ],
+    }
+
+
+def _starts(timetable, section, subject):
+    return sorted((day, slot) for day, day_list in timetable.items() for s in day_list if s["section"] == section
+                  for slot in SLOTS if any(e["subject"] == subject for e in s.get(slot) or []))
+
+
+def test_a_move_that_breaks_the_recess_rule_is_not_taken():
+    timetable = _timetable()
+    assert conflict_repair.repair_conflicts(timetable, CONFIG, time_limit=5) == []
+    assert _starts(timetable, "S2", "Y Lab")[0][0] == "Tuesday"
+
+
+def test_a_move_that_gives_a_teacher_two_sessions_of_a_section_a_day_is_not_taken():
+    timetable = _timetable(s2_tuesday={"11-12": [_theory("TB", "R2")]})
+    assert conflict_repair.repair_conflicts(timetable, CONFIG, time_limit=5) == [("Monday", "9-10", "L1"),
+                                                                                   ("Monday", "10-11", "L1")]
+    assert _starts(timetable, "S2", "Y Lab") == [("Monday", "10-11"), ("Monday", "9-10")]
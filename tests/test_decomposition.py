@@ -0,0 +1,49 @@
+import copy
+import os
+
+import pytest
+
+import config_loader
+import decomposition
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(config_loader.__file__)), "config.json")
+
+
+@pytest.fixture(scope="module")
+def config():
+    return config_loader.load_config(CONFIG_PATH)
+
+
+def test_shared_lab_pool_no_longer_joins_every_section(config):
+    components = decomposition.section_components(config)
+    assert len(components) >= 2
+    assert sorted(s for component in components for s in component) == sorted(config.SECTIONS)
+
+
+def test_every_lab_subject_gets_one_allowed_room(config):
+    rooms = decomposition.assign_lab_rooms(config)
+    assert set(rooms) == set(config.LAB_NAMES)
+    assert set(rooms.values()) <= set(config.LAB_ROOMS)
+    # With more subjects than rooms, a room is only shared inside one component
+    component_of = {s: i for i, c in enumerate(decomposition.section_components(config, rooms)) for s in c}
+    users = {}
+    for section, labs in config.LABS.items():
+        for lab in labs:
+            users.setdefault(rooms[lab], set()).add(component_of[section])
+    assert all(len(components) == 1 for components in users.values())
+
+
+def test_sub_config_pins_the_rooms_of_its_labs(config):
+    rooms = decomposition.assign_lab_rooms(config)
+    component = decomposition.section_components(config, rooms)[0]
+    sub = decomposition.sub_config_data(config.data, component, rooms)
+    config_loader.validate(sub)
+    for section in component:
+        assert sub['section_lab_rooms'][section] == sorted({rooms[lab] for lab in config.LABS[section]})
+
+
+def test_sections_without_a_common_room_are_left_out(config):
+    data = copy.deepcopy(config.data)
+    data['section_lab_rooms'] = {"CSE-5": ["CS105"], "IT-5": ["CS106"]}
+    rooms = decomposition.assign_lab_rooms(config_loader.Config(data))
+    assert "OS Lab" not in rooms and "DS Lab" in rooms
@@ -0,0 +1,22 @@
+import config_loader
+import feasibility
+import instance_generator
+
+
+def _data():
+    return instance_generator.generate_config(sections=2, teachers=8, subjects=3, labs=2, lab_rooms=4, days=5)
+
+
+def _errors(data):
+    return [issue for issue in feasibility.analyze(config_loader.Config(data)) if issue.severity == "error"]
+
+
+def test_generated_instance_passes():
+    assert _errors(_data()) == []
+
+
+def test_lab_whose_sections_share_no_lab_room_is_an_error():
+    data = _data()
+    data['section_lab_rooms'] = {"SEC-1": ["LAB101", "LAB102"], "SEC-2": ["LAB103", "LAB104"]}
+    assert sorted(issue.resource for issue in _errors(data)) == ["lab C1S1 Lab", "lab C1S2 Lab"]
+
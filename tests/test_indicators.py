@@ -0,0 +1,21 @@
+import pytest
+
+import config_loader
+import instance_generator
+import model_builder
+
+
+@pytest.fixture(scope="module")
+def config():
+    data = instance_generator.generate_config(sections=2, teachers=8, subjects=3, labs=2, lab_rooms=4, days=5)
+    data['settings'].update(num_workers=4, random_seed=1)
+    return config_loader.Config(data)
+
+
+def test_indicators_are_created_once(config):
+    model, class_vars = model_builder.build_model(config, with_objective=False)
+    indicators = class_vars.indicators
+    first = indicators.busy(config.SECTIONS[0], 0, 0)
+    size = len(model.Proto().variables)
+    assert indicators.busy(config.SECTIONS[0], 0, 0) is first
+    assert len(model.Proto().variables) == size
@@ -0,0 +1,39 @@
+import copy
+import os
+
+import pytest
+
+import config_loader
+import model_builder
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(model_builder.__file__)), "config.json")
+
+
+def _build(backend, disabled=()):
+    data = copy.deepcopy(config_loader.load_config(CONFIG_PATH).data)
+    data['settings'].update(model_backend=backend, disabled_constraints=list(disabled))
+    model, _ = model_builder.build_model(config_loader.Config(data), with_objective=False)
+    constraints = model.Proto().constraints
+    return (sum(ct.has_at_most_one() for ct in constraints), sum(ct.has_no_overlap() for ct in constraints),
+            sum(ct.has_interval() for ct in constraints))
+
+
+@pytest.fixture(scope="module")
+def config():
+    return config_loader.load_config(CONFIG_PATH)
+
+
+def test_interval_backend_replaces_the_at_most_one_family(config):
+    at_most_one, no_overlap, intervals = _build("interval")
+    assert at_most_one == 0
+    assert intervals > 0
+    assert no_overlap == len(config.ALL_ROOMS) + len(config.ALL_TEACHERS) + len(config.SECTIONS)
+    at_most_one, no_overlap, _ = _build("boolean")
+    assert at_most_one > 0 and no_overlap == 0
+
+
+def test_interval_backend_honours_disabled_constraints(config):
+    _, all_scopes, _ = _build("interval")
+    assert _build("interval", ["resource_uniqueness:KN", f"resource_uniqueness:{config.SECTIONS[0]}"])[1] == \
+        all_scopes - 2
+    assert _build("interval", ["resource_uniqueness"])[1] == 0
@@ -0,0 +1,49 @@
+import pytest
+
+import bench_model_build
+import config_loader
+import instance_generator
+import model_builder
+
+
+@pytest.fixture(scope="module")
+def config():
+    data = instance_generator.generate_config(sections=2, teachers=8, subjects=3, labs=2, lab_rooms=4, days=5)
+    data['settings'].update(num_workers=4, random_seed=1)
+    return config_loader.Config(data)
+
+
+def test_buckets_match_a_full_scan(config):
+    _, class_vars = model_builder.build_model(config, with_objective=False)
+    for (sec, grp, subj, tc, d, s, rm), var in class_vars.items():
+        occupied = (s, s + 1) if 'Lab' in subj else (s,)
+        for slot in occupied:
+            assert any(v is var for v in class_vars.by_room_slot[(d, slot, rm)])
+            assert any(v is var for v in class_vars.by_teacher_slot[(tc, d, slot)])
+            assert any(v is var for v in class_vars.by_group_slot[(sec, 'ALL', d, slot)])
+        assert any(v is var for v in class_vars.by_teacher_start[(tc, d, s)])
+        bucket = class_vars.by_group_day_labs if 'Lab' in subj else class_vars.by_section_day_theory
+        assert any(v is var for v in bucket[(sec, grp, d) if 'Lab' in subj else (sec, d)])
+
+    # Every bucket entry is a variable of the dict, and each variable appears once per occupied slot
+    room_entries = sum(len(v) for v in class_vars.by_room_slot.values())
+    assert room_entries == sum(2 if 'Lab' in key[2] else 1 for key in class_vars)
+    assert sum(len(v) for v in class_vars.by_subject.values()) == len(class_vars)
+
+
+def test_scale_config_data_clones_sections_with_their_own_teachers(config):
+    scaled = bench_model_build.scale_config_data(config.data, 3)
+    assert len(scaled['sections']) == 3 * len(config.data['sections'])
+    section = config.data['sections'][0]
+    assert scaled['section_theory_rooms'][section + "#2"] == config.data['section_theory_rooms'][section] + "#2"
+    assert [t for _, t in scaled['subjects'][section + "#1"]] == \
+        [t + "#1" for _, t in config.data['subjects'][section]]
+    assert scaled['labs'][section + "#1"] == config.data['labs'][section]
+    assert bench_model_build.scale_config_data(config.data, 1) == config.data
+
+
+def test_time_build_counts_the_scaled_variables(config):
+    num_vars, seconds = bench_model_build.time_build(config)
+    doubled, _ = bench_model_build.time_build(config_loader.Config(bench_model_build.scale_config_data(config.data, 2)))
+    assert seconds > 0
+    assert doubled == 2 * num_vars
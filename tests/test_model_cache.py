@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+import config_loader
+import model_builder
+import model_cache
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(model_builder.__file__)), "config.json")
+
+
+@pytest.fixture(scope="module")
+def built():
+    config = config_loader.load_config(CONFIG_PATH)
+    model, class_vars = model_builder.build_model(config)
+    return config, model, class_vars
+
+
+def test_miss_then_hit_restores_class_vars(built, tmp_path):
+    config, model, class_vars = built
+    assert model_cache.load(config, str(tmp_path)) is None
+    assert model_cache.store(model, class_vars, config, str(tmp_path)) == model_cache.cache_key(config)
+
+    loaded_model, loaded_vars = model_cache.load(config, str(tmp_path))
+    assert isinstance(loaded_vars, model_builder.ClassVars)
+    assert list(loaded_vars) == list(class_vars)
+    assert len(loaded_model.Proto().variables) == len(model.Proto().variables)
+    assert len(loaded_model.Proto().constraints) == len(model.Proto().constraints)
+    assert {k: len(v) for k, v in loaded_vars.by_teacher_slot.items()} == \
+        {k: len(v) for k, v in class_vars.by_teacher_slot.items()}
+
+
+def test_cached_indicators_are_reused(built, tmp_path):
+    config, model, class_vars = built
+    model_cache.store(model, class_vars, config, str(tmp_path))
+    loaded_model, loaded_vars = model_cache.load(config, str(tmp_path))
+    assert len(loaded_vars.indicators) == len(class_vars.indicators)
+    variables = len(loaded_model.Proto().variables)
+    for section in config.SECTIONS:
+        loaded_vars.indicators.busy(section, 0, 0)
+    assert len(loaded_model.Proto().variables) == variables
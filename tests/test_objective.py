@@ -0,0 +1,52 @@
+import pytest
+from ortools.sat.python import cp_model
+
+import config_loader
+import instance_generator
+import model_builder
+import objective
+import solution_handler
+
+
+@pytest.fixture(scope="module")
+def config():
+    data = instance_generator.generate_config(sections=2, teachers=8, subjects=3, labs=2, lab_rooms=4, days=5)
+    data['settings'].update(num_workers=4, random_seed=1)
+    return config_loader.Config(data)
+
+
+@pytest.fixture(scope="module")
+def keys(config):
+    """The sessions of one feasible timetable of the small instance."""
+    model, class_vars = model_builder.build_model(config, with_objective=False)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 30
+    solver.parameters.num_workers = 4
+    assert solver.Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return solution_handler.scheduled_keys(class_vars, solver.ResponseProto())
+
+
+def _objective_of(config, keys, formulation):
+    """The optimal objective of `formulation` with every session fixed to `keys`."""
+    model, class_vars = model_builder.build_model(config, with_objective=False)
+    objective.set_objective(model, class_vars, config, formulation=formulation)
+    scheduled = set(keys)
+    for key, var in class_vars.items():
+        model.Add(var == int(key in scheduled))
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 30
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    return solver.ObjectiveValue()
+
+
+def test_evaluate_matches_the_reified_objective(config, keys):
+    score = objective.evaluate(keys, config)
+    # The reified teacher term is the (constant) total load
+    expected = score["penalty"] + len(keys) * config.WEIGHTS['workload_penalty']
+    assert _objective_of(config, keys, "reified") == expected
+
+
+def test_evaluate_matches_the_linear_objective(config, keys):
+    score = objective.evaluate(keys, config)
+    expected = score["penalty"] + score["teacher_load_spread"] * config.WEIGHTS['workload_penalty']
+    assert _objective_of(config, keys, "linear") == expected
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import pytest
+
+import postprocess
+
+SLOTS = ["9-10", "10-11", "11-12", "12-1"]
+
+
+def _lab(name, group, room):
+    return {"teacher": "T" + group, "subject": name, "room": room, "isLab": True, "group": group}
+
+
+def _timetable():
+    section = {"section": "CSE-5", "9-10": [_lab("DS Lab", "A", "L1")], "10-11": [_lab("DS Lab", "A", "L1")],
+               "11-12": [_lab("OS Lab", "B", "L2")], "12-1": [_lab("OS Lab", "B", "L2")]}
+    return {"Monday": [section]}
+
+
+def _config(**postprocess_settings):
+    return SimpleNamespace(ALL_SLOTS=SLOTS, data={"settings": {"postprocess": postprocess_settings}})
+
+
+def test_merge_labs_runs_a_sections_labs_in_parallel():
+    section = postprocess.merge_labs(_timetable(), _config())["Monday"][0]
+    assert [lab["subject"] for lab in section["9-10"]] == ["DS Lab", "OS Lab"]
+    assert section["10-11"] == section["9-10"]
+    assert section["11-12"] == [] and section["12-1"] == []
+
+
+def test_nothing_is_written_when_a_later_stage_fails(tmp_path, monkeypatch):
+    def fail(timetable, config):
+        raise RuntimeError("repair failed")
+
+    monkeypatch.setattr(postprocess, "resolve_conflicts", fail)
+    merged, resolved = tmp_path / "timetable.json", tmp_path / "timetable_resolved.json"
+    with pytest.raises(RuntimeError):
+        postprocess.run(_timetable(), _config(), str(merged), str(resolved))
+    assert not merged.exists() and not resolved.exists()
+
+
+def test_merged_file_is_the_state_before_conflict_resolution(tmp_path, monkeypatch):
+    def drop_everything(timetable, config):
+        timetable["Monday"][0]["9-10"] = []
+
+    monkeypatch.setattr(postprocess, "resolve_conflicts", drop_everything)
+    merged, resolved = tmp_path / "timetable.json", tmp_path / "timetable_resolved.json"
+    postprocess.run(_timetable(), _config(), str(merged), str(resolved))
+    assert '"OS Lab"' in merged.read_text() and '"9-10": []' in resolved.read_text()
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import queue
+import threading
+
+import pytest
+
+import service
+
+
+def _forwarding_service():
+    svc = service.SchedulingService(processes=1)
+    svc.loop = asyncio.get_running_loop()
+    svc.events = queue.Queue()
+    threading.Thread(target=svc._forward_events, daemon=True).start()
+    return svc
+
+
+def test_events_of_forgotten_jobs_are_skipped():
+    async def scenario():
+        svc = _forwarding_service()
+        job = service.Job("solve", {}, None)
+        svc.jobs[job.id] = job
+        svc.events.put(("gone", "progress", {"message": "late"}))
+        svc.events.put((job.id, "progress", {"message": "still forwarded"}))
+        svc.events.put((job.id, "end", None))
+        await asyncio.wait_for(job.drained.wait(), 5)
+        svc.events.put(None)
+        return job.events
+
+    assert asyncio.run(scenario()) == [("progress", {"message": "still forwarded"})]
+
+
+def test_sentinel_comes_after_every_event():
+    async def scenario():
+        svc = _forwarding_service()
+        job = service.Job("solve", {}, None)
+        svc.jobs[job.id] = job
+        for number in range(50):
+            svc.events.put((job.id, "solution", {"number": number}))
+        svc.events.put((job.id, "end", None))
+        await asyncio.wait_for(job.drained.wait(), 5)
+        svc.events.put(None)
+        return job.events
+
+    events = asyncio.run(scenario())
+    assert [data["number"] for _, data in events] == list(range(50))
+
+
+def test_paths_outside_the_repository_are_rejected(tmp_path):
+    outside = tmp_path / "timetable.json"
+    outside.write_text("{}")
+    svc = service.SchedulingService(processes=1)
+    for params in ({"type": "solve", "config": "/etc/hostname"},
+                   {"type": "query", "command": "free", "timetable": str(outside)},
+                   {"type": "query", "command": "free",
+                    "timetable": os.path.join(service.OUTPUT_DIR, "..", "python", "config.json")}):
+        with pytest.raises(service.HTTPError) as e:
+            asyncio.run(svc.submit(params))
+        assert e.value.status == 400 and "is not inside" in str(e.value)
+
+
+def test_timetables_under_the_output_directory_are_accepted():
+    svc = service.SchedulingService(processes=1)
+    path = os.path.join(service.OUTPUT_DIR, "University_Master_Timetable.json")
+    assert svc._timetable_path({"timetable": path}) == os.path.realpath(path)